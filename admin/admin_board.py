@@ -1,16 +1,20 @@
+import asyncio
 from typing_extensions import Annotated
 
-from fastapi import APIRouter, Depends, Request, Form, Path
+from fastapi import APIRouter, Depends, Request, Form, Path, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
+from sse_starlette import EventSourceResponse
 from typing import List
 
 from core.database import DBConnect, db_session
 from core.exception import AlertException
-from core.models import Board, BoardNew, Scrap, BoardFile, BoardGood
+from core.models import Board, BoardNew, Scrap, BoardFile, BoardGood, WriteNum
 from core.formclass import BoardForm
 from core.template import AdminTemplates
 from lib.common import *
-from lib.board_lib import BoardFileManager
+from lib.board_activity import delete_board_activity
+from lib.board_lib import BoardCloneManager
+from lib.page_cache import purge_board_pages
 from lib.dependencies import (
     common_search_query_params, get_board, validate_token
 )
@@ -105,6 +109,7 @@ async def board_list_update(
 
             # 최신글 캐시 삭제
             FileCache().delete_prefix(f'latest-{board.bo_table}')
+            purge_board_pages(board.bo_table)
 
     url = "/admin/board_list"
     query_params = request.query_params
@@ -121,8 +126,6 @@ async def board_list_delete(
     """
     게시판관리 목록 일괄삭제
     """
-    from lib.common import _created_models
-
     for i in checks:
         board = db.get(Board, bo_table[i])
         if board:
@@ -136,6 +139,10 @@ async def board_list_delete(
             db.execute(delete(BoardFile).where(BoardFile.bo_table == board.bo_table))
             # 좋아요 기록 삭제
             db.execute(delete(BoardGood).where(BoardGood.bo_table == board.bo_table))
+            # 글번호 할당 정보 삭제
+            db.execute(delete(WriteNum).where(WriteNum.bo_table == board.bo_table))
+            # 글, 댓글 현황 집계 삭제
+            delete_board_activity(db, board.bo_table)
 
             db.commit()
 
@@ -143,10 +150,11 @@ async def board_list_delete(
             write_model = dynamic_create_write_table(table_name=board.bo_table, create_table=False)
             write_model.__table__.indexes.clear()  # 인덱스까지 삭제해야 동일한 table로 재생성시 에러가 안남
             write_model.__table__.drop(DBConnect().engine)
-            _created_models.pop(board.bo_table, None)  # 동적 모델 캐싱 삭제
+            write_model_registry.remove(board.bo_table)  # 동적 모델 레지스트리에서 삭제
 
             # 최신글 캐시 삭제
             FileCache().delete_prefix(f'latest-{board.bo_table}')
+            purge_board_pages(board.bo_table)
 
     url = "/admin/board_list"
     query_params = request.query_params
@@ -274,6 +282,8 @@ async def board_form_update(
 
     # 최신글 캐시 삭제
     FileCache().delete_prefix(f'latest-{bo_table}')
+    # 전체적용 항목은 모든 게시판에 반영
+    purge_board_pages(*(db.scalars(select(Board.bo_table)).all() if chk_all else [bo_table]))
 
     url = f"/admin/board_form/{bo_table}"
     query_params = request.query_params
@@ -323,20 +333,20 @@ async def board_copy_update(
     db.commit()
 
     # 새로운 게시판 테이블 생성
-    origin_write_model = dynamic_create_write_table(table_name=bo_table, create_table=False)
-    target_write_model = dynamic_create_write_table(table_name=target_table, create_table=True)
+    dynamic_create_write_table(table_name=bo_table, create_table=False)
+    dynamic_create_write_table(table_name=target_table, create_table=True)
     # 복사 유형을 '구조와 데이터' 선택시 테이블의 레코드 모두 복사
     if copy_case == 'schema_data_both':
-        writes = db.scalars(select(origin_write_model)).all()
-        for write in writes:
-            copy_data = {column.name: getattr(write, column.name) for column in write.__table__.columns}
-
-            # write 객체로 target_write 테이블에 레코드 추가
-            db.execute(target_write_model.__table__.insert(), copy_data)
-            db.commit()
-            file_manager = BoardFileManager(origin_board, write.wr_id)
-            if file_manager.is_exist(bo_table, write.wr_id):
-                file_manager.copy_board_files(FILE_DIRECTORY, target_table, write.wr_id)
+        clone_manager = BoardCloneManager(db, bo_table, target_table, FILE_DIRECTORY)
+        clone_manager.copy_writes()
+        # 첨부파일이 있으면 실제 파일 복사 진행화면으로 이동
+        if clone_manager.copy_board_files():
+            context = {
+                "request": request,
+                "bo_table": bo_table,
+                "target_table": target_table,
+            }
+            return templates.TemplateResponse("board_copy_file.html", context)
 
     content = """
     <script>
@@ -346,3 +356,41 @@ async def board_copy_update(
     """
 
     return HTMLResponse(content=content)
+
+
+@router.get("/board_copy_filecopying/{bo_table}")
+async def board_copy_filecopying(
+    request: Request,
+    db: db_session,
+    origin_board: Annotated[Board, Depends(get_board)],
+    target_table: str = Query(...),
+):
+    """
+    게시판 복사 첨부파일 복사 처리
+    """
+    target_board = db.get(Board, target_table)
+    if not target_board:
+        raise AlertException(f"{target_table} : 존재하지 않는 게시판입니다.", 404)
+
+    async def send_events():
+        count = 0
+        try:
+            # 응답 스트리밍 중에는 요청 세션이 닫히므로 별도 세션을 사용
+            with DBConnect().sessionLocal() as copy_db:
+                clone_manager = BoardCloneManager(copy_db, origin_board.bo_table, target_table, FILE_DIRECTORY)
+                for count, origin_path, target_path, is_copied in clone_manager.copy_physical_files():
+                    # 10개마다 이벤트 루프에 제어권을 넘겨줍니다.
+                    if count % 10 == 0:
+                        await asyncio.sleep(0.1)
+
+                    result = "복사" if is_copied else "건너뜀"
+                    yield f"data: ({count}) {origin_path} -> {target_path} {result} \n\n"
+        except Exception as e:
+            yield f"data: [끝]오류가 발생했습니다. {str(e)} \n\n"
+            raise
+
+        # 종료 메시지 전송
+        yield f"data: 총 {count}개의 첨부파일을 복사했습니다.\n\n"
+        yield "data: [끝]\n\n"
+
+    return EventSourceResponse(send_events())
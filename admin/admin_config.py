@@ -10,6 +10,7 @@ from core.exception import AlertException
 from core.formclass import ConfigForm
 from core.models import Config
 from core.template import AdminTemplates
+from lib.cache_registry import invalidate_tables
 from lib.common import *
 from lib.dependencies import validate_super_admin, validate_token
 from lib.template_functions import (
@@ -94,4 +95,7 @@ async def config_form_update(
         setattr(config, field, value)
     db.commit()
 
+    # 기존캐시 삭제
+    invalidate_tables(Config.__tablename__)
+
     return RedirectResponse("/admin/config_form", status_code=303)
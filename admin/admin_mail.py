@@ -7,11 +7,12 @@ from sse_starlette.sse import EventSourceResponse
 
 from core.database import db_session
 from core.exception import AlertException
-from core.database import db_connect
-from core.models import Group, Mail, Member
+from core.database import db_connect, DBConnect
+from core.models import Group, Mail, MailQueue, Member
 from core.template import AdminTemplates
 from lib.common import *
 from lib.dependencies import common_search_query_params, validate_token
+from lib.mail_queue import enqueue_mails, get_mail_queue_status
 from lib.template_functions import get_group_select, get_paging
 
 router = APIRouter()
@@ -357,38 +358,54 @@ async def mail_select_send(
     회원메일발송 처리
     """
     async def send_events(members: list, mail_subject: str, mail_content: str):
-        count = 0
-        sleepsec = 1  # 1초 간격으로 조정
         try:
-            for member in members:
-                mb_name, mb_nick, mb_id, mb_email = member.split("||")
-
-                if not mb_email:
-                    continue
-                
-                mb_md5 = hashlib.md5(f"{mb_id}{mb_email}{datetime.now()}".encode()).hexdigest()
-
-                subject = mail_subject
-                content = mail_content
-                content = content.replace("{이름}", mb_name)
-                content = content.replace("{닉네임}", mb_nick)
-                content = content.replace("{회원아이디}", mb_id)
-                content = content.replace("{이메일}", mb_email)
-                content = content + f"<hr size=0><p><span style='font-size:10pt; font-family:돋움'>▶ 더 이상 정보 수신을 원치 않으시면 [<a href='/bbs/email_stop/{mb_id}&mb_md5={mb_md5}' target='_blank'>수신거부</a>] 해 주십시오.</span></p>"           
-                
-                # 메일 발송
-                mailer(from_mail, mb_email, subject, content, from_name)
-                count += 1
-
-                # 10명마다 1초씩 쉬어줍니다.
-                if count % 10 == 0:
-                    await asyncio.sleep(sleepsec)  # 비동기 sleep 사용
+            with DBConnect().sessionLocal() as queue_db:
+                # 발송중인 메일이 없을 때만 대기열에 추가합니다. (SSE 재연결시 중복 발송 방지)
+                status = get_mail_queue_status(queue_db, ma_id)
+                if not status["ready"] and not status["sending"]:
+                    mails = []
+                    for member in members:
+                        mb_name, mb_nick, mb_id, mb_email = member.split("||")
+
+                        if not mb_email:
+                            continue
+
+                        mb_md5 = hashlib.md5(f"{mb_id}{mb_email}{datetime.now()}".encode()).hexdigest()
+
+                        content = mail_content
+                        content = content.replace("{이름}", mb_name)
+                        content = content.replace("{닉네임}", mb_nick)
+                        content = content.replace("{회원아이디}", mb_id)
+                        content = content.replace("{이메일}", mb_email)
+                        content = content + f"<hr size=0><p><span style='font-size:10pt; font-family:돋움'>▶ 더 이상 정보 수신을 원치 않으시면 [<a href='/bbs/email_stop/{mb_id}&mb_md5={mb_md5}' target='_blank'>수신거부</a>] 해 주십시오.</span></p>"
+                        mails.append({
+                            "from_email": from_mail, "from_name": from_name,
+                            "to_email": mb_email, "to_name": mb_name,
+                            "subject": mail_subject, "body": content,
+                        })
+                    count = enqueue_mails(queue_db, mails, ma_id)
+                    yield f"data: {count}건의 메일을 발송 대기열에 추가했습니다.\n\n"
 
                 # 발송 상태를 'yield'를 사용하여 전송합니다.
                 # 전송시 필히 data: 로 시작하고 \n\n으로 끝나야 합니다.
-                yield f"data: {count}. {mb_name}({mb_email})님께 메일을 보내고 있습니다.\n\n"
+                while True:
+                    status = get_mail_queue_status(queue_db, ma_id)
+                    yield (f"data: 발송완료 {status['sent']}건, 발송실패 {status['failed']}건, "
+                           f"발송대기 {status['ready'] + status['sending']}건\n\n")
+                    if not status["ready"] and not status["sending"]:
+                        break
+                    await asyncio.sleep(1)
+
+                # 발송 실패 목록
+                failed_mails = queue_db.execute(
+                    select(MailQueue.mq_to_email, MailQueue.mq_error)
+                    .where(MailQueue.ma_id == ma_id, MailQueue.mq_status == "failed")
+                    .order_by(MailQueue.mq_id)
+                    .limit(100)
+                ).all()
+                for to_email, error in failed_mails:
+                    yield f"data: 발송실패 {to_email} ({error})\n\n"
 
-            # 멤버 리스트 메일발송 완료 후 함수 종료
             # 종료 메시지 전송
             yield "data: [끝]\n\n"
         except Exception as e:
@@ -1,20 +1,23 @@
+import asyncio
 import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, Path, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Path, Request
 from fastapi.responses import RedirectResponse
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import func, select
+from sse_starlette import EventSourceResponse
 
-from bbs.social import SocialAuthService
 from core.database import db_session
 from core.exception import AlertException
 from core.formclass import MemberForm
-from core.models import Member, Point, GroupMember, Memo, Scrap, Auth, Group, Board
+from core.models import Member
 from core.template import AdminTemplates
 from lib.common import *
 from lib.dependencies import common_search_query_params, validate_token
-from lib.member_lib import get_member_icon, get_member_image, validate_and_update_member_image
-from lib.pbkdf2 import create_hash
+from lib.member_lib import (
+    get_member_icon, get_member_image, MemberPurgeManager, validate_and_update_member_image
+)
+from lib.pbkdf2 import create_hash_async
 from lib.template_functions import get_member_level_select, get_paging
 
 
@@ -28,6 +31,7 @@ templates.env.globals["is_none_datetime"] = is_none_datetime
 MEMBER_MENU_KEY = "200100"
 MEMBER_ICON_DIR = "data/member"
 MEMBER_IMAGE_DIR = "data/member_image"
+MEMBER_PURGE_DIR = "data/member_purge"
 # CF_MEMBER_IMG_WIDTH = 60
 # CF_MEMBER_IMG_HEIGHT = 60
 
@@ -128,76 +132,84 @@ async def member_list_update(
 async def member_list_delete(
     request: Request,
     db: db_session,
+    background_tasks: BackgroundTasks,
     checks: List[int] = Form(None, alias="chk[]"),
     mb_id: List[str] = Form(None, alias="mb_id[]"),
 ):
     """회원관리 목록 일괄 삭제"""
-    for i in checks:
-        # 관리자와 로그인된 본인은 삭제 불가
-        if (request.state.config.cf_admin == mb_id[i]) or (request.state.login_member.mb_id == mb_id[i]):
-            print("관리자와 로그인된 본인은 삭제 불가")
-            continue
+    # 관리자와 로그인된 본인은 삭제 불가
+    excluded_ids = (request.state.config.cf_admin, request.state.login_member.mb_id)
+    checked_ids = [mb_id[i] for i in checks or [] if mb_id[i] not in excluded_ids]
 
-        member = db.scalar(select(Member).filter_by(mb_id=mb_id[i]))
-        if member:
-            # 이미 삭제된 회원은 제외
-            # if re.match(r"^[0-9]{8}.*삭제함", member.mb_memo):
-            #     continue
-            delete_time = datetime.now().strftime("%Y%m%d")
-            # member 의 경우 레코드를 삭제하는게 아니라 mb_id 를 남기고 모두 제거
-            member.mb_password = ""
-            member.mb_level = 1
-            member.mb_email = ""
-            member.mb_homepage = ""
-            member.mb_tel = ""
-            member.mb_hp = ""
-            member.mb_zip1 = ""
-            member.mb_zip2 = ""
-            member.mb_addr1 = ""
-            member.mb_addr2 = ""
-            member.mb_addr3 = ""
-            member.mb_point = 0
-            member.mb_profile = ""
-            member.mb_birth = ""
-            member.mb_sex = ""
-            member.mb_signature = ""
-            member.mb_memo = (f"{delete_time} 삭제함\n{member.mb_memo}")
-            member.mb_certify = ""
-            member.mb_adult = 0
-            member.mb_dupinfo = ""
-
-            # 나머지 테이블에서도 삭제
-            # 포인트 테이블에서 삭제
-            db.execute(delete(Point).where(Point.mb_id == member.mb_id))
-
-            # 그룹접근가능 테이블에서 삭제
-            db.execute(delete(GroupMember).where(GroupMember.mb_id == member.mb_id))
-            
-            # 쪽지 테이블에서 삭제
-            db.execute(delete(Memo).where(Memo.me_send_mb_id == member.mb_id))
-
-            # 스크랩 테이블에서 삭제
-            db.execute(delete(Scrap).where(Scrap.mb_id == member.mb_id))
-
-            # 관리권한 테이블에서 삭제
-            db.execute(delete(Auth).where(Auth.mb_id == member.mb_id))
-
-            # 그룹관리자인 경우 그룹관리자를 공백으로
-            db.execute(update(Group).where(Group.gr_admin == member.mb_id).values(gr_admin=""))
-
-            # # 게시판관리자인 경우 게시판관리자를 공백으로
-            db.execute(update(Board).where(Board.bo_admin == member.mb_id).values(bo_admin=""))
-
-            # 소셜로그인에서 삭제 또는 해제
-            if SocialAuthService.check_exists_by_member_id(member.mb_id):
-                SocialAuthService.unlink_social_login(member.mb_id)
-            validate_and_update_member_image(request, None, None, member.mb_id, 1, 1)
+    purge_manager = MemberPurgeManager(db, request.state.config)
+    purged_ids = purge_manager.purge(checked_ids)
 
-            db.commit()
+    # 회원 이미지/아이콘 파일은 응답 이후 백그라운드에서 삭제하고 진행상황을 기록
+    job_id = os.urandom(16).hex()
+    make_directory(MEMBER_PURGE_DIR)
+    background_tasks.add_task(
+        delete_member_files, purge_manager, purged_ids, os.path.join(MEMBER_PURGE_DIR, f"{job_id}.log"))
 
-    url = "/admin/member_list"
-    query_params = request.query_params
-    return RedirectResponse(set_url_query_params(url, query_params), 303)
+    context = {
+        "request": request,
+        "job_id": job_id,
+        "count": len(purged_ids),
+        "query_string": request.query_params,
+    }
+    return templates.TemplateResponse("member_list_delete.html", context)
+
+
+@router.get("/member_list_deleting/{job_id}")
+async def member_list_deleting(request: Request, job_id: str = Path(...)):
+    """
+    회원관리 목록 일괄 삭제 - 회원 파일 삭제 진행상황
+    """
+    if not re.fullmatch(r"[0-9a-f]{32}", job_id):
+        raise AlertException("올바르지 않은 요청입니다.", 400)
+
+    progress_file = os.path.join(MEMBER_PURGE_DIR, f"{job_id}.log")
+
+    async def send_events():
+        position = 0
+        waiting = 0
+        while True:
+            lines = []
+            if os.path.exists(progress_file):
+                with open(progress_file, "r", encoding="utf-8") as f:
+                    f.seek(position)
+                    lines = f.readlines()
+                    position = f.tell()
+
+            for line in lines:
+                yield f"data: {line.strip()} \n\n"
+                if "[끝]" in line:
+                    os.remove(progress_file)
+                    return
+
+            # 일정 시간 동안 진행상황이 없으면 종료
+            waiting = 0 if lines else waiting + 1
+            if waiting > 120:
+                yield "data: [끝]진행상황을 확인할 수 없습니다. \n\n"
+                return
+            await asyncio.sleep(0.5)
+
+    return EventSourceResponse(send_events())
+
+
+def delete_member_files(purge_manager: MemberPurgeManager, mb_ids: list, progress_file: str):
+    """회원 이미지/아이콘 파일 삭제 (BackgroundTask로 실행)"""
+    count = 0
+    with open(progress_file, "a", encoding="utf-8") as f:
+        try:
+            for count, mb_id in purge_manager.delete_files(mb_ids):
+                f.write(f"({count}) {mb_id} 회원 파일 삭제\n")
+                f.flush()
+        except Exception as e:
+            f.write(f"[끝]오류가 발생했습니다. {str(e)}\n")
+            raise
+
+        f.write(f"총 {count}명의 회원 정보를 삭제했습니다.\n")
+        f.write("[끝]\n")
 
 
 @router.get("/member_form")
@@ -261,11 +273,11 @@ async def member_form_update(
             new_member.mb_adult = 0
 
         if mb_password:
-            new_member.mb_password = create_hash(mb_password)
+            new_member.mb_password = await create_hash_async(mb_password)
         else:
             # 비밀번호가 없다면 현재시간으로 해시값을 만든후 다시 해시 (알수없게 만드는게 목적)
             time_ymdhis = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            new_member.mb_password = create_hash(create_hash(time_ymdhis))
+            new_member.mb_password = await create_hash_async(await create_hash_async(time_ymdhis))
 
         db.add(new_member)
         db.commit()
@@ -285,7 +297,7 @@ async def member_form_update(
 
         # 수정시 비밀번호를 입력했다면 (수정에서는 비밀번호를 입력하지 않아도 됨)
         if mb_password:
-            exists_member.mb_password = create_hash(mb_password)
+            exists_member.mb_password = await create_hash_async(mb_password)
 
         if mb_certify_case and form_data.mb_certify:
             exists_member.mb_certify = mb_certify_case
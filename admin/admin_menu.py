@@ -10,6 +10,7 @@ from core.database import db_session
 from core.exception import AlertException
 from core.models import Board, Content, Group, Menu
 from core.template import AdminTemplates
+from lib.cache_registry import invalidate_tables
 from lib.common import *
 from lib.dependencies import validate_token
 
@@ -159,7 +160,7 @@ async def menu_list_update(
             db.commit()
 
         # 기존캐시 삭제
-        get_menus.cache_clear()
+        invalidate_tables(Menu.__tablename__)
 
     except Exception as e:
         db.rollback()
@@ -6,6 +6,7 @@ from core.exception import AlertException
 from core.formclass import NewwinForm
 from core.models import NewWin
 from core.template import AdminTemplates
+from lib.cache_registry import invalidate_tables
 from lib.common import *
 from lib.dependencies import validate_token
 
@@ -90,7 +91,7 @@ async def newwin_form_update(
         db.commit()
 
     # 기존 캐시 삭제
-    get_newwins.cache_clear()
+    invalidate_tables(NewWin.__tablename__)
 
     return RedirectResponse(url=f"/admin/newwin_form/{newwin.nw_id}", status_code=302)
 
@@ -109,6 +110,6 @@ async def newwin_delete(
     db.commit()
 
     # 기존 캐시 삭제
-    get_newwins.cache_clear()
+    invalidate_tables(NewWin.__tablename__)
 
     return RedirectResponse(url=f"/admin/newwin_list", status_code=302)
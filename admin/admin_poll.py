@@ -6,8 +6,10 @@ from core.exception import AlertException
 from core.formclass import PollForm
 from core.models import Poll, PollEtc
 from core.template import AdminTemplates
+from lib.cache_registry import invalidate_tables
 from lib.common import *
 from lib.dependencies import common_search_query_params, validate_token
+from lib.poll_lib import delete_poll_votes, get_poll_voters
 from lib.template_functions import get_member_level_select, get_paging
 
 router = APIRouter()
@@ -64,10 +66,11 @@ async def poll_list_delete(
     # in 조건을 사용해서 일괄 삭제
     db.execute(delete(Poll).where(Poll.po_id.in_(checks)))
     db.execute(delete(PollEtc).where(PollEtc.po_id.in_(checks)))
+    delete_poll_votes(db, checks)
     db.commit()
 
     # 기존캐시 삭제
-    get_recent_poll.cache_clear()
+    invalidate_tables(Poll.__tablename__)
 
     url = "/admin/poll_list"
     query_params = request.query_params
@@ -93,7 +96,13 @@ async def poll_form_edit(
     설문조사 수정 폼
     """
     poll = db.get(Poll, po_id)
-    context = {"request": request, "poll": poll}
+    vote_ips, vote_mb_ids = get_poll_voters(db, po_id) if poll else ([], [])
+    context = {
+        "request": request,
+        "poll": poll,
+        "vote_ips": vote_ips,
+        "vote_mb_ids": vote_mb_ids,
+    }
     return templates.TemplateResponse("poll_form.html", context)
 
 
@@ -128,7 +137,7 @@ async def poll_form_update(
         db.commit()
 
     # 기존캐시 삭제
-    get_recent_poll.cache_clear()
+    invalidate_tables(Poll.__tablename__)
 
     url = f"/admin/poll_form/{poll.po_id}"
     query_params = request.query_params
@@ -59,6 +59,7 @@ async def popular_delete(
     # in 조건을 사용해서 일괄 삭제
     db.execute(delete(Popular).where(Popular.pp_id.in_(checks)))
     db.commit()
+    get_populars.cache_clear()
 
     # 기존 캐시 삭제
     popular_cache.update({"populars": None})
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Request
+
+from core.template import AdminTemplates
+from lib.dependencies import validate_super_admin
+from lib.rate_limit import RATE_LIMIT_ROUTES, get_rate_limit_settings, rate_limiter
+
+router = APIRouter(dependencies=[Depends(validate_super_admin)])
+templates = AdminTemplates()
+
+RATE_LIMIT_MENU_KEY = "100910"
+
+
+@router.get("/rate_limit")
+async def rate_limit(request: Request):
+    """
+    요청 제한 현황
+    - 허용/제한 횟수와 최근 제한된 요청자는 현재 워커의 집계입니다.
+    """
+    request.session["menu_key"] = RATE_LIMIT_MENU_KEY
+
+    rules, _ = get_rate_limit_settings()
+    routes = []
+    for name, (method, pattern, description) in RATE_LIMIT_ROUTES.items():
+        routes.append({
+            "name": name,
+            "description": description,
+            "method": method,
+            "path": pattern.pattern,
+            "rule": rules.get(name),
+            "allowed": rate_limiter.allowed[name],
+            "blocked": rate_limiter.blocked[name],
+        })
+
+    blocked_keys = [
+        {"key": key, "count": count, "blocked_at": datetime.fromtimestamp(blocked_at)}
+        for key, count, blocked_at in rate_limiter.get_blocked_keys()
+    ]
+
+    context = {
+        "request": request,
+        "backend_name": rate_limiter.backend_name,
+        "bucket_count": rate_limiter.backend.count(),
+        "started_at": datetime.fromtimestamp(rate_limiter.started_at),
+        "routes": routes,
+        "blocked_keys": blocked_keys,
+    }
+    return templates.TemplateResponse("rate_limit.html", context)
@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, Form, Request
+import subprocess
+import sys
+
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
 
 from core.template import AdminTemplates
 from lib.common import *
+from lib.dependencies import validate_token
 
 router = APIRouter()
 templates = AdminTemplates()
 
 SERVICE_MENU_KEY = "100400"
+IMPORTTIME_REPORT_FILE = os.path.join("data", "cache", "importtime.json")
+IMPORTTIME_REPORT_ROWS = 30
 
 
 @router.get("/service")
@@ -17,7 +24,71 @@ async def service_view(request: Request):
     """
     request.session["menu_key"] = SERVICE_MENU_KEY
 
+    from main import admin_lazy_router  # 순환참조 방지
+
     context = {
         "request": request,
+        "admin_load_seconds": admin_lazy_router.load_seconds,
+        "importtime_report": read_importtime_report(),
     }
     return templates.TemplateResponse("service.html", context)
+
+
+@router.post("/service/importtime", dependencies=[Depends(validate_token)])
+async def service_importtime(request: Request):
+    """
+    워커 시작 시 모듈 import 시간 측정
+    - 새 프로세스에서 python -X importtime 으로 main 모듈을 import 하여 측정한다.
+    """
+    report = await run_in_threadpool(create_importtime_report)
+    os.makedirs(os.path.dirname(IMPORTTIME_REPORT_FILE), exist_ok=True)
+    with open(IMPORTTIME_REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False)
+
+    return RedirectResponse("/admin/service", status_code=303)
+
+
+def create_importtime_report(module: str = "main") -> dict:
+    """python -X importtime 결과를 누적 시간 순으로 정리하여 반환
+
+    Args:
+        module (str, optional): 측정할 모듈. Defaults to "main".
+
+    Returns:
+        dict: 측정 일시, 전체 시간(초), 모듈별 시간 목록
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, timeout=120
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "name": name,
+                "depth": (len(indent) - 1) // 2,
+                "self": int(self_us) / 1000000,
+                "cumulative": int(cumulative_us) / 1000000,
+            })
+
+    total = max((row["cumulative"] for row in modules), default=0)
+    modules.sort(key=lambda row: row["cumulative"], reverse=True)
+
+    return {
+        "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "module": module,
+        "total": total,
+        "modules": modules[:IMPORTTIME_REPORT_ROWS],
+    }
+
+
+def read_importtime_report() -> Optional[dict]:
+    """마지막으로 측정한 import 시간 결과를 반환"""
+    if not os.path.isfile(IMPORTTIME_REPORT_FILE):
+        return None
+
+    with open(IMPORTTIME_REPORT_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -3,11 +3,16 @@ from sqlalchemy import extract, select, cast, String
 
 from core.database import db_session
 from core.exception import AlertException
+from core.models import VisitRollup
 from core.template import AdminTemplates
 from lib.common import *
 from lib.dependencies import validate_super_admin, validate_token
-from lib.pbkdf2 import validate_password
+from lib.pbkdf2 import validate_password_async
 from lib.template_functions import get_paging
+from lib.visit_stats import (
+    DIRECT_REFERER, aggregate_visits, delete_visit_rollup, group_dates,
+    to_percent_list
+)
 
 router = APIRouter()
 templates = AdminTemplates()
@@ -108,7 +113,7 @@ async def visit_delete_update(
     """
     member = request.state.login_member
 
-    if not validate_password(admin_password, member.mb_password):
+    if not await validate_password_async(admin_password, member.mb_password):
         raise AlertException("관리자 비밀번호가 일치하지 않습니다.")
 
     if not year:
@@ -126,6 +131,7 @@ async def visit_delete_update(
     if method == "before":
         # 이전 자료 삭제
         query = query.where(Visit.vi_date < delete_date)
+        rollup_where = [VisitRollup.vr_date < delete_date]
 
     elif method == "specific":
         # 당월 자료만 삭제
@@ -133,10 +139,16 @@ async def visit_delete_update(
             extract('year', Visit.vi_date) == year,
             extract('month', Visit.vi_date) == month
         )
+        rollup_where = [
+            extract('year', VisitRollup.vr_date) == year,
+            extract('month', VisitRollup.vr_date) == month
+        ]
     else:
         raise AlertException("잘못된 요청입니다.", 400)
 
     result = db.execute(query)
+    # 삭제한 기간의 일별 집계도 함께 삭제
+    delete_visit_rollup(db, rollup_where)
     db.commit()
 
     raise AlertException(
@@ -230,38 +242,17 @@ async def visit_domain(
     request.session["menu_key"] = VISIT_MENU_KEY
     from_date, to_date = validate_time(from_date, to_date)
 
-    # 초기 쿼리 설정
-    visits = db.scalars(
-        select(Visit)
-        .where(Visit.vi_date.between(from_date, to_date + " 23:59:59"))
-    ).all()
+    # 접속경로별 접속자집계
+    counter, total_records = aggregate_visits(db, "domain", from_date, to_date)
 
+    # 사이트 내부에서 이동한 경우 직접 접속으로 처리
     site_url = f"{request.base_url.scheme}://{request.base_url.hostname}"
     if request.base_url.port:
         site_url += f":{request.base_url.port}"
-    # referer에서 도메인 필터링
-    filtered_visits = []
-    total_records = 0
-    for visit in visits:
-        # http or https
-        match = re.search(r'^http[s]*\S+', visit.vi_referer)
-        if match:
-            match_group = match.group()
-            referer: str = re.sub(r"^(www\.|search\.|dirsearch\.|dir\.search\.|dir\.|kr\.search\.|myhome\.)(.*)",
-                                  "\\2", match_group)
-            filtered_visits.append({
-                "vi_referer": '직접' if referer.startswith(site_url) else referer,
-                "count": 1,
-            })
-        else:
-            filtered_visits.append({
-                "vi_referer": '직접',
-                "count": 1,
-            })
-        total_records += 1
+    for referer in [key for key in counter if key.startswith(site_url)]:
+        counter[DIRECT_REFERER] += counter.pop(referer)
 
-    visits = count_by_field(filtered_visits, "vi_referer")
-    visits = add_percent_field(visits)
+    visits = to_percent_list(counter, "vi_referer", total_records)
 
     context = {
         "request": request,
@@ -286,25 +277,9 @@ async def visit_browser(
     request.session["menu_key"] = VISIT_MENU_KEY
     from_date, to_date = validate_time(from_date, to_date)
 
-    # 초기 쿼리 설정
-    visits = db.scalars(
-        select(Visit)
-        .where(Visit.vi_date.between(from_date, to_date + " 23:59:59"))
-    ).all()
-
     # 브라우저별 접속자집계
-    filtered_visits = []
-    total_records = 0
-    for visit in visits:
-        filtered_visits.append({
-            "vi_browser": visit.vi_browser or get_browser(visit.vi_agent),
-            "count": 1,
-        })
-
-        total_records += 1
-
-    visits = count_by_field(filtered_visits, "vi_browser")
-    visits = add_percent_field(visits)
+    counter, total_records = aggregate_visits(db, "browser", from_date, to_date)
+    visits = to_percent_list(counter, "vi_browser", total_records)
 
     context = {
         "request": request,
@@ -329,25 +304,9 @@ async def visit_os(
     request.session["menu_key"] = VISIT_MENU_KEY
     from_date, to_date = validate_time(from_date, to_date)
 
-    # 초기 쿼리 설정
-    visits = db.scalars(
-        select(Visit)
-        .where(Visit.vi_date.between(from_date, to_date + " 23:59:59"))
-    ).all()
-
     # OS별 접속자집계
-    filtered_visits = []
-    total_records = 0
-    for visit in visits:
-        filtered_visits.append({
-            "vi_os": visit.vi_os or get_os(visit.vi_agent),
-            "count": 1,
-        })
-
-        total_records += 1
-
-    visits = count_by_field(filtered_visits, "vi_os")
-    visits = add_percent_field(visits)
+    counter, total_records = aggregate_visits(db, "os", from_date, to_date)
+    visits = to_percent_list(counter, "vi_os", total_records)
 
     context = {
         "request": request,
@@ -372,25 +331,9 @@ async def visit_device(
     request.session["menu_key"] = VISIT_MENU_KEY
     from_date, to_date = validate_time(from_date, to_date)
 
-    # 초기 쿼리 설정
-    visits = db.scalars(
-        select(Visit)
-        .where(Visit.vi_date.between(from_date, to_date + " 23:59:59"))
-    ).all()
-
     # 접속기기별 접속자집계
-    filtered_visits = []
-    total_records = 0
-    for visit in visits:
-        filtered_visits.append({
-            "vi_device": visit.vi_device,
-            "count": 1,
-        })
-
-        total_records += 1
-
-    visits = count_by_field(filtered_visits, "vi_device")
-    visits = add_percent_field(visits)
+    counter, total_records = aggregate_visits(db, "device", from_date, to_date)
+    visits = to_percent_list(counter, "vi_device", total_records)
 
     context = {
         "request": request,
@@ -524,25 +467,9 @@ async def visit_date(
     request.session["menu_key"] = VISIT_MENU_KEY
     from_date, to_date = validate_time(from_date, to_date)
 
-    # 초기 쿼리 설정
-    visits = db.scalars(
-        select(Visit)
-        .where(Visit.vi_date.between(from_date, to_date + " 23:59:59"))
-    ).all()
-
-    # 접속자집계
-    filtered_visits = []
-    total_records = 0
-    for visit in visits:
-        filtered_visits.append({
-            "visit_date": visit.vi_date.strftime("%Y-%m-%d"),
-            "count": 1,
-        })
-
-        total_records += 1
-
-    visits = count_by_field(filtered_visits, "visit_date")
-    visits = add_percent_field(visits)
+    # 일별 접속자집계
+    counter, total_records = aggregate_visits(db, "total", from_date, to_date, group_by_date=True)
+    visits = to_percent_list(group_dates(counter, "%Y-%m-%d"), "visit_date", total_records, sort_by_key=True)
 
     context = {
         "request": request,
@@ -567,25 +494,9 @@ async def visit_month(
     request.session["menu_key"] = VISIT_MENU_KEY
     from_date, to_date = validate_time(from_date, to_date)
 
-    # 초기 쿼리 설정
-    visits = db.scalars(
-        select(Visit)
-        .where(Visit.vi_date.between(from_date, to_date + " 23:59:59"))
-    ).all()
-
-    # 접속자집계
-    filtered_visits = []
-    total_records = 0
-    for visit in visits:
-        filtered_visits.append({
-            "visit_month": visit.vi_date.strftime("%Y-%m"),
-            "count": 1,
-        })
-
-        total_records += 1
-
-    visits = count_by_field(filtered_visits, "visit_month")
-    visits = add_percent_field(visits)
+    # 월별 접속자집계
+    counter, total_records = aggregate_visits(db, "total", from_date, to_date, group_by_date=True)
+    visits = to_percent_list(group_dates(counter, "%Y-%m"), "visit_month", total_records, sort_by_key=True)
 
     context = {
         "request": request,
@@ -610,25 +521,9 @@ async def visit_year(
     request.session["menu_key"] = VISIT_MENU_KEY
     from_date, to_date = validate_time(from_date, to_date)
 
-    # 초기 쿼리 설정
-    visits = db.scalars(
-        select(Visit)
-        .where(Visit.vi_date.between(from_date, to_date + " 23:59:59"))
-    ).all()
-
-    # 접속자집계
-    filtered_visits = []
-    total_records = 0
-    for visit in visits:
-        filtered_visits.append({
-            "visit_year": visit.vi_date.strftime("%Y"),
-            "count": 1,
-        })
-
-        total_records += 1
-
-    visits = count_by_field(filtered_visits, "visit_year")
-    visits = add_percent_field(visits)
+    # 연도별 접속자집계
+    counter, total_records = aggregate_visits(db, "total", from_date, to_date, group_by_date=True)
+    visits = to_percent_list(group_dates(counter, "%Y"), "visit_year", total_records, sort_by_key=True)
 
     context = {
         "request": request,
@@ -640,95 +535,6 @@ async def visit_year(
     return templates.TemplateResponse("visit_year.html", context)
 
 
-def count_by_field(list: list, field_name: str) -> list:
-    """기존 리스트를 field_name 기준으로 합산합니다.
-    Args:
-        list (list): 접속자 리스트
-    """
-    temp = {}
-    for item in list:
-        referer = item[field_name]
-        count = item["count"]
-
-        if referer in temp:
-            temp[referer] += count
-        else:
-            temp[referer] = count
-    return [{field_name: key, "count": value} for key, value in temp.items()]
-
-
-def add_percent_field(list: [dict]) -> list:
-    """기존 리스트에 백분율을 계산하여 percent 필드를 추가합니다.
-    Args:
-        list (list): 접속자 리스트 (count 필드가 있어야 함)
-    """
-    key_exists = any('count' in key for key in list)
-    if not key_exists:
-        return list
-
-    total_count = sum([item["count"] for item in list])
-    for item in list:
-        item["percent"] = round(item["count"] / total_count * 100, 2)
-    return list
-
-
-def get_browser(user_agent):
-    """브라우저이름을 반환합니다.
-    """
-    user_agent = user_agent.lower()
-
-    browsers = {
-        'Chrome': r"chrome",
-        'FireFox': r"firefox",
-        'Safari': r"safari",
-        'Opera': r"opera",
-        'MSIE': r"msie ([1-9][0-9]\.[0-9]+)",
-        'Mozilla': r"mozilla",
-        'Robot': r"bot|Yeti|Baidu|Daumoa|Yandex|slurp|facebook",
-        'IE': r"internet explorer"
-    }
-
-    for browser_name, pattern in browsers.items():
-        if re.search(pattern, user_agent):
-            return browser_name
-
-    return "other"  # todo 다국어
-
-
-def get_os(user_agent):
-    user_agent = user_agent.lower()
-
-    os_patterns = {
-        "Android": r"android",
-        "IOS": r"IOS",
-        "iPad OS": r"iPad",
-        "Phone": r"phone",
-        "Windows10": r"windows nt 10\.0",
-        "Windows8.1": r"windows nt 6\.3",
-        "Windows8": r"windows nt 6\.2",
-        "Windows7": r"windows nt 6\.1",
-        "Vista": r"windows nt 6\.0",
-        "XP": r"windows nt 5\.1",
-        "2003": r"windows nt 5\.2",
-        "NT": r"windows nt 4\.[0-9]*",
-        "CE": r"windows ce",
-        "MAC": r"mac",
-        "Robot": r"bot|Yeti|Baidu|Daumoa|Yandex|slurp|facebook ",
-        "Linux": r"linux",
-        "Solrais": r"solrais",
-        "IE": r"internet explorer",
-        "Mozilla": r"mozilla",
-        "IRIX": r"irix"
-    }
-
-    # Iterate through the patterns and return the first matching OS
-    for os_name, pattern in os_patterns.items():
-        if re.search(pattern, user_agent):
-            return os_name
-
-    return "other"
-
-
 def validate_time(from_date, to_date):
     if from_date:
         from_date = re.sub(r'[^0-9 :\-]', '', from_date)
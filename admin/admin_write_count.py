@@ -1,16 +1,13 @@
-from collections import defaultdict
-
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-from fastapi import APIRouter, Query, Request
-from sqlalchemy import case, func, or_, select
-from sqlalchemy.sql.expression import func
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import RedirectResponse
+from sqlalchemy import select
 
 from core.database import db_session
 from core.models import *
 from core.template import AdminTemplates
+from lib.board_activity import aggregate_board_activity, rebuild_board_activity
 from lib.common import *
+from lib.dependencies import validate_token
 from lib.template_functions import (
     get_editor_select, get_group_select,
     get_member_level_select, get_skin_select
@@ -77,198 +74,28 @@ async def write_count(request: Request, db: db_session,
     
     bo_table_array = db.execute(select(Board.bo_table, Board.bo_subject).order_by(Board.bo_count_write.desc())).all()
 
-    # Determine the current dialect
-    dialect = db.bind.dialect.name
-
-    x_data = []
-    y_data = []
-    x_label = ""
-    
-    if day == '시간':
-        
-        x_label = 'hours'
-        if dialect == 'postgresql':
-            hours_expr = func.to_char(BoardNew.bn_datetime, 'HH24')
-        else:
-            # 여기에 다른 방언에 대한 코드를 추가하세요
-            hours_expr = func.substr(BoardNew.bn_datetime, 12, 2)  # 이는 일반적인 경우에 대한 예입니다.
-
-        result = db.execute(
-            select(
-                hours_expr.label(x_label), 
-                func.sum(case((BoardNew.wr_id == BoardNew.wr_parent, 1), else_=0)).label('write_count'),
-                func.sum(case((BoardNew.wr_id != BoardNew.wr_parent, 1), else_=0)).label('comment_count')
-            ).filter(
-                BoardNew.bn_datetime.between(from_date, to_date),
-                or_(BoardNew.bo_table == bo_table, bo_table == '')
-            ).group_by(x_label, BoardNew.bn_datetime).order_by(BoardNew.bn_datetime)
-        ).all()
-
-        for row in result:
-            x_data.append(f"['{row.hours[:8]}',{row.write_count}]")
-            y_data.append(f"['{row.hours[:8]}',{row.comment_count}]")
-            
-    elif day == '일':
-        
-        x_label = 'days'
-        
-        if dialect == 'mysql':
-            date_expr = func.date_format(BoardNew.bn_datetime, '%Y-%m-%d')
-        elif dialect == 'postgresql':
-            date_expr = func.to_char(BoardNew.bn_datetime, 'YYYY-MM-DD')
-        elif dialect == 'sqlite':
-            date_expr = func.strftime('%Y-%m-%d', BoardNew.bn_datetime)
-        else:
-            raise Exception(f"Unsupported dialect: {dialect}")
-                                    
-        result = db.execute(
-            select(
-                date_expr.label(x_label), 
-                func.sum(case((BoardNew.wr_id == BoardNew.wr_parent, 1), else_=0)).label('write_count'),
-                func.sum(case((BoardNew.wr_id != BoardNew.wr_parent, 1), else_=0)).label('comment_count')
-            ).filter(
-                BoardNew.bn_datetime.between(from_date, to_date),
-                or_(BoardNew.bo_table == bo_table, bo_table == '')
-            ).group_by(x_label, BoardNew.bn_datetime).order_by(BoardNew.bn_datetime)
-        ).all()
-        
-        for row in result:
-            x_data.append(f"['{row.days[5:10]}',{row.write_count}]")
-            y_data.append(f"['{row.days[5:10]}',{row.comment_count}]")
-            
-    elif day == '주':
-        
-        x_label = 'weeks'
-        
-        if dialect == 'mysql':
-            week_expr = func.week(BoardNew.bn_datetime)
-            concat_expr = func.concat(func.substr(BoardNew.bn_datetime, 1, 4), '-', week_expr)
-        elif dialect == 'postgresql':
-            week_expr = func.extract('week', BoardNew.bn_datetime)
-            concat_expr = func.to_char(BoardNew.bn_datetime, 'IYYY-IW')  # Using ISO week numbering
-        elif dialect == 'sqlite':
-            week_expr = func.strftime('%W', BoardNew.bn_datetime)
-            concat_expr = func.substr(BoardNew.bn_datetime, 1, 4) + '-' + week_expr
-        else:
-            raise Exception(f"Unsupported dialect: {dialect}")
-
-        result = db.execute(
-            select(
-                concat_expr.label(x_label), 
-                func.sum(case((BoardNew.wr_id == BoardNew.wr_parent, 1), else_=0)).label('write_count'),
-                func.sum(case((BoardNew.wr_id != BoardNew.wr_parent, 1), else_=0)).label('comment_count')
-            ).filter(
-                BoardNew.bn_datetime.between(from_date, to_date),
-                or_(BoardNew.bo_table == bo_table, bo_table == '')
-            ).group_by(x_label, BoardNew.bn_datetime).order_by(BoardNew.bn_datetime)
-        ).all()
-        
-        for row in result:
-            lyear, lweek = row.weeks.split('-')
-            date = (datetime.strptime(f"{lyear}W{str(lweek).zfill(2)}", "%YW%W") + timedelta(days=1)).strftime("%y-%m-%d")
-            x_data.append(f"['{date}',{row.write_count}]")
-            y_data.append(f"['{date}',{row.comment_count}]")
-
-    elif day == '월':
-        
-        x_label = 'months'
-
-        if dialect == 'mysql':
-            month_expr = func.date_format(BoardNew.bn_datetime, '%Y-%m')
-        elif dialect == 'postgresql':
-            month_expr = func.to_char(BoardNew.bn_datetime, 'YYYY-MM')
-        elif dialect == 'sqlite':
-            month_expr = func.strftime('%Y-%m', BoardNew.bn_datetime)
-        else:
-            raise Exception(f"Unsupported dialect: {dialect}")
+    # 시간별 집계 테이블에서 그래프 단위별로 집계
+    x_label = {'시간': 'hours', '일': 'days', '주': 'weeks', '월': 'months', '년': 'years'}[day]
+    rows = aggregate_board_activity(db, bo_table, from_date, to_date, day)
+    has_data = any(write_count or comment_count for _, write_count, comment_count in rows)
 
-        result = db.execute(
-            select(
-                month_expr.label(x_label), 
-                func.sum(case((BoardNew.wr_id == BoardNew.wr_parent, 1), else_=0)).label('write_count'),
-                func.sum(case((BoardNew.wr_id != BoardNew.wr_parent, 1), else_=0)).label('comment_count')
-            ).filter(
-                BoardNew.bn_datetime.between(from_date, to_date),
-                or_(BoardNew.bo_table == bo_table, bo_table == '')
-            ).group_by(x_label, BoardNew.bn_datetime).order_by(BoardNew.bn_datetime)
-        ).all()
+    # Lazy import (pandas, plotly는 import 시간이 길어 그래프 생성 시에만 불러온다)
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
 
-        for row in result:
-            x_data.append(f"['{row.months[2:7]}',{row.write_count}]")
-            y_data.append(f"['{row.months[2:7]}',{row.comment_count}]")
-
-    elif day == '년':
-        
-        x_label = 'years'
-        
-        if dialect == 'mysql':
-            year_expr = func.year(BoardNew.bn_datetime)
-        elif dialect == 'postgresql':
-            year_expr = func.extract('year', BoardNew.bn_datetime).cast(Integer)
-        elif dialect == 'sqlite':
-            year_expr = func.strftime('%Y', BoardNew.bn_datetime)
-        else:
-            raise Exception(f"Unsupported dialect: {dialect}")
-
-        result = db.execute(
-            select(
-                year_expr.label(x_label), 
-                func.sum(case((BoardNew.wr_id == BoardNew.wr_parent, 1), else_=0)).label('write_count'),
-                func.sum(case((BoardNew.wr_id != BoardNew.wr_parent, 1), else_=0)).label('comment_count')
-            ).filter(
-                BoardNew.bn_datetime.between(from_date, to_date),
-                or_(BoardNew.bo_table == bo_table, bo_table == '')
-            ).group_by(x_label, BoardNew.bn_datetime).order_by(BoardNew.bn_datetime)
-        ).all()
-
-        for row in result:
-            year = str(row.years)[:4]
-            x_data.append(f"['{year}',{row.write_count}]")
-            y_data.append(f"['{year}',{row.comment_count}]")
-
-    
-    # 날짜별로 글과 댓글을 합침
-    aggregated_data = defaultdict(lambda: [0, 0])
-    for row in result:
-        x, write_count, comment_count = row
-        aggregated_data[x][0] += int(write_count)
-        aggregated_data[x][1] += int(comment_count)
-        
-    # print(day)            
-    # print(result)
-    # print(x_label)            
-    # print(aggregated_data)
-            
     # 데이터 프레임 생성
     df = pd.DataFrame({
-        x_label: aggregated_data.keys(),
-        'write_count': [wc for wc, _ in aggregated_data.values()],
-        'comment_count': [cc for _, cc in aggregated_data.values()]
+        x_label: [label for label, _, _ in rows],
+        'write_count': [write_count for _, write_count, _ in rows],
+        'comment_count': [comment_count for _, _, comment_count in rows]
     })
-    
-    # x_label에 따라 날짜/시간 형식 변경
-    if x_label == "hours":
-        df[x_label] = pd.to_datetime(df[x_label].astype(str), format='%H').dt.strftime('%H:%M %p')
-    elif x_label == "days":
-        df[x_label] = pd.to_datetime(df[x_label]).dt.strftime('%y-%m-%d')
-    elif x_label == "weeks":
-        # df[x_label] = pd.to_datetime(df[x_label]).dt.strftime('Week %U, %Y')
-        # 'weeks' 열의 값을 변환
-        df[x_label] = df[x_label].apply(lambda x: datetime.strptime(x + '-1', "%Y-%W-%w"))
-        # 변환된 날짜를 'Week %U, %Y' 형식으로 다시 형식화
-        # df[x_label] = df[x_label].dt.strftime('Week %U, %Y')
-        df[x_label] = pd.to_datetime(df[x_label], errors='coerce')
-        df[x_label] = df[x_label].dt.strftime('Week %U, %Y')
-    elif x_label == "months":
-        df[x_label] = pd.to_datetime(df[x_label]).dt.strftime('%b, %Y')
-    elif x_label == "years":
-        df[x_label] = pd.to_datetime(df[x_label].astype(str), format= '%Y').dt.strftime('%Y')
-        
+
     if not (graph == 'bar' or graph == 'line' or graph == 'scatter'):
         graph = 'bar'
     
     # 그래프 생성 함수를 매핑합니다.
-    if not df[x_label].empty:
+    if has_data:
         graph_mapping = {
             'bar': px.bar,
             'line': px.line,
@@ -313,3 +140,13 @@ async def write_count(request: Request, db: db_session,
         "graph_html": graph_html,
     }
     return templates.TemplateResponse("write_count.html", context)
+
+
+@router.post("/write_count/rebuild", dependencies=[Depends(validate_token)])
+async def write_count_rebuild(request: Request, db: db_session):
+    '''
+    글, 댓글 현황 집계 다시 생성
+    '''
+    rebuild_board_activity(db)
+
+    return RedirectResponse("/admin/write_count", status_code=303)
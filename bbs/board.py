@@ -7,8 +7,9 @@ from datetime import datetime
 from typing import List
 from typing_extensions import Annotated
 
-from fastapi import APIRouter, Depends, Request, File, Form, Path, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, File, Form, Path, Query
 from fastapi.responses import FileResponse, RedirectResponse
+from starlette.background import BackgroundTask
 from sqlalchemy import asc, desc, exists, func, select, update
 
 from core.database import db_session
@@ -16,17 +17,26 @@ from core.exception import AlertException
 from core.formclass import WriteForm, WriteCommentForm
 from core.models import AutoSave, Board, BoardGood, Group, Scrap
 from core.template import UserTemplates
+from lib.board_activity import add_board_activity
 from lib.board_lib import *
 from lib.common import *
 from lib.dependencies import (
     check_group_access, common_search_query_params, get_board, get_write,
     validate_captcha, validate_token
 )
-from lib.pbkdf2 import create_hash
-from lib.point import delete_point, insert_point
-from lib.template_filters import datetime_format, number_format
+from lib.pbkdf2 import create_hash_async
+from lib.point import insert_point
+from lib.template_filters import number_format
 from lib.template_functions import get_paging
 from lib.g5_compatibility import G5Compatibility
+from lib.page_cache import purge_board_pages
+from lib.session_marks import (
+    MARK_DOWNLOAD, MARK_SECRET, MARK_SECRET_COMMENT, MARK_VIEW,
+    add_mark, download_file_mark, get_marks, has_mark, link_mark
+)
+from lib.conditional_get import (
+    get_write_modified_at, is_not_modified, make_board_validators, not_modified_response
+)
 from lib.html_sanitizer import content_sanitizer
 
 
@@ -112,6 +122,11 @@ async def list_post(
     if not board_config.is_list_level():
         raise AlertException("목록을 볼 권한이 없습니다.", 403)
 
+    # 게시판이 변경되지 않았으면 목록을 조회하지 않고 304 응답
+    validators = make_board_validators(request, bo_table)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
     board.subject = board_config.subject
     sca = request.query_params.get("sca")
     sfl = search_params['sfl']
@@ -197,13 +212,15 @@ async def list_post(
         "next_spt": next_spt,
     }
     return templates.TemplateResponse(
-        f"/board/{board.bo_skin}/list_post.html", context)
+        f"/board/{board.bo_skin}/list_post.html", context,
+        headers=validators.headers() if validators else None)
 
 
 @router.post("/list_delete/{bo_table}", dependencies=[Depends(validate_token)])
 async def list_delete(
     request: Request,
     db: db_session,
+    background_tasks: BackgroundTasks,
     board: Annotated[Board, Depends(get_board)],
     bo_table: str = Path(...),
     wr_ids: list = Form(..., alias="chk_wr_id[]"),
@@ -218,28 +235,15 @@ async def list_delete(
     if not admin_type:
         raise AlertException("게시판 관리자 이상 접근이 가능합니다.", 403)
 
-    # 게시글 조회
-    write_model = dynamic_create_write_table(bo_table)
-    writes = db.scalars(
-        select(write_model)
-        .where(write_model.wr_id.in_(wr_ids))
-    ).all()
-    for write in writes:
-        db.delete(write)
-        # 원글 포인트 삭제
-        if not delete_point(request, write.mb_id, board.bo_table, write.wr_id, "쓰기"):
-            insert_point(request, write.mb_id, board.bo_write_point * (-1), f"{board.bo_subject} {write.wr_id} 글 삭제")
-        
-        # 파일 삭제
-        BoardFileManager(board, write.wr_id).delete_board_files()
-
-        # TODO: 댓글 삭제
-    db.commit()
+    # 게시글/댓글 및 관련 데이터 일괄 삭제
+    delete_manager = BoardDeleteManager(request, db)
+    delete_manager.delete((bo_table, wr_id) for wr_id in wr_ids)
+    # 첨부파일은 응답 이후 백그라운드에서 삭제
+    background_tasks.add_task(delete_manager.unlink_files)
 
     # 최신글 캐시 삭제
     FileCache().delete_prefix(f'latest-{bo_table}')
-
-    # TODO: 게시글 삭제시 같이 삭제해야할 것들 추가
+    purge_board_pages(bo_table)
 
     query_params = request.query_params
     url = f"/board/{bo_table}"
@@ -299,7 +303,6 @@ async def move_update(
     """
     게시글 복사/이동
     """
-    config = request.state.config
     act = "이동" if sw == "move" else "복사"
 
     # 게시판관리자 검증
@@ -309,98 +312,24 @@ async def move_update(
     if not admin_type:
         raise AlertException("게시판 관리자 이상 접근이 가능합니다.", 403)
 
-    # 입력받은 정보를 토대로 게시글을 복사한다.
-    write_model = dynamic_create_write_table(origin_bo_table)
-    origin_writes = db.scalars(
-        select(write_model)
-        .where(write_model.wr_id.in_(wr_ids.split(',')))
-    ).all()
+    # 선택한 게시글/댓글을 집합 단위로 복사/이동 (단일 트랜잭션)
+    move_manager = BoardMoveManager(request, db, origin_board, sw)
+    changed_bo_tables = move_manager.run(wr_ids.split(','), target_bo_tables, FILE_DIRECTORY)
 
-    # 게시글 복사/이동 작업 반복
+    # 최신글 캐시 삭제 (게시판별 1회)
     file_cache = FileCache()
-    for target_bo_table in target_bo_tables:
-        for origin_write in origin_writes:
-            target_write_model = dynamic_create_write_table(target_bo_table)
-            target_write = target_write_model()
-
-            # 복사/이동 로그 기록
-            if not origin_write.wr_is_comment and config.cf_use_copy_log:
-                nick = cut_name(request, member.mb_nick)
-                log_msg = f"[이 게시물은 {nick}님에 의해 {datetime_format(datetime.now()) } {origin_board.bo_subject}에서 {act} 됨]"
-                if "html" in origin_write.wr_option:
-                    log_msg = f'<div class="content_{sw}">' + log_msg + '</div>'
-                else:
-                    log_msg = '\n' + log_msg
-
-            # 게시글 복사
-            initial_field = ["wr_id", "wr_parent"]
-            for field in origin_write.__table__.columns.keys():
-                if field in initial_field:
-                    continue
-                elif field == 'wr_content':
-                    target_write.wr_content = origin_write.wr_content + log_msg
-                elif field == 'wr_num':
-                    target_write.wr_num = get_next_num(target_bo_table)
-                else:
-                    setattr(target_write, field, getattr(origin_write, field))
-
-            if sw == "copy":
-                target_write.wr_good = 0
-                target_write.wr_nogood = 0
-                target_write.wr_hit = 0
-                target_write.wr_datetime = datetime.now()
-
-            # 게시글 추가
-            db.add(target_write)
-            db.commit()
-            # 부모아이디 설정
-            target_write.wr_parent = target_write.wr_id
-            db.commit()
-
-            if sw == "move":
-                # 최신글 이동
-                db.execute(
-                    update(BoardNew)
-                    .where(BoardNew.bo_table == origin_board.bo_table, BoardNew.wr_id == origin_write.wr_id)
-                    .values(bo_table=target_bo_table, wr_id=target_write.wr_id, wr_parent=target_write.wr_id)
-                )
-                # 게시글
-                if not origin_write.wr_is_comment:
-                    # 추천데이터 이동
-                    db.execute(
-                        update(BoardGood)
-                        .where(BoardGood.bo_table == target_bo_table, BoardGood.wr_id == target_write.wr_id)
-                        .values(bo_table=target_bo_table, wr_id=target_write.wr_id)
-                    )
-                    # 스크랩 이동
-                    db.execute(
-                        update(Scrap)
-                        .where(Scrap.bo_table == target_bo_table, Scrap.wr_id == target_write.wr_id)
-                        .values(bo_table=target_bo_table, wr_id=target_write.wr_id)
-                    )
-                # 기존 데이터 삭제
-                db.delete(origin_write)
-                db.commit()
-
-            # 파일이 존재할 경우
-            file_manager = BoardFileManager(origin_board, origin_write.wr_id)
-            if file_manager.is_exist():
-                if sw == "move":
-                    file_manager.move_board_files(FILE_DIRECTORY, target_bo_table, target_write.wr_id)
-                else:
-                    file_manager.copy_board_files(FILE_DIRECTORY, target_bo_table, target_write.wr_id)
-
-        # 최신글 캐시 삭제
-        file_cache.delete_prefix(f'latest-{target_bo_table}')
-
-    # 원본 게시판 최신글 캐시 삭제
-    file_cache.delete_prefix(f'latest-{origin_bo_table}')
+    for bo_table in changed_bo_tables:
+        file_cache.delete_prefix(f'latest-{bo_table}')
+    purge_board_pages(*changed_bo_tables)
 
     context = {
         "request": request,
         "errors": f"해당 게시물을 선택한 게시판으로 {act} 하였습니다."
     }
-    return templates.TemplateResponse("alert_close.html", context)
+    # 첨부파일은 응답 이후 백그라운드에서 복사/이동한다.
+    return templates.TemplateResponse(
+        "alert_close.html", context,
+        background=BackgroundTask(move_manager.copy_physical_files))
 
 
 @router.get("/write/{bo_table}", dependencies=[Depends(check_group_access)])
@@ -647,7 +576,7 @@ async def write_update(
 
                 raise AlertException(message, 403)
 
-        form_data.wr_password = create_hash(form_data.wr_password) if form_data.wr_password else ""
+        form_data.wr_password = await create_hash_async(form_data.wr_password) if form_data.wr_password else ""
         form_data.wr_name = board_config.set_wr_name(member, form_data.wr_name)
         form_data.wr_email = getattr(member, "mb_email", form_data.wr_email)
         form_data.wr_homepage = getattr(member, "mb_homepage", form_data.wr_homepage)
@@ -672,7 +601,7 @@ async def write_update(
 
         # 비밀글은 세션 생성
         if secret:
-            request.session[f"ss_secret_{bo_table}_{write.wr_id}"] = True
+            add_mark(request.session, bo_table, MARK_SECRET, write.wr_id)
 
         # 새글 추가
         insert_board_new(bo_table, write)
@@ -694,7 +623,7 @@ async def write_update(
 
         write = get_write(db, bo_table, wr_id)
 
-        form_data.wr_password = create_hash(form_data.wr_password) if form_data.wr_password else ""
+        form_data.wr_password = await create_hash_async(form_data.wr_password) if form_data.wr_password else ""
 
         for field, value in form_data.__dict__.items():
             if value:
@@ -764,8 +693,12 @@ async def write_update(
         write.wr_file = wr_file
         db.commit()
 
+    # 최신글 테이블의 게시글 정보 갱신 (제목, 섬네일 등)
+    update_board_new(bo_table, write)
+
     # 최신글 캐시 삭제
     FileCache().delete_prefix(f'latest-{bo_table}')
+    purge_board_pages(bo_table)
 
     # 글쓰기 후 이동할 URL
     query_params = remove_query_params(request, "parent_id")
@@ -822,11 +755,10 @@ async def read_post(
         raise AlertException("글을 읽을 권한이 없습니다.", 403)
 
     # 비밀글 검증
-    session_secret_name = f"ss_secret_{bo_table}_{wr_id}"
     if ("secret" in write.wr_option
             and not admin_type
             and not is_owner(write, mb_id)
-            and not request.session.get(session_secret_name)):
+            and not has_mark(request.session, bo_table, MARK_SECRET, wr_id)):
         # 부모글이 본인글이라면 열람 가능
         owner = False
         if write.wr_reply and mb_id:
@@ -845,7 +777,7 @@ async def read_post(
             return RedirectResponse(
                 set_url_query_params(url, query_params), status_code=303)
 
-        request.session[session_secret_name] = True
+        add_mark(request.session, bo_table, MARK_SECRET, wr_id)
 
     # 게시글 정보 설정
     write.ip = board_config.get_display_ip(write.wr_ip)
@@ -853,8 +785,7 @@ async def read_post(
 
     # 세션 체크
     # 한번 읽은 게시글은 세션만료까지 조회수, 포인트 처리를 하지 않는다.
-    session_name = f"ss_view_{bo_table}_{wr_id}"
-    if not request.session.get(session_name) and mb_id != write.mb_id:
+    if not has_mark(request.session, bo_table, MARK_VIEW, wr_id) and mb_id != write.mb_id:
         # 포인트 검사
         if config.cf_use_point:
             read_point = board.bo_read_point
@@ -872,7 +803,17 @@ async def read_post(
         write.wr_hit = write.wr_hit + 1
         db.commit()
 
-        request.session[session_name] = True
+        add_mark(request.session, bo_table, MARK_VIEW, wr_id)
+
+    # 게시글/댓글/게시판이 변경되지 않았으면 댓글 등을 조회하지 않고 304 응답
+    secret_comment_marks = get_marks(request.session, bo_table, MARK_SECRET_COMMENT)
+    validators = make_board_validators(
+        request, bo_table,
+        write.wr_id, write.wr_last, write.wr_comment, write.wr_good, write.wr_nogood, sorted(secret_comment_marks),
+        modified_at=get_write_modified_at(write)
+    )
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
 
     if member:
         # 스크랩 여부 확인
@@ -960,13 +901,12 @@ async def read_post(
         comment.is_secret = "secret" in comment.wr_option
 
         # 비밀댓글 처리
-        session_secret_comment_name = f"ss_secret_comment_{bo_table}_{comment.wr_id}"
         parent_write = db.get(write_model, comment.wr_parent)
         if (comment.is_secret
                 and not admin_type
                 and not is_owner(comment, mb_id)
                 and not is_owner(parent_write, mb_id)
-                and not request.session.get(session_secret_comment_name)):
+                and comment.wr_id not in secret_comment_marks):
             comment.is_secret_content = True
             comment.save_content = "비밀글 입니다."
         else:
@@ -1001,7 +941,8 @@ async def read_post(
         "is_comment_write": board_config.is_comment_level(),
     }
     return templates.TemplateResponse(
-        f"/board/{board.bo_skin}/read_post.html", context)
+        f"/board/{board.bo_skin}/read_post.html", context,
+        headers=validators.headers() if validators else None)
 
 
 # 게시글 삭제
@@ -1009,6 +950,7 @@ async def read_post(
 async def delete_post(
     request: Request,
     db: db_session,
+    background_tasks: BackgroundTasks,
     board: Annotated[Board, Depends(get_board)],
     write: Annotated[WriteBaseModel, Depends(get_write)],
     bo_table: str = Path(...),
@@ -1023,7 +965,7 @@ async def delete_post(
         raise AlertException(f"이 글과 관련된 댓글이 {board.bo_count_delete}건 이상 존재하므로 삭제 할 수 없습니다.", 403)
 
     # 게시글 삭제 처리
-    delete_write(request, bo_table, write)
+    delete_write(request, bo_table, write, background_tasks)
 
     # request.query_params에서 token 제거
     query_params = remove_query_params(request, "token")
@@ -1072,8 +1014,7 @@ async def download_file(
     mb_id = getattr(member, "mb_id", None)
 
     # 게시물당 포인트가 한번만 차감되도록 세션 설정
-    session_name = f"ss_down_{bo_table}_{wr_id}"
-    if not request.session.get(session_name):
+    if not has_mark(request.session, bo_table, MARK_DOWNLOAD, wr_id):
         # 포인트 검사
         if config.cf_use_point:
             download_point = board.bo_download_point
@@ -1087,14 +1028,13 @@ async def download_file(
             else:
                 insert_point(request, mb_id, download_point, f"{board.bo_subject} {write.wr_id} 파일 다운로드", board.bo_table, write.wr_id, "다운로드")
 
-        request.session[session_name] = True
+        add_mark(request.session, bo_table, MARK_DOWNLOAD, wr_id)
 
-    download_session_name = f"ss_down_{bo_table}_{wr_id}_{board_file.bf_no}"
-    if not request.session.get(download_session_name):
+    if not has_mark(request.session, bo_table, download_file_mark(board_file.bf_no), wr_id):
         # 다운로드 횟수 증가
         file_manager.update_download_count(board_file)
         # 파일 다운로드 세션 설정
-        request.session[download_session_name] = True
+        add_mark(request.session, bo_table, download_file_mark(board_file.bf_no), wr_id)
 
     return FileResponse(board_file.bf_file, filename=board_file.bf_source)
 
@@ -1177,7 +1117,7 @@ async def write_comment_update(
         comment.wr_is_comment = 1
         comment.wr_content = content_sanitizer.get_cleaned_data(form.wr_content)
         comment.mb_id = getattr(member, "mb_id", "")
-        comment.wr_password = create_hash(form.wr_password) if form.wr_password else ""
+        comment.wr_password = await create_hash_async(form.wr_password) if form.wr_password else ""
         comment.wr_name = board_config.set_wr_name(member, form.wr_name)
         comment.wr_email = getattr(member, "mb_email", "")
         comment.wr_homepage = getattr(member, "mb_homepage", "")
@@ -1213,6 +1153,10 @@ async def write_comment_update(
         comment.wr_option = form.wr_secret or "html1"
         comment.wr_last = now
         db.commit()
+        update_board_new(bo_table, comment)
+
+    # 게시글 페이지 캐시 삭제
+    purge_board_pages(bo_table)
 
     query_params = request.query_params
     url = f"/board/{bo_table}/{form.wr_id}"
@@ -1256,6 +1200,7 @@ async def delete_comment(
 
     # 댓글 삭제
     db.delete(comment)
+    db.execute(delete(BoardNew).where(BoardNew.bo_table == bo_table, BoardNew.wr_id == comment_id))
     db.commit()
 
     # 게시글에 댓글 수 감소
@@ -1265,6 +1210,12 @@ async def delete_comment(
     )
     db.commit()
 
+    # 글, 댓글 현황 집계
+    add_board_activity(bo_table, comment, -1)
+
+    # 게시글 페이지 캐시 삭제
+    purge_board_pages(bo_table)
+
     url = f"/board/{bo_table}/{comment.wr_parent}"
     return RedirectResponse(
         set_url_query_params(url, query_params), status_code=303)
@@ -1289,13 +1240,12 @@ async def link_url(
         raise AlertException("링크가 존재하지 않습니다.", 404)
 
     # 링크 세션 설정
-    link_session_name = f"ss_link_{bo_table}_{wr_id}_{no}"
-    if not request.session.get(link_session_name):
+    if not has_mark(request.session, bo_table, link_mark(no), wr_id):
         # 링크 횟수 증가
         link_hit = getattr(write, f"wr_link{no}_hit", 0) + 1
         setattr(write, f"wr_link{no}_hit", link_hit)
         db.commit()
-        request.session[link_session_name] = True
+        add_mark(request.session, bo_table, link_mark(no), wr_id)
 
     # url에 http가 없으면 붙여줌
     if not url.startswith("http"):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Form, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, Query, Request
 from fastapi.responses import RedirectResponse
 
 from core.database import db_session
@@ -7,7 +7,7 @@ from core.template import UserTemplates
 from lib.board_lib import *
 from lib.common import *
 from lib.dependencies import validate_token
-from lib.point import delete_point, insert_point
+from lib.page_cache import purge_board_pages
 from lib.template_functions import get_group_select, get_paging
 
 router = APIRouter()
@@ -35,9 +35,9 @@ async def board_new_list(
     if mb_id:
         query = query.where(BoardNew.mb_id == mb_id)
     if view == "write":
-        query = query.where(BoardNew.wr_parent == BoardNew.wr_id)
+        query = query.where(BoardNew.bn_is_comment == 0)
     elif view == "comment":
-        query = query.where(BoardNew.wr_parent != BoardNew.wr_id)
+        query = query.where(BoardNew.bn_is_comment == 1)
 
     # 페이지 번호에 따른 offset 계산
     page_rows = config.cf_mobile_page_rows if request.state.is_mobile and config.cf_mobile_page_rows else config.cf_new_rows
@@ -46,25 +46,25 @@ async def board_new_list(
     board_news = db.scalars(query.add_columns(BoardNew).offset(offset).limit(page_rows)).all()
     total_count = db.scalar(query.add_columns(func.count(BoardNew.bn_id)).order_by(None))
 
-    # 결과 데이터 설정
-    for new in board_news:
-        new.num = total_count - offset - (board_news.index((new)))
-        # 게시글 정보 조회
-        write_model = dynamic_create_write_table(new.bo_table)
-        write = db.get(write_model, new.wr_id)
-        if write:
-            # 댓글/게시글 구분
-            if write.wr_is_comment:
-                new.subject = "[댓글] " + write.wr_content[:100]
-                new.link = f"/board/{new.bo_table}/{new.wr_parent}#c_{write.wr_id}"
-            else:
-                new.subject = write.wr_subject
-                new.link = f"/board/{new.bo_table}/{new.wr_id}"
-
-            # 작성자
-            new.name = cut_name(request, write.wr_name)
-            # 시간설정
-            new.datetime = format_datetime(write.wr_datetime)
+    # 게시판 정보 일괄 조회
+    # (게시판을 먼저 조회해두면 new.board 관계는 추가 쿼리 없이 세션에서 가져온다.)
+    load_by_keys(db, Board.bo_table, [new.bo_table for new in board_news])
+
+    # 결과 데이터 설정 (게시글 정보는 최신글 테이블에 함께 저장되어 있다.)
+    for index, new in enumerate(board_news):
+        new.num = total_count - offset - index
+        # 댓글/게시글 구분
+        if new.bn_is_comment:
+            new.subject = "[댓글] " + (new.bn_subject or "")
+            new.link = f"/board/{new.bo_table}/{new.wr_parent}#c_{new.wr_id}"
+        else:
+            new.subject = new.bn_subject or ""
+            new.link = f"/board/{new.bo_table}/{new.wr_id}"
+
+        # 작성자
+        new.name = cut_name(request, new.bn_name)
+        # 시간설정
+        new.datetime = format_datetime(new.bn_datetime)
 
     context = {
         "request": request,
@@ -80,59 +80,33 @@ async def board_new_list(
 async def new_delete(
     request: Request,
     db: db_session,
+    background_tasks: BackgroundTasks,
     bn_ids: list = Form(..., alias="chk_bn_id[]"),
 ):
     """
     게시글을 삭제한다.
     """
     # 새글 정보 조회
-    board_news = db.scalars(select(BoardNew).where(BoardNew.bn_id.in_(bn_ids))).all()
-    for new in board_news:
-        board = db.get(Board, new.bo_table)
-        write_model = dynamic_create_write_table(new.bo_table)
-        write = db.get(write_model, new.wr_id)
-
-        if write:
-            if write.wr_is_comment == 0:
-                # 게시글 삭제
-                # TODO: 게시글 삭제 공용함수 추가
-                db.delete(write)
-
-                # 원글 포인트 삭제
-                if not delete_point(request, write.mb_id, board.bo_table, write.wr_id, "쓰기"):
-                    insert_point(request, write.mb_id, board.bo_write_point * (-1), f"{board.bo_subject} {write.wr_id} 글 삭제")
-            else:
-                # 댓글 삭제
-                # TODO: 댓글 삭제 공용함수 추가
-                db.delete(write)
-
-                # 댓글 포인트 삭제
-                if not delete_point(request, write.mb_id, board.bo_table, write.wr_id, "댓글"):
-                    insert_point(request, write.mb_id, board.bo_comment_point * (-1), f"{board.bo_subject} {write.wr_parent}-{write.wr_id} 댓글 삭제")
-
-            # 파일 삭제
-            BoardFileManager(board, write.wr_id).delete_board_files()
-
-        # 새글 삭제
-        db.delete(new)
-
-        # 최신글 캐시 삭제
-        FileCache().delete_prefix(f'latest-{new.bo_table}')
-
+    board_news = db.execute(
+        select(BoardNew.bo_table, BoardNew.wr_id).where(BoardNew.bn_id.in_(bn_ids))
+    ).all()
+
+    # 게시글/댓글 및 관련 데이터 일괄 삭제
+    delete_manager = BoardDeleteManager(request, db)
+    delete_manager.delete((new.bo_table, new.wr_id) for new in board_news)
+    # 게시글이 없는 새글 정보 삭제
+    db.execute(delete(BoardNew).where(BoardNew.bn_id.in_(bn_ids)))
     db.commit()
+    # 첨부파일은 응답 이후 백그라운드에서 삭제
+    background_tasks.add_task(delete_manager.unlink_files)
+
+    # 최신글 캐시 삭제 (게시판별 1회)
+    file_cache = FileCache()
+    bo_tables = {new.bo_table for new in board_news}
+    for bo_table in bo_tables:
+        file_cache.delete_prefix(f'latest-{bo_table}')
+    purge_board_pages(*bo_tables)
 
     url = "/bbs/new"
     query_params = request.query_params
     return RedirectResponse(set_url_query_params(url, query_params), 303)
-
-
-def format_datetime(wr_datetime: datetime):
-    """
-    당일인 경우 시간표시
-    """
-    current_datetime = datetime.now()
-
-    if wr_datetime.date() == current_datetime.date():
-        return wr_datetime.strftime("%H:%M")
-    else:
-        return wr_datetime.strftime("%y-%m-%d")
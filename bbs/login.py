@@ -6,7 +6,7 @@ from core.exception import AlertException
 from core.template import UserTemplates
 from lib.common import *
 from lib.member_lib import is_super_admin
-from lib.pbkdf2 import validate_password
+from lib.pbkdf2 import create_hash_async, needs_upgrade, validate_password_async
 from lib.social import providers
 from lib.social.social import SocialProvider, oauth
 
@@ -46,13 +46,18 @@ async def login(
     member = db.scalar(select(Member).where(Member.mb_id == mb_id))
     if not member:
         raise AlertException(status_code=404, detail="회원정보가 존재하지 않습니다.")
-    elif not validate_password(password=mb_password, hash=member.mb_password):
+    elif not await validate_password_async(mb_password, member.mb_password):
         raise AlertException(status_code=404, detail="아이디 또는 패스워드가 일치하지 않습니다.")
     elif member.mb_leave_date or member.mb_intercept_date:
         raise AlertException("탈퇴 또는 차단된 회원입니다.", 404)
     elif config.cf_use_email_certify and member.mb_email_certify == datetime(1, 1, 1, 0, 0, 0):
         raise AlertException(f"{member.mb_email} 메일로 메일인증을 받으셔야 로그인 가능합니다.", 404)
 
+    # 비밀번호 해시가 현재 설정보다 약하면 다시 생성
+    if needs_upgrade(member.mb_password):
+        member.mb_password = await create_hash_async(mb_password)
+        db.commit()
+
     ss_mb_key = session_member_key(request, member)
     # 로그인 성공시 세션에 저장
     request.session["ss_mb_id"] = member.mb_id
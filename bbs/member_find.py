@@ -10,7 +10,7 @@ from core.exception import AlertException
 from core.template import UserTemplates
 from lib.common import *
 from lib.dependencies import validate_token, validate_captcha
-from lib.pbkdf2 import create_hash
+from lib.pbkdf2 import create_hash_async
 
 router = APIRouter()
 templates = UserTemplates()
@@ -203,7 +203,7 @@ async def reset_password(
         raise AlertException("비밀번호가 일치하지 않습니다.", 400)
 
     # 비밀번호 변경
-    member.mb_password = create_hash(mb_password)
+    member.mb_password = await create_hash_async(mb_password)
     db.commit()
 
     raise AlertException("비밀번호가 변경되었습니다.", 303, "/bbs/login")
@@ -7,7 +7,7 @@ from core.exception import AlertException
 from core.template import UserTemplates
 from lib.common import *
 from lib.dependencies import get_login_member, validate_token
-from lib.pbkdf2 import validate_password
+from lib.pbkdf2 import validate_password_async
 
 router = APIRouter()
 templates = UserTemplates()
@@ -42,7 +42,7 @@ async def member_leave(
         raise AlertException("회원만 접근하실 수 있습니다.", 403)
     if request.state.is_super_admin:
         raise AlertException("최고관리자는 탈퇴할 수 없습니다.", 400)
-    if not validate_password(mb_password, login_member.mb_password):
+    if not await validate_password_async(mb_password, login_member.mb_password):
         raise AlertException("패스워드가 일치하지 않습니다.", 404)
 
     # 회원탈퇴
@@ -16,7 +16,7 @@ from lib.dependencies import (
     get_login_member, validate_token, validate_captcha
 )
 from lib.member_lib import get_member_icon, get_member_image, validate_and_update_member_image
-from lib.pbkdf2 import validate_password, create_hash
+from lib.pbkdf2 import create_hash_async, validate_password_async
 from lib.template_filters import default_if_none
 
 router = APIRouter()
@@ -64,7 +64,7 @@ async def check_member(
     """
     회원프로필 수정 전 비밀번호 확인 처리
     """
-    if not validate_password(mb_password, member.mb_password):
+    if not await validate_password_async(mb_password, member.mb_password):
         raise AlertException("아이디 또는 패스워드가 일치하지 않습니다.", 404)
 
     request.session["ss_profile_change"] = True
@@ -147,7 +147,7 @@ async def member_profile_save(
 
     if mb_password and mb_password_re:
         # 비밀번호 변경 확인
-        if not validate_password(password=mb_password, hash=exists_member.mb_password):
+        if not await validate_password_async(mb_password, exists_member.mb_password):
             if mb_password != mb_password_re:
                 raise AlertException("비밀번호가 일치하지 않습니다.", 400)
             is_password_changed = True
@@ -196,7 +196,7 @@ async def member_profile_save(
     del member_form.mb_name
 
     if is_password_changed:
-        member_form.mb_password = create_hash(mb_password)
+        member_form.mb_password = await create_hash_async(mb_password)
 
     # 본인인증
     if mb_certify_case and member_form.mb_certify:
@@ -48,8 +48,11 @@ async def memo_list(
     offset = (current_page - 1) * records_per_page
     memos = db.scalars(query.add_columns(Memo).offset(offset).limit(records_per_page)).all()
 
+    # 상대 회원정보 일괄 조회
+    target_column = "me_send_mb_id" if kind == "recv" else "me_recv_mb_id"
+    members = load_by_keys(db, Member.mb_id, [getattr(memo, target_column) for memo in memos])
     for memo in memos:
-        memo.target_member = memo.send_member if kind == "recv" else memo.recv_member
+        memo.target_member = members.get(getattr(memo, target_column))
 
     context = {
         "request": request,
@@ -9,7 +9,8 @@ from core.models import Member
 from core.template import UserTemplates
 from lib.common import *
 from lib.dependencies import get_write, validate_token
-from lib.pbkdf2 import validate_password
+from lib.pbkdf2 import validate_password_async
+from lib.session_marks import MARK_SECRET, MARK_SECRET_COMMENT, add_mark
 from lib.template_filters import default_if_none
 from lib.token import create_session_token
 
@@ -62,16 +63,16 @@ async def password_check(
             write.wr_password = getattr(write_member, "mb_password", "")
 
     # 비밀번호 비교
-    if not validate_password(wr_password, write.wr_password):
+    if not await validate_password_async(wr_password, write.wr_password):
         raise AlertException(f"비밀번호가 일치하지 않습니다.", 403)
 
     # 비밀번호 검증 후 처리
     if action == "view":
-        request.session[f"ss_secret_{bo_table}_{wr_id}"] = True
+        add_mark(request.session, bo_table, MARK_SECRET, wr_id)
         redirect_url = f"/board/{bo_table}/{wr_id}?{request.query_params}"
 
     elif action == "comment-view":
-        request.session[f"ss_secret_comment_{bo_table}_{wr_id}"] = True
+        add_mark(request.session, bo_table, MARK_SECRET_COMMENT, wr_id)
         redirect_url = f"/board/{bo_table}/{write.wr_parent}?{request.query_params}#c_{wr_id}"
 
     elif action == "update":
@@ -11,6 +11,7 @@ from core.template import UserTemplates
 from lib.common import *
 from lib.dependencies import validate_token, validate_captcha
 from lib.member_lib import get_member_level
+from lib.poll_lib import add_poll_vote, has_voted, is_valid_poll_item
 from lib.point import insert_point
 
 router = APIRouter()
@@ -41,17 +42,17 @@ async def poll_update(
     if poll.po_level > 1 and member_level < poll.po_level:
         raise AlertCloseException(status_code=403, detail=f"권한 {poll.po_level} 이상의 회원만 투표하실 수 있습니다.")
     
-    if request.client.host in poll.po_ips or (member and member.mb_id in poll.mb_ids):
-        raise AlertException(status_code=403, detail=f"{poll.po_subject} 설문조사에 이미 참여하셨습니다.", url=f"/bbs/poll_result/{po_id}")
+    if not is_valid_poll_item(poll, gb_poll):
+        raise AlertException(status_code=400, detail="투표 항목을 선택해주세요.")
 
-    if member:
-        poll.mb_ids = ",".join([poll.mb_ids, member.mb_id]) if poll.mb_ids else member.mb_id
-    else:
-        poll.po_ips = ",".join([poll.po_ips, request.client.host]) if poll.po_ips else request.client.host
-    
-    # gb_poll로 전달받은 컬럼번호에 1 증가시킨다.
-    poll.__setattr__(f"po_cnt{gb_poll}", poll.__getattribute__(f"po_cnt{gb_poll}") + 1)
-    db.commit()
+    mb_id = member.mb_id if member else None
+    already_voted = f"{poll.po_subject} 설문조사에 이미 참여하셨습니다."
+    if has_voted(db, po_id, request.client.host, mb_id):
+        raise AlertException(status_code=403, detail=already_voted, url=f"/bbs/poll_result/{po_id}")
+
+    # 참여 기록 추가 및 gb_poll로 전달받은 항목의 투표수 1 증가
+    if not add_poll_vote(db, poll, gb_poll, request.client.host, mb_id):
+        raise AlertException(status_code=403, detail=already_voted, url=f"/bbs/poll_result/{po_id}")
 
     # 포인트 지급
     if member:
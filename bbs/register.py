@@ -15,7 +15,7 @@ from core.template import UserTemplates
 from lib.common import *
 from lib.member_lib import validate_and_update_member_image
 from lib.dependencies import get_member, validate_token, validate_captcha
-from lib.pbkdf2 import create_hash
+from lib.pbkdf2 import create_hash_async
 from lib.point import insert_point
 from lib.template_filters import default_if_none
 
@@ -188,7 +188,7 @@ async def post_register_form(
 
     new_member = Member(mb_id=mb_id, **member_form.__dict__)
     new_member.mb_datetime = datetime.now()
-    new_member.mb_password = create_hash(mb_password)
+    new_member.mb_password = await create_hash_async(mb_password)
     new_member.mb_level = config.cf_register_level
     new_member.mb_login_ip = request.client.host
     new_member.mb_lost_certify = ""
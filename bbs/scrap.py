@@ -6,7 +6,7 @@ from sqlalchemy import desc, exists, func, select, update
 
 from core.database import DBConnect, db_session
 from core.exception import AlertCloseException, AlertException
-from core.models import Scrap
+from core.models import Board, Scrap
 from core.template import UserTemplates
 from lib.board_lib import *
 from lib.common import *
@@ -169,13 +169,17 @@ async def scrap_list(
         query.offset(offset).limit(records_per_page)
     ).all()
     
-    for scrap in scraps:
+    # 게시판/게시글 정보 일괄 조회
+    boards = load_by_keys(db, Board.bo_table, [scrap.bo_table for scrap in scraps])
+    writes = load_writes(db, [(scrap.bo_table, scrap.wr_id) for scrap in scraps if scrap.bo_table in boards])
+
+    for index, scrap in enumerate(scraps):
         # 스크랩 정보
-        scrap.num = total_records - offset - (scraps.index(scrap))
-        scrap.bo_subject = scrap.board.bo_subject or "[게시판 없음]"
+        scrap.num = total_records - offset - index
+        board = boards.get(scrap.bo_table)
+        scrap.bo_subject = board.bo_subject if board and board.bo_subject else "[게시판 없음]"
         # 게시글 정보
-        write_model = dynamic_create_write_table(scrap.bo_table)
-        write = db.get(write_model, scrap.wr_id)
+        write = writes.get((scrap.bo_table, scrap.wr_id))
         scrap.subject = write.wr_subject or write.wr_content[:100] if write else "[글 없음]"
 
     context = {
@@ -14,7 +14,7 @@ from core.models import MemberSocialProfiles
 from core.template import UserTemplates
 from lib.common import *
 from lib.member_lib import check_exist_member_email
-from lib.pbkdf2 import create_hash
+from lib.pbkdf2 import create_hash_async
 from lib.point import insert_point
 from lib.social import providers
 from lib.social.social import (
@@ -285,7 +285,7 @@ async def post_social_register(
 
     member = Member()
     member.mb_id = gnu_social_id
-    member.mb_password = create_hash(str(request_time.microsecond) + uuid4().hex)
+    member.mb_password = await create_hash_async(str(request_time.microsecond) + uuid4().hex)
     member.mb_name = mb_nick
     member.mb_nick = mb_nick
     member.mb_email = member_form.mb_email
@@ -1,13 +1,16 @@
-from typing import AsyncGenerator
+import logging
+from typing import AsyncGenerator, List
 
 from dotenv import dotenv_values
 from fastapi import Depends
-from sqlalchemy import create_engine
+from sqlalchemy import Table, create_engine, inspect, text
 from sqlalchemy.engine import Engine, URL
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateColumn
 from typing_extensions import Annotated
 
 
@@ -174,6 +177,50 @@ db_connect.url = db_connect.url or "sqlite://"
 db_connect.create_engine()
 
 
+def upgrade_table_schema(engine: Engine, tables: List[Table]) -> List[str]:
+    """설치 이후 버전에서 기존 테이블에 추가된 컬럼과 인덱스를 생성
+    - create_all()은 이미 존재하는 테이블을 변경하지 않으므로 별도로 추가한다.
+    - 추가되는 컬럼은 NULL을 허용하거나 server_default가 있어야 한다.
+
+    Args:
+        engine (Engine): 데이터베이스 엔진
+        tables (List[Table]): 확인할 테이블 목록
+
+    Returns:
+        List[str]: 추가한 컬럼/인덱스 이름 목록
+    """
+    inspector = inspect(engine)
+    added = []
+    for table in tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        # 여러 워커가 동시에 시작하면 다른 워커에서 먼저 추가할 수 있으므로 실패는 기록만 한다.
+        column_names = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in column_names:
+                continue
+            column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+                added.append(f"{table.name}.{column.name}")
+            except SQLAlchemyError as e:
+                logging.warning(f"컬럼 추가 실패: {table.name}.{column.name} ({e})")
+
+        index_names = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in index_names:
+                continue
+            try:
+                index.create(bind=engine)
+                added.append(index.name)
+            except SQLAlchemyError as e:
+                logging.warning(f"인덱스 추가 실패: {index.name} ({e})")
+
+    return added
+
+
 # 데이터베이스 세션을 가져오는 의존성 함수
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     db = DBConnect().sessionLocal()
@@ -6,6 +6,7 @@ from fastapi.templating import Jinja2Templates
 from starlette.templating import _TemplateResponse
 
 from core.template import TemplateService, theme_asset
+from lib.static_assets import asset_url
 
 
 class AlertException(HTTPException):
@@ -75,6 +76,7 @@ def template_response(
     #   처음 설치 시에는 DB가 없으므로 새로운 템플릿 응답 객체를 생성합니다.
     template = Jinja2Templates(directory=TemplateService.get_templates_dir())
     template.env.globals["theme_asset"] = theme_asset
+    template.env.globals["asset_url"] = asset_url
     return template.TemplateResponse(
         name=template_html,
         context=context,
@@ -43,6 +43,7 @@ class ConfigForm:
     cf_point_term: Optional[int] = Form(default=0)
     cf_possible_ip: Optional[str] = Form(default="")
     cf_intercept_ip: Optional[str] = Form(default="")
+    cf_rate_limit: Optional[str] = Form(default="")
     cf_analytics: Optional[str] = Form(default="")
     cf_add_meta: Optional[str] = Form(default="")
     cf_delay_sec: Optional[int] = Form(default=0)
@@ -0,0 +1,104 @@
+"""라우터 지연 로딩
+
+- 공개 트래픽에서 사용하지 않는 무거운 라우터(관리자 등)를 워커 시작 시 import 하지 않는다.
+- 서버 시작 직후 백그라운드 스레드에서 미리 불러오며(워밍업),
+  그 전에 해당 경로로 요청이 들어오면 로딩이 끝날 때까지 기다린 후 처리한다.
+"""
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LazyRouter:
+    """지연 로딩 라우터 클래스
+
+    Args:
+        app (FastAPI): 라우터를 등록할 FastAPI 객체
+        module_path (str): 라우터가 정의된 모듈 경로 (ex: admin.admin)
+        prefix (str): 라우터 prefix
+        tags (list, optional): 라우터 태그
+        on_import (Callable, optional): 모듈 import 후 실행할 함수 (import 스레드에서 실행)
+    """
+    def __init__(self,
+                 app: FastAPI,
+                 module_path: str,
+                 prefix: str,
+                 tags: Optional[List[str]] = None,
+                 on_import: Optional[Callable] = None):
+        self.app = app
+        self.module_path = module_path
+        self.prefix = prefix
+        self.tags = tags
+        self.on_import = on_import
+        self.load_seconds: Optional[float] = None
+        self._module = None
+        self._included = False
+        self._import_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._included
+
+    def matches(self, path: str) -> bool:
+        return path == self.prefix or path.startswith(self.prefix + "/")
+
+    def import_module(self):
+        """모듈을 import 한다. (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+        with self._import_lock:
+            if self._module is None:
+                start_time = time.perf_counter()
+                module = importlib.import_module(self.module_path)
+                if self.on_import:
+                    self.on_import()
+                self._module = module
+                self.load_seconds = time.perf_counter() - start_time
+                logging.getLogger("uvicorn.error").info(
+                    f"lazy router load: {self.module_path}, {self.load_seconds:.3f}s")
+        return self._module
+
+    def include(self):
+        """import 된 라우터를 앱에 등록한다. (이벤트 루프에서 실행)"""
+        if self._included:
+            return
+        self.app.include_router(self._module.router, prefix=self.prefix, tags=self.tags)
+        self._included = True
+
+    async def load(self):
+        """라우터를 불러와 등록한다."""
+        if self._included:
+            return
+        await run_in_threadpool(self.import_module)
+        self.include()
+
+    def warmup(self, loop: asyncio.AbstractEventLoop):
+        """백그라운드 스레드에서 라우터를 미리 불러온다. (lifespan에서 호출)"""
+        def _run():
+            try:
+                self.import_module()
+                loop.call_soon_threadsafe(self.include)
+            except Exception as e:
+                logging.error(f"lazy router warmup error: {self.module_path} ({e})")
+
+        threading.Thread(target=_run, name=f"warmup-{self.module_path}", daemon=True).start()
+
+
+class LazyRouterMiddleware:
+    """지연 로딩 라우터 경로로 요청이 들어오면 라우터를 먼저 불러오는 미들웨어"""
+    def __init__(self, app: ASGIApp, lazy_routers: List[LazyRouter]):
+        self.app = app
+        self.lazy_routers = lazy_routers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] in ("http", "websocket"):
+            for lazy_router in self.lazy_routers:
+                if not lazy_router.is_loaded and lazy_router.matches(scope["path"]):
+                    await lazy_router.load()
+
+        await self.app(scope, receive, send)
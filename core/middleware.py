@@ -1,75 +1,89 @@
+"""요청 처리 미들웨어
+
+- 모든 미들웨어는 ASGI 미들웨어로 구현하여 BaseHTTPMiddleware 의 태스크/스트림 비용이 없다.
+- 요청 경로는 RequestPipelineMiddleware 에서 한 번만 분류하여 scope["route_class"]에 저장한다.
+    - static: 정적 파일 경로. 세션 등 이후 미들웨어를 실행하지 않고 바로 라우터(StaticFiles)로 전달한다.
+    - bypass: 토큰 생성, 접속기기 변경 등. 세션만 사용하고 core/main 미들웨어는 실행하지 않는다.
+    - app: 그 외 모든 요청
+- 단계별 처리 시간(ms)은 scope["server_timing"]에 기록하며,
+  SERVER_TIMING 이 true 이면 Server-Timing 응답 헤더로 내보낸다.
+- 쿠키를 설정하는 응답은 프록시에 캐시되지 않도록 Cache-Control 을 private 로 바꾼다.
+  (세션 쿠키는 페이지 캐시보다 바깥의 세션 미들웨어에서 추가되므로 가장 바깥에서 처리)
+"""
 import os
+import re
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from pydantic import TypeAdapter
+from starlette.datastructures import MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from user_agents import parse
 
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.middleware.sessions import SessionMiddleware
+from core.session import SESSION_BACKEND, ServerSessionMiddleware
+from core.template import TemplateService
+
+load_dotenv()
+
+SERVER_TIMING = TypeAdapter(bool).validate_python(os.getenv("SERVER_TIMING") or False)
 
-from core.plugin import (
-    register_plugin_admin_menu, get_plugin_state_change_time,
-    read_plugin_state, cache_plugin_state, cache_plugin_menu, register_plugin,
-    unregister_plugin, delete_router_by_tagname
+ROUTE_CLASS_STATIC = "static"
+ROUTE_CLASS_BYPASS = "bypass"
+ROUTE_CLASS_APP = "app"
+
+# 요청 경로 분류 테이블 (경로 접두사/접미사 정규식)
+ROUTE_CLASS_PATTERN = re.compile(
+    r"^(?:"
+    r"(?P<static>/(?:static|theme_static|assets|data)(?:/|$)|/plugin/[^/]+/static(?:/|$))"
+    r"|(?P<bypass>/generate_token|/device/change|.*(?:\.css|\.js|\.jpg|jpeg|\.png|\.gif|\.webp)$)"
+    r")"
 )
-from core.template import TemplateService
 
 
-def regist_core_middleware(app: FastAPI) -> None:
-    """애플리케이션에 아래 미들웨어를 추가합니다.
+def classify_route(path: str) -> str:
+    """요청 경로의 분류를 반환합니다. (static, bypass, app)"""
+    match = ROUTE_CLASS_PATTERN.match(path)
+    if not match:
+        return ROUTE_CLASS_APP
+    return ROUTE_CLASS_STATIC if match.group("static") else ROUTE_CLASS_BYPASS
 
-    미들웨어의 실행 순서는 코드의 역순으로 실행됩니다.
-    - main.py의 main_middleware()보다 먼저 실행됩니다.
-    """
 
-    # 기본으로 실행되는 core 미들웨어를 추가합니다.
-    @app.middleware("http")
-    async def core_middleware(request: Request, call_next):
-        if not await should_run_middleware(request):
-            return await call_next(request)
-
-        # 플러그인 설정
-        plugin_state_change_time = get_plugin_state_change_time()
-        if cache_plugin_state.__getitem__('change_time') != plugin_state_change_time:
-            # 플러그인 상태변경시 캐시를 업데이트.
-            # 업데이트 이후 관리자 메뉴, 라우터 재등록/삭제
-            new_plugin_state = read_plugin_state()
-            register_plugin(new_plugin_state)
-            unregister_plugin(new_plugin_state)
-            for plugin in new_plugin_state:
-                if not plugin.is_enable:
-                    delete_router_by_tagname(app, plugin.module_name)
-
-            cache_plugin_menu.__setitem__('admin_menus', register_plugin_admin_menu(new_plugin_state))
-            cache_plugin_state.__setitem__('change_time', plugin_state_change_time)
-            cache_plugin_state.__setitem__('info', new_plugin_state)
+def get_route_class(scope: Scope) -> str:
+    """요청의 경로 분류를 반환합니다. (RequestPipelineMiddleware 에서 분류한 값을 사용)"""
+    route_class = scope.get("route_class")
+    if route_class is None:
+        route_class = scope["route_class"] = classify_route(scope["path"])
+    return route_class
 
-        # 접속환경 설정
-        request.state.is_mobile = False
-        request.state.is_responsive = TemplateService.get_responsive()
 
-        # 반응형이라면 PC/모바일 버전 설정 세션을 초기화합니다.
-        if request.state.is_responsive:
-            request.session["is_mobile"] = False
-        else:
-            # 사용자가 설정한 PC/모바일 버전 설정 세션을 확인합니다.
-            if request.session.get("is_mobile"):
-                request.state.is_mobile = request.session.get("is_mobile", False)
-            else:
-                # User-Agent 헤더를 통해 모바일 여부를 판단합니다. (모바일과 태블릿 접속)
-                user_agent = parse(request.headers.get("User-Agent", ""))
-                if user_agent.is_mobile or user_agent.is_tablet:
-                    request.state.is_mobile = True
+def record_stage(scope: Scope, name: str, started_at: Optional[float]) -> float:
+    """단계별 처리 시간을 기록하고 현재 시각(perf_counter)을 반환합니다."""
+    now = time.perf_counter()
+    timings = scope.get("server_timing")
+    if timings is not None and started_at is not None:
+        timings[name] = (now - started_at) * 1000
+    return now
 
-        # 디바이스 기본값 설정
-        request.state.device = "mobile" if request.state.is_mobile else "pc"
 
-        # 미들웨어에서 라우터를 사용할 수 있도록 설정합니다.
-        request.scope["router"] = app.router
+def regist_core_middleware(app: FastAPI) -> None:
+    """애플리케이션에 아래 미들웨어를 추가합니다.
 
-        return await call_next(request)
+    미들웨어의 실행 순서는 코드의 역순으로 실행됩니다.
+    - main.py의 MainMiddleware보다 먼저 실행됩니다.
+    - RequestPipelineMiddleware가 가장 먼저 실행되며, 정적 파일 요청은 세션을 처리하지 않습니다.
+    """
+    # 기본으로 실행되는 core 미들웨어를 추가합니다.
+    app.add_middleware(CoreMiddleware, router=app.router)
 
     # 세션 미들웨어를 추가합니다.
-    # .env 파일의 설정을 통해 secret_key, session_cookie를 설정할 수 있습니다.
-    app.add_middleware(SessionMiddleware,
+    # .env 파일의 설정을 통해 secret_key, session_cookie, 저장소(SESSION_BACKEND)를 설정할 수 있습니다.
+    session_middleware = SessionMiddleware if SESSION_BACKEND == "cookie" else ServerSessionMiddleware
+    app.add_middleware(session_middleware,
                        secret_key=os.getenv("SESSION_SECRET_KEY", ''),
                        session_cookie=os.getenv("SESSION_COOKIE_NAME", "session"),
                        max_age=60 * 60 * 3)
@@ -77,6 +91,9 @@ def regist_core_middleware(app: FastAPI) -> None:
     # 클라이언트가 사용할 프로토콜을 결정하는 미들웨어를 추가합니다.
     app.add_middleware(BaseSchemeMiddleware)
 
+    # 요청 경로 분류, 정적 파일 응답, 단계별 처리 시간 기록
+    app.add_middleware(RequestPipelineMiddleware, router=app.router)
+
 
 async def should_run_middleware(request: Request) -> bool:
     """미들웨어의 실행 여부를 결정합니다.
@@ -91,20 +108,126 @@ async def should_run_middleware(request: Request) -> bool:
     Returns:
         bool: 미들웨어를 실행할지 여부
     """
-    path = request.url.path
-    if (path.startswith('/generate_token')
-            or path.startswith('/device/change')
-            or path.startswith('/static')
-            or path.startswith('/theme_static')
-            or path.startswith('/data')
-            or path.endswith(('.css', '.js', '.jpg', 'jpeg', '.png', '.gif', '.webp'))):
-        return False
-
-    return True
-
-
-class BaseSchemeMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # X-Forwarded-Proto 헤더를 통해 클라이언트가 사용하는 실제 프로토콜을 결정합니다.
-        request.scope["scheme"] = request.headers.get("X-Forwarded-Proto", "http")
-        return await call_next(request)
+    return get_route_class(request.scope) == ROUTE_CLASS_APP
+
+
+class RequestPipelineMiddleware:
+    """요청 처리의 가장 바깥쪽 미들웨어
+    - 요청 경로를 분류하고, 정적 파일 요청은 세션 등 이후 미들웨어 없이 라우터로 바로 전달한다.
+    - SERVER_TIMING 이 true 이면 단계별 처리 시간을 Server-Timing 헤더로 응답한다.
+    """
+    def __init__(self, app: ASGIApp, router: ASGIApp):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started_at = time.perf_counter()
+        scope["server_timing"] = {}
+        scope["server_timing_started_at"] = started_at
+        route_class = scope["route_class"] = classify_route(scope["path"])
+        if SERVER_TIMING:
+            send = self._send_with_timing(scope, send, started_at)
+
+        if route_class == ROUTE_CLASS_STATIC:
+            return await self._send_static(scope, receive, send)
+        await self.app(scope, receive, self._send_private_with_cookies(send))
+
+    async def _send_static(self, scope: Scope, receive: Receive, send: Send):
+        """정적 파일을 응답합니다. (예외 처리 핸들러 대신 간단한 텍스트로 오류를 응답)"""
+        try:
+            await self.router(scope, receive, send)
+        except HTTPException as e:
+            response = PlainTextResponse(str(e.detail), status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+
+    def _send_private_with_cookies(self, send: Send) -> Send:
+        """쿠키(세션 아이디 등)를 설정하는 응답이 공유 캐시(프록시)에 저장되어
+        다른 사용자에게 전달되지 않도록 공유 캐시 헤더를 제거합니다."""
+        async def wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                headers = MutableHeaders(scope=message)
+                cache_control = headers.get("cache-control", "")
+                if "set-cookie" in headers and ("public" in cache_control or "s-maxage" in cache_control):
+                    headers["Cache-Control"] = "private, no-cache"
+                    del headers["Surrogate-Key"]
+            await send(message)
+        return wrapper
+
+    def _send_with_timing(self, scope: Scope, send: Send, started_at: float) -> Send:
+        async def wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                record_stage(scope, "total", started_at)
+                server_timing = ", ".join(
+                    f"{name};dur={duration:.1f}" for name, duration in scope["server_timing"].items()
+                )
+                message.setdefault("headers", [])
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing)
+            await send(message)
+        return wrapper
+
+
+class BaseSchemeMiddleware:
+    """클라이언트가 사용하는 실제 프로토콜을 설정하는 미들웨어"""
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            # X-Forwarded-Proto 헤더를 통해 클라이언트가 사용하는 실제 프로토콜을 결정합니다.
+            forwarded_proto = next(
+                (value for name, value in scope["headers"] if name == b"x-forwarded-proto"), b"http"
+            )
+            scope["scheme"] = forwarded_proto.decode("latin-1")
+        await self.app(scope, receive, send)
+
+
+class CoreMiddleware:
+    """기본으로 실행되는 core 미들웨어 (접속환경 설정)
+    - 세션을 사용하므로 SessionMiddleware 안쪽에 등록해야 한다.
+    """
+    def __init__(self, app: ASGIApp, router: ASGIApp):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or get_route_class(scope) != ROUTE_CLASS_APP:
+            return await self.app(scope, receive, send)
+
+        # 세션 복원까지의 처리 시간
+        started_at = record_stage(scope, "session", scope.get("server_timing_started_at"))
+
+        # 플러그인 상태 변경은 core.plugin.PluginStateWatcher가 요청과 별도로 적용합니다.
+        request = Request(scope)
+
+        # 접속환경 설정
+        request.state.is_mobile = False
+        request.state.is_responsive = TemplateService.get_responsive()
+
+        # 반응형이라면 PC/모바일 버전 설정 세션을 초기화합니다.
+        # (값이 바뀔 때만 변경하여 세션이 불필요하게 저장되지 않도록 함)
+        if request.state.is_responsive:
+            if request.session.get("is_mobile"):
+                request.session["is_mobile"] = False
+        else:
+            # 사용자가 설정한 PC/모바일 버전 설정 세션을 확인합니다.
+            if request.session.get("is_mobile"):
+                request.state.is_mobile = request.session.get("is_mobile", False)
+            else:
+                # User-Agent 헤더를 통해 모바일 여부를 판단합니다. (모바일과 태블릿 접속)
+                user_agent = parse(request.headers.get("User-Agent", ""))
+                if user_agent.is_mobile or user_agent.is_tablet:
+                    request.state.is_mobile = True
+
+        # 디바이스 기본값 설정
+        request.state.device = "mobile" if request.state.is_mobile else "pc"
+
+        # 미들웨어에서 라우터를 사용할 수 있도록 설정합니다.
+        scope["router"] = self.router
+
+        record_stage(scope, "core", started_at)
+        await self.app(scope, receive, send)
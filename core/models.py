@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, Index, text, DateTime, Date, Time, Boolean, BIGINT, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, Index, text, DateTime, Date, Time, Boolean, BIGINT, Double, UniqueConstraint
 from typing import List
 
 # TINYINT 대신 Integer 사용하기 바랍니다.
@@ -50,6 +50,7 @@ class Config(Base):
     cf_filter = Column(Text, nullable=False, default="")
     cf_possible_ip = Column(Text, nullable=False, default="")
     cf_intercept_ip = Column(Text, nullable=False, default="")
+    cf_rate_limit = Column(Text, nullable=True)
     cf_analytics = Column(Text, nullable=False, default="")
     cf_add_meta = Column(Text, nullable=False, default="")
     cf_member_skin = Column(String(50), nullable=False, default="")
@@ -553,6 +554,8 @@ class Visit(Base):
     vi_os = Column(String(255), nullable=False, default="")
     vi_device = Column(String(255), nullable=False, default="")
 
+    vi_date_index = Index("visit_vi_date", vi_date)
+
 
 class VisitSum(Base):
     __tablename__ = DB_TABLE_PREFIX + "visit_sum"
@@ -778,6 +781,25 @@ class PollEtc(Base):
 
     poll: Mapped["Poll"] = relationship("Poll", back_populates="etcs")
 
+
+class PollVote(Base):
+    """설문조사 참여 기록 테이블
+    - 회원은 mb_id, 비회원은 pv_ip로 참여 여부를 확인한다. (회원 참여는 pv_ip가 빈 문자열)
+    - 이전 버전의 Poll.po_ips, Poll.mb_ids 문자열은 서버 시작 시 이 테이블로 옮겨진다.
+    """
+    __tablename__ = DB_TABLE_PREFIX + "poll_vote"
+    __table_args__ = (UniqueConstraint("po_id", "mb_id", "pv_ip", name="poll_vote_voter"), )
+
+    pv_id = Column(Integer, primary_key=True, autoincrement=True)
+    po_id = Column(Integer, nullable=False, default=0)
+    mb_id = Column(String(20), nullable=False, default="")
+    pv_ip = Column(String(100), nullable=False, default="")
+    pv_item = Column(Integer, nullable=False, default=0)
+    pv_datetime = Column(DateTime, nullable=False, default=datetime.now)
+
+    ip_index = Index("poll_vote_po_id_ip", po_id, pv_ip)
+
+
 class AutoSave(Base):
     __tablename__ = DB_TABLE_PREFIX + "autosave"
 
@@ -829,6 +851,8 @@ class Mail(Base):
 class BoardNew(Base):
     """
     최신 게시물 테이블
+    - 최신글 목록/위젯에서 게시판 테이블을 조회하지 않도록 제목, 작성자 등을 함께 저장한다.
+    - bn_subject가 NULL이면 아직 게시글 정보가 채워지지 않은 행이다.
     """
     __tablename__ = DB_TABLE_PREFIX + 'board_new'
     
@@ -836,11 +860,18 @@ class BoardNew(Base):
     bo_table = Column(String(20), ForeignKey(DB_TABLE_PREFIX + "board.bo_table"), nullable=False, default='')
     wr_id = Column(Integer, nullable=False, default=0)
     wr_parent = Column(Integer, nullable=False, default=0)
-    bn_datetime = Column(DateTime, nullable=False, default=datetime.now())
+    bn_datetime = Column(DateTime, nullable=False, default=datetime.now)
     mb_id = Column(String(20), nullable=False, default='')
+    bn_subject = Column(String(255), nullable=True)
+    bn_name = Column(String(255), nullable=False, default='', server_default='')
+    bn_is_comment = Column(Integer, nullable=False, default=0, server_default='0')
+    bn_is_secret = Column(Integer, nullable=False, default=0, server_default='0')
+    bn_thumbnail = Column(String(255), nullable=False, default='', server_default='')
 
     board: Mapped["Board"] = relationship("Board", back_populates="board_news")
 
+    is_comment_index = Index("board_new_is_comment_id", bn_is_comment, bn_id)
+
 
 class Scrap(Base):
     """
@@ -923,4 +954,105 @@ class Login(Base):
     mb_id = Column(String(20), nullable=False, default='')
     lo_datetime = Column(DateTime, nullable=False, default=datetime(1, 1, 1, 0, 0, 0))
     lo_location = Column(Text, nullable=False)
-    lo_url = Column(Text, nullable=False)
\ No newline at end of file
+    lo_url = Column(Text, nullable=False)
+
+
+class WriteNum(Base):
+    """게시판별 게시글 번호(wr_num) 할당 테이블
+    - wn_num: 마지막으로 할당된 wr_num (게시글 번호는 음수로 감소)
+    """
+    __tablename__ = DB_TABLE_PREFIX + "write_num"
+
+    bo_table = Column(String(20), primary_key=True)
+    wn_num = Column(Integer, nullable=False, default=0)
+
+
+class MailQueue(Base):
+    """메일 발송 대기열 테이블
+    - mq_status: ready(대기), sending(발송중), sent(발송완료), failed(발송실패)
+    - mq_next_datetime: 대기 상태는 다음 발송 시도 시간, 발송중 상태는 점유 만료 시간
+    """
+    __tablename__ = DB_TABLE_PREFIX + "mail_queue"
+
+    mq_id = Column(Integer, primary_key=True, autoincrement=True)
+    ma_id = Column(Integer, nullable=False, default=0)
+    mq_from_email = Column(String(255), nullable=False, default="")
+    mq_from_name = Column(String(255), nullable=False, default="")
+    mq_to_email = Column(String(255), nullable=False, default="")
+    mq_to_name = Column(String(255), nullable=False, default="")
+    mq_subject = Column(String(255), nullable=False, default="")
+    mq_body = Column(Text, nullable=False)
+    mq_status = Column(String(10), nullable=False, default="ready")
+    mq_try = Column(Integer, nullable=False, default=0)
+    mq_error = Column(String(255), nullable=False, default="")
+    mq_token = Column(String(32), nullable=False, default="")
+    mq_datetime = Column(DateTime, nullable=False, default=datetime.now)
+    mq_next_datetime = Column(DateTime, nullable=False, default=datetime.now)
+    mq_sent_datetime = Column(DateTime, nullable=True)
+
+    status_index = Index("mq_status_next", mq_status, mq_next_datetime)
+    ma_id_index = Index("mq_ma_id_status", ma_id, mq_status)
+
+
+class VisitRollup(Base):
+    """접속자 일별 집계 테이블
+    - vr_type: total(전체), browser(브라우저), os(운영체제), device(접속기기), domain(접속경로)
+    - 집계가 완료된 날짜에는 항상 total 행이 존재한다.
+    """
+    __tablename__ = DB_TABLE_PREFIX + "visit_rollup"
+
+    vr_id = Column(Integer, primary_key=True, autoincrement=True)
+    vr_date = Column(Date, nullable=False)
+    vr_type = Column(String(10), nullable=False)
+    vr_key = Column(String(255), nullable=False, default="")
+    vr_count = Column(Integer, nullable=False, default=0)
+
+    date_type_index = Index("visit_rollup_date_type", vr_date, vr_type)
+
+
+class BoardActivityRollup(Base):
+    """게시판 시간별 글/댓글 작성수 집계 테이블
+    - 글/댓글 작성, 삭제, 이동/복사 시 증감되며, 게시판 테이블에서 다시 생성할 수 있다.
+    - ba_datetime: 작성시간을 시간 단위로 절삭한 값
+    """
+    __tablename__ = DB_TABLE_PREFIX + "board_activity_rollup"
+    __table_args__ = (UniqueConstraint("bo_table", "ba_datetime", name="board_activity_rollup_key"), )
+
+    ba_id = Column(Integer, primary_key=True, autoincrement=True)
+    bo_table = Column(String(20), nullable=False, default="")
+    ba_datetime = Column(DateTime, nullable=False)
+    ba_write_count = Column(Integer, nullable=False, default=0)
+    ba_comment_count = Column(Integer, nullable=False, default=0)
+
+    datetime_index = Index("board_activity_rollup_datetime", ba_datetime)
+
+
+class RateLimitBucket(Base):
+    """요청 제한 토큰 버킷 테이블 (RATE_LIMIT_BACKEND=database)
+    - rl_key: {규칙 이름}:{mb:회원아이디 또는 ip:IP}
+    - rl_updated: 마지막 갱신 시각 (Unix timestamp)
+    """
+    __tablename__ = DB_TABLE_PREFIX + "rate_limit_bucket"
+
+    rl_key = Column(String(255), primary_key=True)
+    rl_tokens = Column(Double, nullable=False, default=0)
+    rl_updated = Column(Double, nullable=False, default=0)
+
+    updated_index = Index("rate_limit_bucket_updated", rl_updated)
+
+
+class UserSession(Base):
+    """서버 세션 테이블 (SESSION_BACKEND=database)
+    - ss_id: 세션 아이디 (쿠키에는 {ss_id}.{ss_version} 형식으로 저장)
+    - ss_version: 세션 데이터가 변경될 때마다 바뀌는 값 (워커별 메모리 캐시 검증용)
+    - ss_data: 세션 데이터 (JSON)
+    - ss_expires: 만료 시각 (Unix timestamp)
+    """
+    __tablename__ = DB_TABLE_PREFIX + "session"
+
+    ss_id = Column(String(64), primary_key=True)
+    ss_version = Column(String(16), nullable=False, default="")
+    ss_data = Column(Text, nullable=False, default="")
+    ss_expires = Column(Double, nullable=False, default=0)
+
+    expires_index = Index("session_expires", ss_expires)
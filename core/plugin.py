@@ -1,8 +1,11 @@
+import asyncio
 import re
 import importlib
 import logging
 import json
 import os
+import threading
+import time
 from dataclasses import dataclass, field, asdict
 
 import cachetools
@@ -13,6 +16,7 @@ from typing import List
 PLUGIN_DIR = 'plugin'
 PLUGIN_STATE_FILE = 'plugin_states.json'
 PLUGIN_STATE_FILE_PATH = f'{PLUGIN_DIR}/{PLUGIN_STATE_FILE}'
+PLUGIN_WATCH_INTERVAL = 1.0  # 플러그인 상태 파일 확인 주기(초)
 
 # 전역 캐시
 # 플러그인 관리자 메뉴를 저장하는 캐시
@@ -350,3 +354,97 @@ def register_statics(app, plugin_info: List[PluginState], plugin_dir=PLUGIN_DIR)
             )
         except Exception as e:
             logging.warning(f"register_statics: {e}")
+
+
+def apply_plugin_state(app, plugin_states: List[PluginState], change_time: float):
+    """변경된 플러그인 상태를 적용한다.
+    - 활성화된 플러그인의 라우터를 등록하고, 비활성화된 플러그인의 라우터를 삭제한다.
+    - 관리자 메뉴와 플러그인 상태 캐시를 갱신한다.
+    Args:
+        app (FastAPI): FastAPI 객체
+        plugin_states (list): 플러그인 상태 목록
+        change_time (float): 플러그인 상태 변경 시간
+    """
+    start_time = time.perf_counter()
+    register_plugin(plugin_states)
+    unregister_plugin(plugin_states)
+    for plugin in plugin_states:
+        if not plugin.is_enable:
+            delete_router_by_tagname(app, plugin.module_name)
+
+    cache_plugin_menu.__setitem__('admin_menus', register_plugin_admin_menu(plugin_states))
+    cache_plugin_state.__setitem__('change_time', change_time)
+    cache_plugin_state.__setitem__('info', plugin_states)
+    logging.info(f"apply_plugin_state: {time.perf_counter() - start_time:.3f}s")
+
+
+class PluginStateWatcher:
+    """플러그인 상태 파일(plugin_states.json) 감시 클래스
+    - 백그라운드 스레드에서 상태 파일의 변경시간을 주기적으로 확인한다.
+    - 변경되면 플러그인 모듈을 미리 import 한 후, 이벤트 루프에서 라우터/메뉴를 한 번에 적용한다.
+      (요청 처리 중에 라우터 목록이 일부만 변경된 상태로 노출되지 않는다.)
+    - 워커(프로세스)마다 실행되며, 모든 워커가 같은 상태 파일을 기준으로 동기화된다.
+    """
+    def __init__(self, interval: float = PLUGIN_WATCH_INTERVAL):
+        self.interval = interval
+        self._app = None
+        self._loop = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self, app):
+        """감시를 시작한다. 이벤트 루프(lifespan) 안에서 호출해야 한다."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._app = app
+        self._loop = asyncio.get_running_loop()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="plugin-state-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """감시를 종료한다."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"plugin state watcher error: {e}")
+
+    def check(self) -> bool:
+        """상태 파일이 변경되었으면 적용하고 True를 반환한다."""
+        change_time = get_plugin_state_change_time()
+        if cache_plugin_state.get('change_time') == change_time:
+            return False
+
+        plugin_states = read_plugin_state()
+        try:
+            # 시간이 오래 걸리는 모듈 import는 이벤트 루프 밖에서 먼저 수행한다.
+            import_plugin_by_states(plugin_states)
+        except Exception as e:
+            # 같은 변경에 대해 반복 실행하지 않도록 변경시간은 갱신한다.
+            cache_plugin_state.__setitem__('change_time', change_time)
+            logging.error(f"import_plugin_by_states error: {e}")
+            return False
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._apply(plugin_states, change_time), self._loop)
+        future.result()
+        return True
+
+    async def _apply(self, plugin_states: List[PluginState], change_time: float):
+        try:
+            apply_plugin_state(self._app, plugin_states, change_time)
+        except Exception as e:
+            # 같은 변경에 대해 반복 실행하지 않도록 변경시간은 갱신한다.
+            cache_plugin_state.__setitem__('change_time', change_time)
+            logging.error(f"apply_plugin_state error: {e}")
+
+
+plugin_state_watcher = PluginStateWatcher()
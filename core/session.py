@@ -0,0 +1,252 @@
+"""서버 세션
+
+- 쿠키에는 세션 아이디와 버전({세션 아이디}.{버전})만 저장하고, 세션 데이터는 서버에 저장한다.
+- 저장소는 .env 의 SESSION_BACKEND 로 선택한다.
+    - database: 데이터베이스 테이블(UserSession) + 워커별 메모리 LRU 캐시. 여러 워커/서버가 세션을 공유
+    - memory: 워커(프로세스)별 메모리. 단일 워커에서 사용
+    - cookie: 이전 방식(Starlette SessionMiddleware, 서명된 쿠키에 세션 데이터 저장)
+- 세션 데이터가 변경되면 버전을 바꿔 쿠키를 다시 설정하므로,
+  메모리 캐시의 버전이 쿠키와 같으면 다른 워커에서 변경되지 않은 것으로 보고 DB를 조회하지 않는다.
+- 이전 방식의 세션 쿠키는 첫 요청에서 서버 세션으로 옮긴다.
+- 로그인/로그아웃으로 회원 정보가 바뀌면 세션 아이디를 새로 발급한다. (세션 고정 공격 방지)
+- 기본값만 있는 세션(접속기기 설정 등)은 저장하지 않는다.
+"""
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from base64 import b64decode
+from typing import Optional, Tuple
+
+from cachetools import LRUCache
+from dotenv import load_dotenv
+from itsdangerous import BadSignature, TimestampSigner
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.database import DBConnect
+from core.models import UserSession
+
+load_dotenv()
+
+SESSION_BACKEND = (os.getenv("SESSION_BACKEND") or "database").lower()
+# 워커별 메모리에 보관하는 최대 세션 수 (초과하면 오래 사용하지 않은 세션부터 제외)
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE") or 10000)
+
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{43}$")
+# 기본값과 같은 항목만 있는 세션은 저장하지 않는다.
+SESSION_DEFAULTS = {"is_mobile": False}
+# 값이 바뀌면 세션 아이디를 새로 발급하는 항목 (로그인, 로그아웃)
+SESSION_AUTH_KEYS = ("ss_mb_id", "ss_mb_key")
+
+# (버전, 세션 데이터(JSON), 만료 시각)
+SessionRecord = Tuple[str, str, float]
+
+
+class MemorySessionStore():
+    """워커 메모리 세션 저장소"""
+    blocking = False
+
+    def __init__(self, maxsize: int = SESSION_CACHE_SIZE):
+        self._sessions: LRUCache = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get_cached(self, session_id: str, version: str) -> Optional[SessionRecord]:
+        """메모리에 보관된 세션을 반환합니다. (버전이 다르거나 만료된 세션은 None)"""
+        with self._lock:
+            record = self._sessions.get(session_id)
+        if not record or record[0] != version or record[2] < time.time():
+            return None
+        return record
+
+    def load(self, session_id: str) -> Optional[SessionRecord]:
+        with self._lock:
+            record = self._sessions.get(session_id)
+        if not record or record[2] < time.time():
+            return None
+        return record
+
+    def save(self, session_id: str, record: SessionRecord) -> None:
+        with self._lock:
+            self._sessions[session_id] = record
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class DatabaseSessionStore(MemorySessionStore):
+    """데이터베이스 세션 저장소 (워커 메모리 LRU 캐시 사용)"""
+    blocking = True
+
+    def load(self, session_id: str) -> Optional[SessionRecord]:
+        with DBConnect().sessionLocal() as db:
+            row = db.execute(
+                select(UserSession.ss_version, UserSession.ss_data, UserSession.ss_expires)
+                .where(UserSession.ss_id == session_id, UserSession.ss_expires >= time.time())
+            ).first()
+        if not row:
+            return None
+        record = (row.ss_version, row.ss_data, row.ss_expires)
+        super().save(session_id, record)
+        return record
+
+    def save(self, session_id: str, record: SessionRecord) -> None:
+        version, data, expires = record
+        values = {"ss_version": version, "ss_data": data, "ss_expires": expires}
+        with DBConnect().sessionLocal() as db:
+            result = db.execute(update(UserSession).where(UserSession.ss_id == session_id).values(values))
+            if not result.rowcount:
+                try:
+                    db.execute(insert(UserSession).values(ss_id=session_id, **values))
+                except IntegrityError:
+                    # 다른 요청에서 먼저 추가한 경우
+                    db.rollback()
+                    db.execute(update(UserSession).where(UserSession.ss_id == session_id).values(values))
+            db.commit()
+        super().save(session_id, record)
+
+    def delete(self, session_id: str) -> None:
+        with DBConnect().sessionLocal() as db:
+            db.execute(delete(UserSession).where(UserSession.ss_id == session_id))
+            db.commit()
+        super().delete(session_id)
+
+
+def delete_expired_sessions() -> None:
+    """만료된 서버 세션을 삭제합니다. (스케줄러 작업)"""
+    if SESSION_BACKEND != "database":
+        return
+    with DBConnect().sessionLocal() as db:
+        db.execute(delete(UserSession).where(UserSession.ss_expires < time.time()))
+        db.commit()
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> MemorySessionStore:
+    """SESSION_BACKEND 설정에 해당하는 세션 저장소를 생성합니다."""
+    if backend == "database":
+        return DatabaseSessionStore()
+    return MemorySessionStore()
+
+
+def _is_default_session(session: dict) -> bool:
+    """세션에 기본값과 같은 항목만 있는지 확인합니다."""
+    return all(name in SESSION_DEFAULTS and SESSION_DEFAULTS[name] == value for name, value in session.items())
+
+
+def _get_auth(session: dict) -> tuple:
+    return tuple(session.get(name) for name in SESSION_AUTH_KEYS)
+
+
+class ServerSessionMiddleware:
+    """서버 세션 미들웨어 (SessionMiddleware 와 같이 scope["session"]에 세션 데이터를 설정)
+    - 세션 데이터가 변경되었거나 만료 시각이 절반 이상 지났을 때만 저장하고 쿠키를 다시 설정한다.
+    - 쿠키의 버전이 메모리의 세션과 다르면 저장소에서 다시 읽는다.
+      (동시에 보낸 요청이 이전 버전의 쿠키를 가지고 있어도 같은 세션을 사용)
+    - 저장소 오류 시에는 빈 세션으로 처리하여 설치 전에도 요청을 처리할 수 있도록 한다.
+    """
+    def __init__(self,
+                 app: ASGIApp,
+                 secret_key: str,
+                 session_cookie: str = "session",
+                 max_age: int = 60 * 60 * 3,
+                 store: Optional[MemorySessionStore] = None):
+        self.app = app
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.store = store or create_session_store()
+        # 이전 방식(SessionMiddleware)의 쿠키를 읽기 위한 서명
+        self.legacy_signer = TimestampSigner(str(secret_key))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        cookie = HTTPConnection(scope).cookies.get(self.session_cookie)
+        session_id, version, data, expires = None, "", None, 0.0
+        if cookie:
+            cookie_session_id, _, cookie_version = cookie.partition(".")
+            if SESSION_ID_PATTERN.match(cookie_session_id):
+                record = await self._load(cookie_session_id, cookie_version)
+                if record:
+                    session_id = cookie_session_id
+                    version, data, expires = record
+            else:
+                data = self._load_legacy(cookie)
+
+        scope["session"] = json.loads(data) if session_id else (data or {})
+        initial_data = data if session_id else None
+        initial_auth = _get_auth(scope["session"])
+
+        async def send_wrapper(message: Message):
+            nonlocal session_id
+            if message["type"] == "http.response.start":
+                session = scope["session"]
+                header_value = None
+                if not _is_default_session(session):
+                    current_data = json.dumps(session, ensure_ascii=False, separators=(",", ":"))
+                    now = time.time()
+                    is_changed = current_data != initial_data
+                    if session_id and _get_auth(session) != initial_auth:
+                        # 로그인 전에 발급된 세션 아이디를 계속 사용하지 않도록 새로 발급
+                        await self._delete(session_id)
+                        session_id = None
+                    if is_changed or expires - now < self.max_age / 2:
+                        session_id = session_id or secrets.token_urlsafe(32)
+                        new_version = secrets.token_hex(4) if is_changed else version
+                        if await self._save(session_id, (new_version, current_data, now + self.max_age)):
+                            header_value = (f"{self.session_cookie}={session_id}.{new_version}; path=/; "
+                                            f"Max-Age={self.max_age}; httponly; samesite=lax")
+                elif session_id:
+                    # 세션이 비워진 경우 (로그아웃 등)
+                    await self._delete(session_id)
+                    header_value = (f"{self.session_cookie}=null; path=/; "
+                                    f"expires=Thu, 01 Jan 1970 00:00:00 GMT; httponly; samesite=lax")
+                if header_value:
+                    message.setdefault("headers", [])
+                    MutableHeaders(scope=message).append("Set-Cookie", header_value)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _load_legacy(self, cookie: str) -> Optional[dict]:
+        """이전 방식의 서명된 세션 쿠키를 읽습니다."""
+        try:
+            data = self.legacy_signer.unsign(cookie.encode("utf-8"), max_age=self.max_age)
+            return json.loads(b64decode(data))
+        except (BadSignature, ValueError):
+            return None
+
+    async def _run(self, func, *args):
+        try:
+            if self.store.blocking:
+                return await run_in_threadpool(func, *args)
+            return func(*args)
+        except SQLAlchemyError as e:
+            # 설치 전에는 세션 테이블이 없다.
+            logging.getLogger("uvicorn.error").debug(f"session store error: {e}")
+            return None
+
+    async def _load(self, session_id: str, version: str) -> Optional[SessionRecord]:
+        # 메모리의 세션 버전이 쿠키와 같으면 저장소를 조회하지 않는다.
+        record = self.store.get_cached(session_id, version)
+        if record:
+            return record
+        return await self._run(self.store.load, session_id)
+
+    async def _save(self, session_id: str, record: SessionRecord) -> bool:
+        return await self._run(self._save_record, session_id, record) is not None
+
+    def _save_record(self, session_id: str, record: SessionRecord) -> bool:
+        self.store.save(session_id, record)
+        return True
+
+    async def _delete(self, session_id: str) -> None:
+        await self._run(self.store.delete, session_id)
@@ -1,8 +1,12 @@
+import threading
 import typing
 
 from fastapi import FastAPI, Request
 from fastapi.templating import Jinja2Templates
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import (
+    Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateError
+)
+from jinja2.bccache import Bucket
 from pydantic import TypeAdapter
 from starlette.background import BackgroundTask
 from starlette.staticfiles import StaticFiles
@@ -13,6 +17,7 @@ from core.plugin import (
 )
 from lib.common import *
 from lib.member_lib import get_member_icon, get_member_image
+from lib.static_assets import asset_url
 from lib.template_filters import (
     datetime_format, number_format, set_query_params
 )
@@ -85,12 +90,30 @@ TEMPLATES = "templates"
 ADMIN_TEMPLATES = "admin/templates"
 ADMIN_TEMPLATES_DIR = get_admin_theme_path()  # 관리자 템플릿 경로
 
+TEMPLATE_BYTECODE_CACHE_DIR = "data/cache/jinja"  # 컴파일된 템플릿 저장 경로
+TEMPLATE_CACHE_SIZE = 1000  # 환경별 메모리에 유지할 템플릿 수
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """템플릿 바이트코드 캐시
+    - 관리자 > 캐시파일 일괄삭제로 디렉토리가 삭제되면 다시 생성한다.
+    - 저장에 실패하면 캐시하지 않은 것으로 보고 렌더링은 계속한다.
+    """
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
 class TemplateService():
     """템플릿 서비스 클래스
     - TODO: 반응형/적응형 변수 외의 다른 부분도 클래스화 해야한다.
     """
     _is_responsive: bool = None  # 반응형 템플릿 여부
     _templates_dir: str = None  # 사용자 템플릿 경로
+    _auto_reload: bool = None  # 템플릿 변경 감지 여부
+    _bytecode_cache: TemplateBytecodeCache = None  # 템플릿 바이트코드 캐시
 
     @classmethod
     def get_responsive(cls) -> bool:
@@ -118,6 +141,72 @@ class TemplateService():
     def set_templates_dir(cls) -> None:
         cls._templates_dir = get_theme_path()
 
+    @classmethod
+    def get_auto_reload(cls) -> bool:
+        """템플릿 파일 변경 감지 여부를 반환
+        - TEMPLATE_AUTO_RELOAD 환경변수가 없으면 APP_IS_DEBUG 값을 따른다.
+        - False 일 경우 렌더링마다 템플릿 파일의 수정시간(os.stat)을 확인하지 않는다.
+        """
+        if cls._auto_reload is None:
+            load_dotenv()
+            auto_reload = os.getenv("TEMPLATE_AUTO_RELOAD") or os.getenv("APP_IS_DEBUG", False)
+            cls._auto_reload = TypeAdapter(bool).validate_python(auto_reload)
+
+        return cls._auto_reload
+
+    @classmethod
+    def get_bytecode_cache(cls) -> TemplateBytecodeCache:
+        """data 디렉토리에 저장되는 템플릿 바이트코드 캐시를 반환
+        - 워커/재시작 간에 컴파일 결과를 공유한다.
+        - 원본 템플릿이 변경되면 체크섬이 달라져 자동으로 다시 컴파일된다.
+        """
+        if cls._bytecode_cache is None:
+            os.makedirs(TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+            cls._bytecode_cache = TemplateBytecodeCache(TEMPLATE_BYTECODE_CACHE_DIR)
+
+        return cls._bytecode_cache
+
+
+def create_template_env(directories: typing.Sequence[str]) -> Environment:
+    """바이트코드 캐시가 적용된 Jinja2 Environment를 생성
+
+    Args:
+        directories (Sequence[str]): 템플릿 검색 경로 목록
+
+    Returns:
+        Environment: Jinja2 Environment
+    """
+    return Environment(
+        loader=FileSystemLoader(directories),
+        autoescape=True,
+        auto_reload=TemplateService.get_auto_reload(),
+        bytecode_cache=TemplateService.get_bytecode_cache(),
+        cache_size=TEMPLATE_CACHE_SIZE,
+    )
+
+
+def precompile_templates(env: Environment) -> int:
+    """Environment 경로의 모든 html 템플릿을 미리 컴파일
+    - 서버 시작 시 호출하여 첫 요청의 컴파일 지연을 없앤다.
+    - 컴파일 결과는 메모리 캐시와 바이트코드 캐시에 함께 저장된다.
+
+    Args:
+        env (Environment): Jinja2 Environment
+
+    Returns:
+        int: 컴파일된 템플릿 수
+    """
+    logger = logging.getLogger("uvicorn.error")
+    count = 0
+    for name in env.list_templates(extensions=["html"]):
+        try:
+            env.get_template(name)
+            count += 1
+        except TemplateError as e:
+            logger.warning(f"template precompile failed: {name} ({e})")
+
+    return count
+
 
 class UserTemplates(Jinja2Templates):
     """
@@ -126,7 +215,6 @@ class UserTemplates(Jinja2Templates):
     - 싱글톤 패턴으로 구현
     """
     _instance = None
-    _is_mobile: bool = False
     default_directories = [TemplateService.get_templates_dir(), EDITOR_PATH, CAPTCHA_PATH, PLUGIN_DIR]
 
     def __new__(cls, *args, **kwargs):
@@ -141,7 +229,13 @@ class UserTemplates(Jinja2Templates):
                  env: Environment = None):
         if not getattr(self, '_initialized', False):
             self._initialized = True
-            super().__init__(directory=self.default_directories, context_processors=context_processors)
+            super().__init__(
+                env=create_template_env(self.default_directories),
+                context_processors=context_processors
+            )
+            # 테마/디바이스별 Environment 저장소
+            self._device_envs = {}
+            self._device_envs_lock = threading.Lock()
 
             # 템플릿 필터 설정
             self.env.filters["datetime_format"] = datetime_format
@@ -154,6 +248,7 @@ class UserTemplates(Jinja2Templates):
             self.env.globals["get_member_icon"] = get_member_icon
             self.env.globals["get_member_image"] = get_member_image
             self.env.globals["theme_asset"] = theme_asset
+            self.env.globals["asset_url"] = asset_url
             self.env.globals["get_populars"] = get_populars
             self.env.globals["get_recent_poll"] = get_recent_poll
             self.env.globals["get_menus"] = get_menus
@@ -166,15 +261,59 @@ class UserTemplates(Jinja2Templates):
 
     def _default_context(self, request: Request):
         # Lazy import
-        from lib.board_lib import render_latest_posts
+        from lib.board_lib import render_latest_feed, render_latest_posts
 
         context = {
             "current_login_count": get_current_login_count(request),
+            "render_latest_feed": render_latest_feed,
             "render_latest_posts": render_latest_posts,
             "render_visit_statistics": render_visit_statistics,
         }
         return context
 
+    def get_device_env(self, is_mobile: bool = False) -> Environment:
+        """현재 테마의 디바이스(PC/모바일)별 Environment를 반환
+
+        - 테마/디바이스별로 한 번만 생성하고, 이후에는 변경하지 않는다.
+        - 각 Environment는 별도의 템플릿 캐시를 가지며 필터/전역 변수는 self.env와 공유한다.
+        - 모바일 Environment는 mobile 템플릿을 우선 검색하고 없으면 기본 템플릿을 사용한다.
+        - 반응형일 경우 항상 PC Environment를 반환한다.
+
+        Args:
+            is_mobile (bool, optional): 모바일 여부. Defaults to False.
+
+        Returns:
+            Environment: 디바이스별 Jinja2 Environment
+        """
+        is_mobile = is_mobile and not TemplateService.get_responsive()
+        templates_dir = TemplateService.get_templates_dir()
+        key = (templates_dir, is_mobile)
+
+        env = self._device_envs.get(key)
+        if env is None:
+            with self._device_envs_lock:
+                env = self._device_envs.get(key)
+                if env is None:
+                    directories = self.get_directories(templates_dir, is_mobile)
+                    env = self.env.overlay(loader=FileSystemLoader(directories))
+                    self._device_envs[key] = env
+        return env
+
+    def get_directories(self, templates_dir: str, is_mobile: bool = False) -> list:
+        """테마/디바이스별 템플릿 검색 경로를 반환
+
+        Args:
+            templates_dir (str): 테마 경로
+            is_mobile (bool, optional): 모바일 여부. Defaults to False.
+
+        Returns:
+            list: 템플릿 검색 경로 목록
+        """
+        directories = [templates_dir, EDITOR_PATH, CAPTCHA_PATH, PLUGIN_DIR]
+        if is_mobile:
+            directories.insert(0, f"{templates_dir}/mobile")
+        return directories
+
     def TemplateResponse(
         self,
         name: str,
@@ -186,30 +325,20 @@ class UserTemplates(Jinja2Templates):
     ) -> _TemplateResponse:
         """Jinja2Templates TemplateResponse Override
         
-        적응형&모바일 접근일 경우 모바일 템플릿을 우선으로 검색하도록 경로를 재설정한다.
-        - mobile 템플릿이 존재하지 않을 경우 기본 템플릿을 자동으로 사용한다.
-        - 클래스 변수(_is_mobile)를 통해 이전 요청과 비교하여 변경되었을 경우에만 경로를 재설정한다.
-        - 해당 로직은 생성자에서 처리하지 못한다.
+        요청의 접속환경(PC/모바일)에 맞는 Environment에서 템플릿을 찾아 렌더링한다.
+        - 공유 로더를 요청마다 변경하지 않으므로 동시 요청에도 안전하고 템플릿 캐시가 유지된다.
         """
         request = context.get("request")
         is_mobile: bool = getattr(request.state, "is_mobile", False)
-        if (not TemplateService.get_responsive()
-                and self._is_mobile != is_mobile):
-            # 경로 우선순위 변경
-            mobile_dir = f"{TemplateService.get_templates_dir()}/mobile"
-            if is_mobile:
-                self.default_directories.insert(0, mobile_dir)
-            else:
-                if mobile_dir in self.default_directories:
-                    self.default_directories.remove(mobile_dir)
-
-            # 템플릿 로더 재설정
-            self.env.loader = FileSystemLoader(self.default_directories)
-            self._is_mobile = is_mobile
-
-        return super().TemplateResponse(
-            name=name,
-            context=context,
+        env = self.get_device_env(is_mobile)
+
+        for context_processor in self.context_processors:
+            context.update(context_processor(request))
+
+        template = env.get_template(name)
+        return _TemplateResponse(
+            template,
+            context,
             status_code=status_code,
             headers=headers,
             media_type=media_type,
@@ -239,7 +368,10 @@ class AdminTemplates(Jinja2Templates):
                  ):
         if not getattr(self, '_initialized', False):
             self._initialized = True
-            super().__init__(directory=self.default_directories, context_processors=context_processors)
+            super().__init__(
+                env=create_template_env(self.default_directories),
+                context_processors=context_processors
+            )
 
             # 템플릿 필터 설정
             self.env.filters["datetime_format"] = datetime_format
@@ -252,6 +384,7 @@ class AdminTemplates(Jinja2Templates):
             self.env.globals["get_member_icon"] = get_member_icon
             self.env.globals["get_member_image"] = get_member_image
             self.env.globals["theme_asset"] = theme_asset
+            self.env.globals["asset_url"] = asset_url
             self.env.globals["get_all_plugin_module_names"] = get_all_plugin_module_names
             self.env.globals["get_plugin_state_cache"] = get_plugin_state_cache
             self.env.globals["get_admin_plugin_menus"] = get_admin_plugin_menus
@@ -276,6 +409,7 @@ class AdminTemplates(Jinja2Templates):
 def theme_asset(request: Request, asset_path: str) -> str:
     """
     현재 테마의 asset url을 반환하는 헬퍼 함수
+    - static 파일이 빌드되어 있으면 해시가 포함된 빌드 경로를 반환한다.
 
     Args:
         request (Request): Request 객체
@@ -286,7 +420,7 @@ def theme_asset(request: Request, asset_path: str) -> str:
     """
     theme = get_current_theme()
 
-    return f"/theme_static/{theme}/{asset_path}"
+    return asset_url(f"/theme_static/{theme}/{asset_path}")
 
 
 def register_theme_statics(app: FastAPI) -> None:
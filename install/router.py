@@ -20,6 +20,7 @@ from core.plugin import read_plugin_state, write_plugin_state
 from core.template import TemplateService
 from lib.common import *
 from lib.dependencies import validate_install, validate_token
+from lib.mail_queue import mail_worker_pool
 from lib.pbkdf2 import create_hash
 
 INSTALL_TEMPLATES = "install/templates"
@@ -185,6 +186,9 @@ async def install_process(request: Request):
             setup_data_directory()
             yield "데이터 경로 생성 완료"
 
+            # 설치 전에는 시작하지 않았던 메일 발송 작업자 시작
+            mail_worker_pool.start()
+
             yield f"[success] 축하합니다. {default_version} 설치가 완료되었습니다."
         
         except Exception as e:
@@ -0,0 +1,251 @@
+"""게시판 글/댓글 작성수 집계
+
+- 관리자 글, 댓글 현황 그래프는 시간별 집계 테이블(BoardActivityRollup)에서 조회하므로
+  최신글 테이블(BoardNew) 정리 주기와 무관하게 전체 기간을 표시할 수 있다.
+- 집계는 글/댓글 작성, 삭제, 이동/복사 시 증감되며(BoardActivityChanges),
+  게시판 테이블에서 다시 생성할 수 있다(rebuild_board_activity).
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.database import DBConnect
+from core.models import Board, BoardActivityRollup, WriteBaseModel
+from lib.common import dynamic_create_write_table
+
+
+def truncate_hour(value: datetime) -> datetime:
+    """시간 단위로 절삭한 일시를 반환합니다."""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class BoardActivityChanges():
+    """게시판 시간별 글/댓글 작성수 증감 내역을 모아서 반영하는 클래스
+    - 게시글 처리 트랜잭션이 완료된 후 apply()를 호출한다.
+    """
+
+    def __init__(self):
+        self._changes: Dict[Tuple[str, datetime], List[int]] = defaultdict(lambda: [0, 0])
+
+    def add(self, bo_table: str, wr_datetime: Optional[datetime], is_comment: bool, amount: int = 1) -> None:
+        """글/댓글 1건의 증감을 추가합니다.
+
+        Args:
+            bo_table (str): 게시판 테이블명
+            wr_datetime (datetime): 작성일시
+            is_comment (bool): 댓글 여부
+            amount (int, optional): 증감수 (삭제는 -1). Defaults to 1.
+        """
+        if not wr_datetime:
+            return
+        self._changes[(bo_table, truncate_hour(wr_datetime))][1 if is_comment else 0] += amount
+
+    def add_rows(self, bo_table: str, rows: Iterable, amount: int = 1) -> None:
+        """wr_datetime, wr_is_comment 컬럼을 가진 행 목록의 증감을 추가합니다."""
+        for row in rows:
+            self.add(bo_table, row.wr_datetime, row.wr_is_comment, amount)
+
+    def apply(self) -> None:
+        """모아둔 증감 내역을 집계 테이블에 반영합니다."""
+        changes = {key: value for key, value in self._changes.items() if any(value)}
+        self._changes.clear()
+        if not changes:
+            return
+
+        with DBConnect().sessionLocal() as db:
+            for (bo_table, hour), (write_count, comment_count) in changes.items():
+                _apply_change(db, bo_table, hour, write_count, comment_count)
+
+
+def _apply_change(db: Session, bo_table: str, hour: datetime, write_count: int, comment_count: int) -> None:
+    """집계 행 1개를 증감합니다. 행이 없으면 추가합니다."""
+    model = BoardActivityRollup
+    for _ in range(2):
+        result = db.execute(
+            update(model)
+            .where(model.bo_table == bo_table, model.ba_datetime == hour)
+            .values(
+                ba_write_count=case(
+                    (model.ba_write_count + write_count < 0, 0),
+                    else_=model.ba_write_count + write_count),
+                ba_comment_count=case(
+                    (model.ba_comment_count + comment_count < 0, 0),
+                    else_=model.ba_comment_count + comment_count),
+            )
+        )
+        if result.rowcount:
+            db.commit()
+            return
+
+        # 집계되지 않은 시간의 삭제는 반영할 행이 없다.
+        if write_count <= 0 and comment_count <= 0:
+            db.rollback()
+            return
+        try:
+            db.execute(
+                insert(model).values(
+                    bo_table=bo_table,
+                    ba_datetime=hour,
+                    ba_write_count=max(write_count, 0),
+                    ba_comment_count=max(comment_count, 0),
+                )
+            )
+            db.commit()
+            return
+        except IntegrityError:
+            # 다른 요청에서 먼저 추가한 경우 UPDATE로 다시 반영
+            db.rollback()
+
+
+def add_board_activity(bo_table: str, write: WriteBaseModel, amount: int = 1) -> None:
+    """글/댓글 1건의 작성수 증감을 즉시 반영합니다.
+
+    Args:
+        bo_table (str): 게시판 테이블명
+        write (WriteBaseModel): 게시글/댓글 모델
+        amount (int, optional): 증감수 (삭제는 -1). Defaults to 1.
+    """
+    changes = BoardActivityChanges()
+    changes.add(bo_table, write.wr_datetime, write.wr_is_comment, amount)
+    changes.apply()
+
+
+def _get_hour_expression(db: Session, column):
+    """작성일시를 'YYYY-MM-DD HH' 문자열로 변환하는 SQL 표현식을 반환합니다."""
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        return func.date_format(column, "%Y-%m-%d %H")
+    elif dialect == "postgresql":
+        return func.to_char(column, "YYYY-MM-DD HH24")
+    elif dialect == "sqlite":
+        return func.strftime("%Y-%m-%d %H", column)
+    raise Exception(f"Unsupported dialect: {dialect}")
+
+
+def rebuild_board_activity(db: Session, bo_tables: Optional[Iterable[str]] = None) -> int:
+    """게시판 테이블에서 시간별 글/댓글 작성수 집계를 다시 생성합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        bo_tables (Iterable[str], optional): 집계할 게시판 목록. None이면 전체 게시판. Defaults to None.
+
+    Returns:
+        int: 생성한 집계 행 수
+    """
+    if bo_tables is None:
+        bo_tables = db.scalars(select(Board.bo_table)).all()
+
+    count = 0
+    for bo_table in bo_tables:
+        write_model = dynamic_create_write_table(bo_table)
+        hour_expr = _get_hour_expression(db, write_model.wr_datetime)
+        rows = db.execute(
+            select(
+                hour_expr.label("hour"),
+                func.sum(case((write_model.wr_is_comment == 0, 1), else_=0)),
+                func.sum(case((write_model.wr_is_comment != 0, 1), else_=0)),
+            )
+            .where(write_model.wr_datetime.is_not(None))
+            .group_by(hour_expr)
+        ).all()
+
+        db.execute(delete(BoardActivityRollup).where(BoardActivityRollup.bo_table == bo_table))
+        values = [
+            {
+                "bo_table": bo_table,
+                "ba_datetime": datetime.strptime(str(hour)[:13], "%Y-%m-%d %H"),
+                "ba_write_count": int(write_count or 0),
+                "ba_comment_count": int(comment_count or 0),
+            }
+            for hour, write_count, comment_count in rows if hour
+        ]
+        if values:
+            db.execute(insert(BoardActivityRollup), values)
+        db.commit()
+        count += len(values)
+
+    return count
+
+
+def delete_board_activity(db: Session, bo_table: str) -> None:
+    """게시판 삭제 시 집계를 삭제합니다."""
+    db.execute(delete(BoardActivityRollup).where(BoardActivityRollup.bo_table == bo_table))
+
+
+def _get_bucket(unit: str, value: datetime) -> date:
+    """그래프 단위별 집계 키를 반환합니다."""
+    if unit == "시간":
+        return value
+    day = value.date()
+    if unit == "주":
+        return day - timedelta(days=day.weekday())
+    if unit == "월":
+        return day.replace(day=1)
+    if unit == "년":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _format_bucket(unit: str, bucket: date) -> str:
+    """그래프 단위별 집계 키의 표시 문자열을 반환합니다."""
+    if unit == "시간":
+        return bucket.strftime("%H:00")
+    if unit == "주":
+        return bucket.strftime("Week %V, %G")
+    if unit == "월":
+        return bucket.strftime("%b, %Y")
+    if unit == "년":
+        return bucket.strftime("%Y")
+    return bucket.strftime("%y-%m-%d")
+
+
+def aggregate_board_activity(db: Session,
+                             bo_table: str,
+                             from_date: datetime,
+                             to_date: datetime,
+                             unit: str) -> List[Tuple[str, int, int]]:
+    """기간 내 글/댓글 작성수를 그래프 단위별로 집계합니다.
+    - 작성 내역이 없는 구간도 0으로 포함합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        bo_table (str): 게시판 테이블명 (빈 문자열이면 전체 게시판)
+        from_date (datetime): 시작일시
+        to_date (datetime): 종료일시
+        unit (str): 그래프 단위 (시간, 일, 주, 월, 년)
+
+    Returns:
+        List[Tuple[str, int, int]]: (표시 문자열, 글수, 댓글수) 목록
+    """
+    model = BoardActivityRollup
+    query = (
+        select(model.ba_datetime, func.sum(model.ba_write_count), func.sum(model.ba_comment_count))
+        .where(model.ba_datetime.between(truncate_hour(from_date), to_date))
+        .group_by(model.ba_datetime)
+    )
+    if bo_table:
+        query = query.where(model.bo_table == bo_table)
+
+    counts = defaultdict(lambda: [0, 0])
+    for hour, write_count, comment_count in db.execute(query).all():
+        bucket = _get_bucket(unit, hour)
+        counts[bucket][0] += int(write_count or 0)
+        counts[bucket][1] += int(comment_count or 0)
+
+    # 빈 구간을 포함한 전체 구간 목록
+    step = timedelta(hours=1) if unit == "시간" else timedelta(days=1)
+    current = truncate_hour(from_date)
+    if unit != "시간":
+        current = current.replace(hour=0)
+    buckets = []
+    while current <= to_date:
+        bucket = _get_bucket(unit, current)
+        if not buckets or buckets[-1] != bucket:
+            buckets.append(bucket)
+        current += step
+
+    return [(_format_bucket(unit, bucket), *counts[bucket]) for bucket in buckets]
@@ -2,18 +2,22 @@
 import bleach
 
 from datetime import datetime, timedelta
-from fastapi import Request
-from sqlalchemy import and_, insert, or_
-from sqlalchemy.orm import Session
+from fastapi import BackgroundTasks, Request
+from sqlalchemy import and_, insert, literal, or_, update
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.sql.expression import Select
 
 from core.database import DBConnect
 from core.exception import AlertException
-from core.models import Board, BoardFile, BoardNew, Scrap, WriteBaseModel
+from core.models import (
+    Board, BoardFile, BoardGood, BoardNew, Point, Scrap, WriteBaseModel, WriteNum
+)
 from core.template import UserTemplates
+from lib.board_activity import BoardActivityChanges, add_board_activity, rebuild_board_activity
 from lib.common import *
 from lib.member_lib import get_admin_type, get_member_level
-from lib.point import delete_point, insert_point
+from lib.page_cache import purge_board_pages
+from lib.point import delete_use_point, insert_use_point
 
 
 class BoardConfig():
@@ -817,6 +821,716 @@ class BoardFileManager():
             return UploadFile(f, filename=os.path.basename(path))
 
 
+class BoardCloneManager():
+    """게시판의 게시글/첨부파일을 새 게시판으로 복제하는 클래스.
+    - 게시글은 wr_id 구간 단위의 INSERT ... SELECT로 DB 서버에서 복사한다.
+    - 첨부파일 정보는 집합 단위로 복사하고, 실제 파일은 copy_physical_files()로 따로 복사한다.
+    """
+    # INSERT ... SELECT 1회에 포함할 wr_id 구간 크기
+    chunk_size = 10000
+
+    def __init__(self, db: Session, origin_bo_table: str, target_bo_table: str, directory: str):
+        self.db = db
+        self.origin_bo_table = origin_bo_table
+        self.target_bo_table = target_bo_table
+        self.origin_directory = os.path.join(directory, origin_bo_table)
+        self.target_directory = os.path.join(directory, target_bo_table)
+
+    def copy_writes(self) -> int:
+        """원본 게시판의 모든 게시글을 대상 게시판 테이블로 복사한다.
+
+        Returns:
+            int: 복사한 게시글 수
+        """
+        origin_table = dynamic_create_write_table(self.origin_bo_table).__table__
+        target_table = dynamic_create_write_table(self.target_bo_table).__table__
+        columns = [column.name for column in target_table.columns]
+
+        min_id, max_id = self.db.execute(
+            select(func.min(origin_table.c.wr_id), func.max(origin_table.c.wr_id))
+        ).one()
+        if min_id is None:
+            return 0
+
+        count = 0
+        for start in range(min_id, max_id + 1, self.chunk_size):
+            result = self.db.execute(
+                insert(target_table).from_select(
+                    columns,
+                    select(*[origin_table.c[name] for name in columns])
+                    .where(origin_table.c.wr_id.between(start, start + self.chunk_size - 1))
+                )
+            )
+            count += result.rowcount
+            self.db.commit()
+
+        # wr_id를 직접 입력했으므로 PostgreSQL은 시퀀스 값을 맞춰준다.
+        if self.db.bind.dialect.name == "postgresql":
+            self.db.execute(select(func.setval(
+                func.pg_get_serial_sequence(target_table.name, "wr_id"), max_id)))
+            self.db.commit()
+
+        # 글, 댓글 현황 집계
+        rebuild_board_activity(self.db, [self.target_bo_table])
+
+        return count
+
+    def copy_board_files(self) -> int:
+        """원본 게시판의 첨부파일 정보를 대상 게시판으로 일괄 복사한다.
+        - 파일 경로는 대상 게시판 디렉토리로 변경되며, 다운로드 횟수는 초기화된다.
+
+        Returns:
+            int: 복사한 첨부파일 정보 수
+        """
+        columns = [column.name for column in BoardFile.__table__.columns]
+        expressions = []
+        for name in columns:
+            column = BoardFile.__table__.c[name]
+            if name == "bo_table":
+                expression = literal(self.target_bo_table)
+            elif name == "bf_file":
+                expression = func.replace(column, f"{self.origin_directory}/", f"{self.target_directory}/")
+            elif name == "bf_download":
+                expression = literal(0)
+            else:
+                expression = column
+            expressions.append(expression.label(name))
+
+        result = self.db.execute(
+            insert(BoardFile).from_select(
+                columns,
+                select(*expressions).where(BoardFile.bo_table == self.origin_bo_table)
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def copy_physical_files(self):
+        """복사된 첨부파일 정보를 기준으로 실제 파일을 복사한다.
+
+        Yields:
+            tuple: (복사 순번, 원본 파일 경로, 대상 파일 경로, 복사 여부)
+        """
+        origin_file = aliased(BoardFile)
+        rows = self.db.execute(
+            select(origin_file.bf_file, BoardFile.bf_file)
+            .join(origin_file, and_(
+                origin_file.bo_table == self.origin_bo_table,
+                origin_file.wr_id == BoardFile.wr_id,
+                origin_file.bf_no == BoardFile.bf_no,
+            ))
+            .where(BoardFile.bo_table == self.target_bo_table)
+            .execution_options(yield_per=self.chunk_size)
+        )
+        make_directory(self.target_directory)
+        for count, (origin_path, target_path) in enumerate(rows, start=1):
+            is_copied = False
+            if origin_path != target_path and os.path.exists(origin_path):
+                make_directory(os.path.dirname(target_path))
+                shutil.copy(origin_path, target_path)
+                is_copied = True
+            yield count, origin_path, target_path, is_copied
+
+
+class BoardMoveManager():
+    """게시글 복사/이동을 집합 단위로 처리하는 클래스.
+    - 대상 게시판마다 wr_num을 reserve_write_nums()로 블록 단위 예약한다.
+    - 원글과 댓글을 INSERT ... SELECT로 복사한 뒤 wr_parent를 재설정한다.
+    - 최신글/추천/스크랩/파일 정보는 집합 단위로 갱신하며, 전체 작업은 하나의 트랜잭션으로 처리된다.
+    - 실제 첨부파일은 copy_physical_files()로 트랜잭션 이후에 복사/이동한다.
+    """
+    # CASE/IN 절 1회에 포함할 최대 항목 수
+    chunk_size = 500
+
+    def __init__(self, request: Request, db: Session, origin_board: Board, sw: str):
+        self.request = request
+        self.db = db
+        self.origin_board = origin_board
+        self.origin_bo_table = origin_board.bo_table
+        self.origin_model = dynamic_create_write_table(self.origin_bo_table)
+        self.sw = sw
+        self.act = "이동" if sw == "move" else "복사"
+        # 트랜잭션 완료 후 복사/이동할 (원본 경로, 대상 경로) 파일 목록
+        self.file_copies = []
+        self.file_moves = []
+
+    def run(self, wr_ids: list, target_bo_tables: list, directory: str) -> set:
+        """선택한 게시글과 댓글을 대상 게시판으로 복사/이동한다.
+
+        Args:
+            wr_ids (list): 복사/이동할 게시글 아이디 목록
+            target_bo_tables (list): 대상 게시판 테이블명 목록
+            directory (str): 첨부파일 저장 경로
+
+        Returns:
+            set: 변경된 게시판 테이블명 목록 (최신글 캐시 삭제용)
+        """
+        origin = self.origin_model
+        wr_ids = [int(wr_id) for wr_id in wr_ids if str(wr_id).strip().isdigit()]
+
+        # 선택한 게시글(원글)과 그 댓글의 최소 정보만 조회
+        post_ids = []
+        for chunk in self._chunks(wr_ids):
+            post_ids.extend(self.db.scalars(
+                select(origin.wr_id).where(origin.wr_id.in_(chunk), origin.wr_is_comment == 0)
+            ).all())
+        rows = []
+        for chunk in self._chunks(post_ids):
+            rows.extend(self.db.execute(
+                select(origin.wr_id, origin.wr_parent, origin.wr_num, origin.wr_is_comment, origin.wr_datetime)
+                .where(origin.wr_parent.in_(chunk))
+                .order_by(origin.wr_id)
+            ).all())
+        if not rows:
+            return set()
+
+        targets = []
+        for target_bo_table in dict.fromkeys(target_bo_tables):
+            if self.sw == "move" and target_bo_table == self.origin_bo_table:
+                continue
+            if self.db.get(Board, target_bo_table):
+                targets.append(target_bo_table)
+        if not targets:
+            return set()
+
+        origin_files = self._get_origin_files([row.wr_id for row in rows])
+        write_count = sum(1 for row in rows if not row.wr_is_comment)
+        comment_count = len(rows) - write_count
+
+        # 대상 게시판별 wr_num 블록 예약 (같은 wr_num을 공유하는 답변글 그룹은 유지)
+        origin_nums = sorted({row.wr_num for row in rows}, reverse=True)
+        num_maps = {}
+        for target_bo_table in targets:
+            start_num = reserve_write_nums(target_bo_table, len(origin_nums))
+            num_maps[target_bo_table] = {num: start_num - index for index, num in enumerate(origin_nums)}
+
+        try:
+            for index, target_bo_table in enumerate(targets):
+                id_map = self._copy_writes(target_bo_table, rows, num_maps[target_bo_table])
+                # 이동은 첫번째 대상 게시판으로 관련 데이터를 옮기고, 나머지 게시판에는 복사한다.
+                if self.sw == "move" and index == 0:
+                    self._move_relations(target_bo_table, rows, id_map, post_ids, origin_files, directory)
+                else:
+                    self._copy_files(target_bo_table, origin_files, id_map, directory)
+
+                self.db.execute(
+                    update(Board)
+                    .where(Board.bo_table == target_bo_table)
+                    .values(
+                        bo_count_write=Board.bo_count_write + write_count,
+                        bo_count_comment=Board.bo_count_comment + comment_count,
+                    )
+                )
+
+            if self.sw == "move":
+                for chunk in self._chunks([row.wr_id for row in rows]):
+                    self.db.execute(delete(origin).where(origin.wr_id.in_(chunk)))
+
+                moved_ids = {str(wr_id) for wr_id in post_ids}
+                notice_ids = [n for n in (self.origin_board.bo_notice or "").split(",")
+                              if n and n not in moved_ids]
+                self.db.execute(
+                    update(Board)
+                    .where(Board.bo_table == self.origin_bo_table)
+                    .values(
+                        bo_count_write=Board.bo_count_write - write_count,
+                        bo_count_comment=Board.bo_count_comment - comment_count,
+                        bo_notice=",".join(notice_ids),
+                    )
+                )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self.file_copies = []
+            self.file_moves = []
+            raise
+
+        # 글, 댓글 현황 집계 (복사된 글은 현재 시간에 작성된 것으로 집계)
+        activity = BoardActivityChanges()
+        copied_at = datetime.now()
+        for target_bo_table in targets:
+            if self.sw == "move":
+                activity.add_rows(target_bo_table, rows)
+            else:
+                for row in rows:
+                    activity.add(target_bo_table, copied_at, row.wr_is_comment)
+        if self.sw == "move":
+            activity.add_rows(self.origin_bo_table, rows, -1)
+        activity.apply()
+
+        return {self.origin_bo_table, *targets}
+
+    def copy_physical_files(self) -> None:
+        """트랜잭션 완료 후 첨부파일을 실제로 복사/이동한다. (BackgroundTask로 실행)
+        - 다른 게시판으로의 복사는 원본 파일을 사용하므로 복사를 마친 후 이동한다.
+        """
+        for origin_path, target_path in self.file_copies:
+            try:
+                make_directory(os.path.dirname(target_path))
+                if os.path.exists(origin_path):
+                    shutil.copy(origin_path, target_path)
+            except OSError as e:
+                logging.warning(f"게시글 첨부파일 복사 실패: {origin_path} -> {target_path} ({e})")
+
+        for origin_path, target_path in self.file_moves:
+            try:
+                make_directory(os.path.dirname(target_path))
+                if os.path.exists(origin_path):
+                    shutil.move(origin_path, target_path)
+            except OSError as e:
+                logging.warning(f"게시글 첨부파일 이동 실패: {origin_path} -> {target_path} ({e})")
+
+    def _copy_writes(self, target_bo_table: str, rows: list, num_map: dict) -> dict:
+        """INSERT ... SELECT로 게시글/댓글을 복사하고 wr_parent를 재설정한다.
+
+        복사 시 wr_parent에는 임시로 -(원본 wr_id)를 기록하고,
+        두번째 단계에서 원본 부모글의 새 wr_id로 일괄 변경한다.
+
+        Returns:
+            dict: {원본 wr_id: 새 wr_id}
+        """
+        origin_table = self.origin_model.__table__
+        target_table = dynamic_create_write_table(target_bo_table).__table__
+
+        columns = [column.name for column in target_table.columns if column.name != "wr_id"]
+        expressions = []
+        for name in columns:
+            column = origin_table.c[name]
+            if name == "wr_num":
+                expression = case(num_map, value=column)
+            elif name == "wr_parent":
+                expression = literal(0) - origin_table.c.wr_id
+            elif name == "wr_content":
+                expression = self._content_with_log(origin_table)
+            elif self.sw == "copy" and name in ("wr_hit", "wr_good", "wr_nogood"):
+                expression = literal(0)
+            elif self.sw == "copy" and name == "wr_datetime":
+                expression = literal(datetime.now(), DateTime)
+            else:
+                expression = column
+            expressions.append(expression.label(name))
+
+        for chunk in self._chunks([row.wr_id for row in rows]):
+            self.db.execute(
+                insert(target_table).from_select(
+                    columns,
+                    select(*expressions)
+                    .where(origin_table.c.wr_id.in_(chunk))
+                    .order_by(origin_table.c.wr_id)
+                )
+            )
+
+        # 임시로 기록한 -(원본 wr_id)로 새 wr_id를 찾는다.
+        id_map = {
+            -wr_parent: wr_id for wr_id, wr_parent in self.db.execute(
+                select(target_table.c.wr_id, target_table.c.wr_parent)
+                .where(target_table.c.wr_parent < 0)
+            ).all()
+        }
+        parent_map = {-row.wr_id: id_map[row.wr_parent] for row in rows}
+        for chunk in self._chunks(list(parent_map.keys())):
+            self.db.execute(
+                update(target_table)
+                .where(target_table.c.wr_parent.in_(chunk))
+                .values(wr_parent=case({key: parent_map[key] for key in chunk}, value=target_table.c.wr_parent))
+            )
+
+        return id_map
+
+    def _content_with_log(self, origin_table):
+        """복사/이동 로그를 원글 내용에 추가하는 SQL 표현식을 반환한다."""
+        config = self.request.state.config
+        column = origin_table.c.wr_content
+        if not config.cf_use_copy_log:
+            return column
+
+        member = self.request.state.login_member
+        nick = cut_name(self.request, getattr(member, "mb_nick", ""))
+        log_msg = (f"[이 게시물은 {nick}님에 의해 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} "
+                   f"{self.origin_board.bo_subject}에서 {self.act} 됨]")
+        return case(
+            (and_(origin_table.c.wr_is_comment == 0, origin_table.c.wr_option.like("%html%")),
+             column + f'<div class="content_{self.sw}">{log_msg}</div>'),
+            (origin_table.c.wr_is_comment == 0, column + f"\n{log_msg}"),
+            else_=column
+        )
+
+    def _move_relations(self, target_bo_table: str, rows: list, id_map: dict, post_ids: list,
+                        origin_files: list, directory: str) -> None:
+        """최신글/추천/스크랩/파일 정보를 대상 게시판으로 옮기고, 실제 파일 이동 목록을 기록한다."""
+        parent_map = {row.wr_id: id_map[row.wr_parent] for row in rows}
+        no_sync = {"synchronize_session": False}
+
+        # 첨부파일은 대상 게시판 경로로 옮긴다.
+        target_directory = os.path.join(directory, target_bo_table)
+        file_paths = {}
+        for board_file in origin_files:
+            if board_file.bf_file:
+                filename = os.urandom(16).hex() + "." + board_file.bf_source.split(".")[-1]
+                file_paths[board_file.bf_file] = f"{target_directory}/{filename}"
+        self.file_moves.extend(file_paths.items())
+
+        for chunk in self._chunks(list(id_map.keys())):
+            chunk_ids = {key: id_map[key] for key in chunk}
+            chunk_parents = {key: parent_map[key] for key in chunk}
+            self.db.execute(
+                update(BoardNew)
+                .where(BoardNew.bo_table == self.origin_bo_table, BoardNew.wr_id.in_(chunk))
+                .values(
+                    bo_table=target_bo_table,
+                    wr_id=case(chunk_ids, value=BoardNew.wr_id),
+                    wr_parent=case(chunk_parents, value=BoardNew.wr_id)
+                ).execution_options(**no_sync)
+            )
+            chunk_files = {
+                board_file.bf_file: file_paths[board_file.bf_file] for board_file in origin_files
+                if board_file.wr_id in chunk_ids and board_file.bf_file in file_paths
+            }
+            file_values = {"bo_table": target_bo_table, "wr_id": case(chunk_ids, value=BoardFile.wr_id)}
+            if chunk_files:
+                file_values["bf_file"] = case(chunk_files, value=BoardFile.bf_file, else_=BoardFile.bf_file)
+            self.db.execute(
+                update(BoardFile)
+                .where(BoardFile.bo_table == self.origin_bo_table, BoardFile.wr_id.in_(chunk))
+                .values(file_values)
+                .execution_options(**no_sync)
+            )
+
+        for chunk in self._chunks(post_ids):
+            chunk_ids = {key: id_map[key] for key in chunk}
+            for model in (BoardGood, Scrap):
+                self.db.execute(
+                    update(model)
+                    .where(model.bo_table == self.origin_bo_table, model.wr_id.in_(chunk))
+                    .values(bo_table=target_bo_table, wr_id=case(chunk_ids, value=model.wr_id))
+                    .execution_options(**no_sync)
+                )
+
+    def _get_origin_files(self, wr_ids: list) -> list:
+        """복사 대상 게시글의 첨부파일 정보를 조회한다."""
+        files = []
+        for chunk in self._chunks(wr_ids):
+            files.extend(self.db.scalars(
+                select(BoardFile)
+                .where(BoardFile.bo_table == self.origin_bo_table, BoardFile.wr_id.in_(chunk))
+            ).all())
+        return files
+
+    def _copy_files(self, target_bo_table: str, origin_files: list, id_map: dict, directory: str) -> None:
+        """첨부파일 정보를 일괄 추가하고, 실제 파일 복사 목록을 기록한다."""
+        if not origin_files:
+            return
+
+        target_directory = os.path.join(directory, target_bo_table)
+        values = []
+        for board_file in origin_files:
+            filename = os.urandom(16).hex() + "." + board_file.bf_source.split(".")[-1]
+            target_path = f"{target_directory}/{filename}"
+            values.append({
+                "bo_table": target_bo_table,
+                "wr_id": id_map[board_file.wr_id],
+                "bf_no": board_file.bf_no,
+                "bf_source": board_file.bf_source,
+                "bf_file": target_path,
+                "bf_download": 0,
+                "bf_content": board_file.bf_content,
+                "bf_filesize": board_file.bf_filesize,
+                "bf_width": board_file.bf_width,
+                "bf_height": board_file.bf_height,
+                "bf_type": board_file.bf_type,
+                "bf_datetime": datetime.now(),
+            })
+            self.file_copies.append((board_file.bf_file, target_path))
+        self.db.execute(insert(BoardFile), values)
+
+    def _chunks(self, items: list):
+        for index in range(0, len(items), self.chunk_size):
+            yield items[index:index + self.chunk_size]
+
+
+class BoardDeleteManager():
+    """게시글/댓글을 집합 단위로 삭제하는 클래스.
+    - 원글을 삭제하면 해당 원글의 댓글도 함께 삭제된다.
+    - 포인트 반환, 최신글/스크랩/추천/파일 정보 삭제는 하나의 트랜잭션에서 일괄 처리된다.
+    - 실제 첨부파일 삭제는 unlink_files()로 트랜잭션 이후에 처리한다.
+    """
+    # IN 절 1회에 포함할 최대 항목 수
+    chunk_size = 500
+
+    def __init__(self, request: Request, db: Session):
+        self.request = request
+        self.db = db
+        self.config = request.state.config
+        # 트랜잭션 완료 후 삭제할 첨부파일 경로 목록
+        self.file_paths = []
+        # 트랜잭션 완료 후 정리할 사용포인트 목록
+        self._use_points = []
+        # 트랜잭션 완료 후 반영할 글, 댓글 현황 집계
+        self.activity = BoardActivityChanges()
+
+    def delete(self, targets) -> set:
+        """게시글/댓글을 일괄 삭제한다.
+
+        Args:
+            targets (Iterable): (게시판 테이블명, 게시글 아이디) 목록
+
+        Returns:
+            set: 게시글이 삭제된 게시판 테이블명 목록 (최신글 캐시 삭제용)
+        """
+        grouped = {}
+        for bo_table, wr_id in targets:
+            grouped.setdefault(bo_table, set()).add(int(wr_id))
+
+        changed_bo_tables = set()
+        point_targets = []
+        try:
+            for bo_table, wr_ids in grouped.items():
+                board = self.db.get(Board, bo_table)
+                if not board:
+                    continue
+                rows = self._delete_writes(board, list(wr_ids))
+                if rows:
+                    changed_bo_tables.add(bo_table)
+                    point_targets.extend((board, row) for row in rows)
+
+            self._reverse_points(point_targets)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self.file_paths = []
+            self._use_points = []
+            self.activity = BoardActivityChanges()
+            raise
+
+        self.activity.apply()
+
+        # 사용포인트 정리 (회원별 1회)
+        for mb_id, point, po_id in self._use_points:
+            if point > 0:
+                delete_use_point(self.request, mb_id, point)
+            else:
+                insert_use_point(self.request, mb_id, abs(point), po_id)
+
+        return changed_bo_tables
+
+    def unlink_files(self) -> None:
+        """삭제된 게시글의 첨부파일과 섬네일을 삭제한다. (BackgroundTask로 실행)"""
+        for path in self.file_paths:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                # 동일한 경로에 있는 파일 중 파일이름으로 끝나는 파일들(섬네일) 삭제
+                directory = os.path.dirname(path)
+                filename = os.path.basename(path)
+                if os.path.isdir(directory):
+                    for file in os.listdir(directory):
+                        if file.endswith(filename):
+                            os.remove(os.path.join(directory, file))
+            except OSError as e:
+                logging.warning(f"게시글 첨부파일 삭제 실패: {path} ({e})")
+
+    def _delete_writes(self, board: Board, wr_ids: list) -> list:
+        """게시판의 게시글/댓글과 관련 데이터를 삭제하고 삭제된 행 목록을 반환한다."""
+        bo_table = board.bo_table
+        model = dynamic_create_write_table(bo_table)
+        columns = (model.wr_id, model.wr_parent, model.wr_is_comment, model.mb_id, model.wr_datetime)
+
+        selected = []
+        for chunk in self._chunks(wr_ids):
+            selected.extend(self.db.execute(select(*columns).where(model.wr_id.in_(chunk))).all())
+
+        # 원글은 댓글까지 함께 삭제하고, 댓글만 선택된 경우 해당 댓글만 삭제
+        post_ids = [row.wr_id for row in selected if not row.wr_is_comment]
+        post_id_set = set(post_ids)
+        rows = [row for row in selected if row.wr_is_comment and row.wr_parent not in post_id_set]
+        for chunk in self._chunks(post_ids):
+            rows.extend(self.db.execute(select(*columns).where(model.wr_parent.in_(chunk))).all())
+        if not rows:
+            return []
+        self.activity.add_rows(bo_table, rows, -1)
+
+        all_ids = list({row.wr_id for row in rows})
+        for chunk in self._chunks(all_ids):
+            self.file_paths.extend(self.db.scalars(
+                select(BoardFile.bf_file)
+                .where(BoardFile.bo_table == bo_table, BoardFile.wr_id.in_(chunk))
+            ).all())
+            self.db.execute(delete(BoardFile).where(BoardFile.bo_table == bo_table, BoardFile.wr_id.in_(chunk)))
+            self.db.execute(delete(BoardNew).where(BoardNew.bo_table == bo_table, BoardNew.wr_id.in_(chunk)))
+            self.db.execute(delete(model).where(model.wr_id.in_(chunk)))
+
+        for chunk in self._chunks(post_ids):
+            self.db.execute(delete(Scrap).where(Scrap.bo_table == bo_table, Scrap.wr_id.in_(chunk)))
+            self.db.execute(delete(BoardGood).where(BoardGood.bo_table == bo_table, BoardGood.wr_id.in_(chunk)))
+
+        # 댓글만 삭제된 원글의 댓글 수 감소
+        comment_counts = {}
+        for row in rows:
+            if row.wr_is_comment and row.wr_parent not in post_id_set:
+                comment_counts[row.wr_parent] = comment_counts.get(row.wr_parent, 0) + 1
+        for chunk in self._chunks(list(comment_counts.keys())):
+            self.db.execute(
+                update(model)
+                .where(model.wr_id.in_(chunk))
+                .values(wr_comment=model.wr_comment - case(
+                    {wr_id: comment_counts[wr_id] for wr_id in chunk}, value=model.wr_id))
+            )
+
+        # 게시글 갯수 및 공지사항 업데이트
+        write_count = sum(1 for row in rows if not row.wr_is_comment)
+        deleted_ids = {str(wr_id) for wr_id in post_ids}
+        notice_ids = [n for n in (board.bo_notice or "").split(",") if n and n not in deleted_ids]
+        self.db.execute(
+            update(Board)
+            .where(Board.bo_table == bo_table)
+            .values(
+                bo_count_write=Board.bo_count_write - write_count,
+                bo_count_comment=Board.bo_count_comment - (len(rows) - write_count),
+                bo_notice=",".join(notice_ids),
+            )
+        )
+        return rows
+
+    def _reverse_points(self, point_targets: list) -> None:
+        """삭제된 게시글/댓글의 포인트를 회원별로 묶어서 반환한다.
+        - 적립된 포인트 내역이 있으면 삭제하고, 없으면 차감 내역을 추가한다. (delete_point/insert_point와 동일)
+        """
+        if not point_targets:
+            return
+
+        # 게시판별로 작성자의 포인트 내역 조회 (delete_point와 같이 회원/관련 테이블/아이디/활동이 모두 일치)
+        target_keys = {
+            (row.mb_id, board.bo_table, str(row.wr_id), "댓글" if row.wr_is_comment else "쓰기")
+            for board, row in point_targets if row.mb_id
+        }
+        rel_ids, rel_mb_ids = {}, {}
+        for mb_id, bo_table, wr_id, _ in target_keys:
+            rel_ids.setdefault(bo_table, set()).add(wr_id)
+            rel_mb_ids.setdefault(bo_table, set()).add(mb_id)
+        points = []
+        for bo_table, ids in rel_ids.items():
+            mb_ids = list(rel_mb_ids[bo_table])
+            for chunk in self._chunks(sorted(ids)):
+                points.extend(self.db.execute(
+                    select(Point.po_id, Point.mb_id, Point.po_point, Point.po_use_point,
+                           Point.po_rel_table, Point.po_rel_id, Point.po_rel_action)
+                    .where(
+                        Point.mb_id.in_(mb_ids),
+                        Point.po_rel_table == bo_table,
+                        Point.po_rel_id.in_(chunk),
+                        Point.po_rel_action.in_(["쓰기", "댓글"])
+                    )
+                ).all())
+        points = [p for p in points
+                  if (p.mb_id, p.po_rel_table, p.po_rel_id, p.po_rel_action) in target_keys]
+
+        point_keys = {(p.mb_id, p.po_rel_table, p.po_rel_id, p.po_rel_action) for p in points}
+        penalties = []
+        for board, row in point_targets:
+            action = "댓글" if row.wr_is_comment else "쓰기"
+            if not row.mb_id or (row.mb_id, board.bo_table, str(row.wr_id), action) in point_keys:
+                continue
+            if row.wr_is_comment:
+                penalties.append((row.mb_id, board.bo_comment_point * (-1),
+                                  f"{board.bo_subject} {row.wr_parent}-{row.wr_id} 댓글 삭제"))
+            else:
+                penalties.append((row.mb_id, board.bo_write_point * (-1),
+                                  f"{board.bo_subject} {row.wr_id} 글 삭제"))
+        if not self.config.cf_use_point:
+            penalties = []
+        penalties = [penalty for penalty in penalties if penalty[1] != 0]
+
+        # 포인트 내역 삭제 및 이후 내역의 po_mb_point 보정 (회원별 1회)
+        deleted_by_member = {}
+        for point in sorted(points, key=lambda p: p.po_id):
+            deleted_by_member.setdefault(point.mb_id, []).append(point)
+        for chunk in self._chunks([point.po_id for point in points]):
+            self.db.execute(delete(Point).where(Point.po_id.in_(chunk)))
+        for mb_id, member_points in deleted_by_member.items():
+            cumulative = 0
+            whens = []
+            for point in member_points:
+                cumulative += point.po_point or 0
+                whens.insert(0, (Point.po_id > point.po_id, cumulative))
+            if cumulative:
+                self.db.execute(
+                    update(Point)
+                    .where(Point.mb_id == mb_id, Point.po_id > member_points[0].po_id)
+                    .values(po_mb_point=Point.po_mb_point - case(*whens, else_=0))
+                )
+            use_point = sum(p.po_point for p in member_points if p.po_point and p.po_point > 0)
+            if use_point:
+                self._use_points.append((mb_id, use_point, None))
+            for p in member_points:
+                if (not p.po_point or p.po_point <= 0) and p.po_use_point and p.po_use_point > 0:
+                    self._use_points.append((mb_id, -p.po_use_point, p.po_id))
+
+        member_ids = set(deleted_by_member.keys()) | {penalty[0] for penalty in penalties}
+        if not member_ids:
+            return
+        existing_ids = set()
+        for chunk in self._chunks(list(member_ids)):
+            existing_ids.update(self.db.scalars(select(Member.mb_id).where(Member.mb_id.in_(chunk))).all())
+
+        # 회원별 포인트 합계
+        # get_point_sum과 같이 유효기간이 지난 포인트는 소멸된 것으로 계산한다.
+        # (소멸 내역은 이후 get_point_sum 호출 시 추가되며, 합계는 같다.)
+        now = datetime.now()
+        point_sums = {}
+        expire_points = {}
+        for chunk in self._chunks(list(existing_ids)):
+            point_sums.update(self.db.execute(
+                select(Point.mb_id, func.coalesce(func.sum(Point.po_point), 0))
+                .where(Point.mb_id.in_(chunk))
+                .group_by(Point.mb_id)
+            ).all())
+            if self.config.cf_point_term > 0:
+                expire_points.update(self.db.execute(
+                    select(Point.mb_id, func.sum(Point.po_point - Point.po_use_point))
+                    .where(Point.mb_id.in_(chunk), Point.po_expired == 0, Point.po_expire_date < now)
+                    .group_by(Point.mb_id)
+                ).all())
+        for mb_id, expire_point in expire_points.items():
+            if expire_point and expire_point > 0:
+                point_sums[mb_id] = point_sums.get(mb_id, 0) - expire_point
+
+        # 차감 내역 일괄 추가
+        values = []
+        for mb_id, point, content in penalties:
+            if mb_id not in existing_ids:
+                continue
+            point_sums[mb_id] = point_sums.get(mb_id, 0) + point
+            values.append({
+                "mb_id": mb_id,
+                "po_datetime": now,
+                "po_content": content,
+                "po_point": point,
+                "po_use_point": 0,
+                "po_mb_point": point_sums[mb_id],
+                "po_expired": 1,
+                "po_expire_date": now,
+                "po_rel_table": "",
+                "po_rel_id": "",
+                "po_rel_action": "",
+            })
+        if values:
+            self.db.execute(insert(Point), values)
+
+        # 회원 포인트 업데이트
+        for chunk in self._chunks(list(existing_ids)):
+            self.db.execute(
+                update(Member)
+                .where(Member.mb_id.in_(chunk))
+                .values(mb_point=case(
+                    {mb_id: int(point_sums.get(mb_id, 0)) for mb_id in chunk}, value=Member.mb_id))
+                .execution_options(synchronize_session=False)
+            )
+
+    def _chunks(self, items: list):
+        for index in range(0, len(items), self.chunk_size):
+            yield items[index:index + self.chunk_size]
+
+
 def write_search_filter(
         request: Request,
         model: WriteBaseModel,
@@ -891,15 +1605,45 @@ def get_next_num(bo_table: str) -> int:
     """
     게시판의 다음글 번호를 얻는다.
     """
-    try:
-        db = DBConnect().sessionLocal()
+    return reserve_write_nums(bo_table, 1)
 
-        write_model = dynamic_create_write_table(bo_table)
-        min_wr_num = db.scalar(select(func.coalesce(func.min(write_model.wr_num), 0)))
 
-        return min_wr_num - 1
-    finally:
-        db.close()
+def reserve_write_nums(bo_table: str, count: int = 1) -> int:
+    """게시판의 게시글 번호(wr_num)를 count개 만큼 예약한다.
+    - 번호 할당 테이블의 행을 UPDATE로 먼저 잠근 뒤 읽으므로 동시에 요청해도 번호가 중복되지 않는다.
+    - 예약된 번호는 반환값부터 1씩 감소하며, 트랜잭션이 취소되어도 재사용하지 않는다.
+
+    Args:
+        bo_table (str): 게시판 테이블명
+        count (int, optional): 예약할 번호 개수. Defaults to 1.
+
+    Returns:
+        int: 예약된 번호 중 첫번째 번호
+    """
+    with DBConnect().sessionLocal() as db:
+        for _ in range(2):
+            result = db.execute(
+                update(WriteNum)
+                .where(WriteNum.bo_table == bo_table)
+                .values(wn_num=WriteNum.wn_num - count)
+            )
+            if result.rowcount:
+                wn_num = db.scalar(select(WriteNum.wn_num).where(WriteNum.bo_table == bo_table))
+                db.commit()
+                return wn_num + count - 1
+
+            # 할당 테이블에 행이 없으면 게시판의 최소 wr_num으로 초기화
+            write_model = dynamic_create_write_table(bo_table)
+            min_wr_num = db.scalar(select(func.coalesce(func.min(write_model.wr_num), 0)))
+            try:
+                db.add(WriteNum(bo_table=bo_table, wn_num=min_wr_num - count))
+                db.commit()
+                return min_wr_num - 1
+            except IntegrityError:
+                # 다른 요청에서 먼저 초기화한 경우 UPDATE로 다시 할당
+                db.rollback()
+
+    raise AlertException(f"{bo_table} 게시판의 글번호를 할당하지 못했습니다.", 500)
 
 
 def get_list(request: Request, write: WriteBaseModel, board_config: BoardConfig, subject_len: int = 0):
@@ -1105,26 +1849,7 @@ def get_list_thumbnail(request: Request, board: Board, write: WriteBaseModel, th
     else:
         # TODO : 게시글의 본문정보를 캐시된 데이터에서 조회한다.
         # 게시글 본문
-        editor_images = get_editor_image(write.wr_content, view=False)
-        for image in editor_images:
-            try:
-                ext = image.split(".")[-1].lower()
-                
-                # 에디터로 삽입된 이미지의 주소는 웹 경로이기에 os.path로 체크할 수 있도록 경로를 변경한다.
-                # 외부 이미지도 썸네일로 보여지기를 희망하는 경우 썸네일 조건 및 생성 로직을 수정해야한다.
-                image = "./data/editor/" + image.split("/data/editor/")[1]
-                
-                # image경로의 파일이 존재하고 이미지파일인지 확인
-                if (os.path.exists(image)
-                        and os.path.isfile(image)
-                        and os.path.getsize(image) > 0
-                        and ext in config.cf_image_extension):
-                    source_file = image
-                    break
-
-            except Exception as e:
-                print(e)
-                continue
+        source_file = get_editor_thumbnail_source(write.wr_content, config.cf_image_extension)
 
     # 섬네일 생성
     if source_file:
@@ -1139,6 +1864,38 @@ def get_list_thumbnail(request: Request, board: Board, write: WriteBaseModel, th
     return result
 
 
+def get_editor_thumbnail_source(content: str, image_extension: str) -> Optional[str]:
+    """본문에 에디터로 삽입된 이미지 중 섬네일로 사용할 첫번째 이미지 경로를 반환한다.
+
+    Args:
+        content (str): 게시글 본문
+        image_extension (str): 이미지 확장자 설정 (ex: gif|jpg|png)
+
+    Returns:
+        Optional[str]: 이미지 파일 경로 (없으면 None)
+    """
+    for image in get_editor_image(content, view=False):
+        try:
+            ext = image.split(".")[-1].lower()
+
+            # 에디터로 삽입된 이미지의 주소는 웹 경로이기에 os.path로 체크할 수 있도록 경로를 변경한다.
+            # 외부 이미지도 썸네일로 보여지기를 희망하는 경우 썸네일 조건 및 생성 로직을 수정해야한다.
+            image = "./data/editor/" + image.split("/data/editor/")[1]
+
+            # image경로의 파일이 존재하고 이미지파일인지 확인
+            if (os.path.exists(image)
+                    and os.path.isfile(image)
+                    and os.path.getsize(image) > 0
+                    and ext in image_extension):
+                return image
+
+        except Exception as e:
+            print(e)
+            continue
+
+    return None
+
+
 # 본문의 이미지 태그에 width를 강제로 지정하는 필터함수
 def set_image_width(content: str, width: str = None) -> str:
     """본문의 이미지 태그에 width를 강제로 지정하는 필터함수
@@ -1155,13 +1912,15 @@ def set_image_width(content: str, width: str = None) -> str:
     return content
 
 
-def delete_write(request: Request, bo_table: str, origin_write: WriteBaseModel) -> bool:
+def delete_write(request: Request, bo_table: str, origin_write: WriteBaseModel,
+                 background_tasks: BackgroundTasks = None) -> bool:
     """게시글을 삭제한다.
 
     Args:
         request (Request): request 객체
         bo_table (str): 게시판 코드
         write (WriteBaseModel): 게시글 object
+        background_tasks (BackgroundTasks, optional): 첨부파일 삭제를 실행할 백그라운드 작업. Defaults to None.
 
     Returns:
         bool: 결과
@@ -1208,59 +1967,20 @@ def delete_write(request: Request, bo_table: str, origin_write: WriteBaseModel)
     if not board_config.is_delete_by_comment(origin_write.wr_id):
         raise AlertException(f"이 글과 관련된 댓글이 {board.bo_count_delete}건 이상 존재하므로 삭제 할 수 없습니다.", 403)
 
-    # 원글 + 댓글
-    delete_write_count = 0
-    delete_comment_count = 0
-    writes = db.scalars(
-        select(write_model)
-        .filter_by(wr_parent=origin_write.wr_id)
-        .order_by(write_model.wr_id)
-    ).all()
-    for write in writes:
-        # 원글 삭제
-        if not write.wr_is_comment:
-            # 원글 포인트 삭제
-            if not delete_point(request, write.mb_id, board.bo_table, write.wr_id, "쓰기"):
-                insert_point(request, write.mb_id, board.bo_write_point * (-1), f"{board.bo_subject} {write.wr_id} 글 삭제")
-            # 파일+섬네일 삭제
-            BoardFileManager(board, write.wr_id).delete_board_files()
-
-            delete_write_count += 1
-            # TODO: 에디터 섬네일 삭제
-        else:
-            # 댓글 포인트 삭제
-            if not delete_point(request, write.mb_id, board.bo_table, write.wr_id, "댓글"):
-                insert_point(request, write.mb_id, board.bo_comment_point * (-1), f"{board.bo_subject} {write.wr_id} 댓글 삭제")
-
-            delete_comment_count += 1
-
-    # 원글+댓글 삭제
-    db.execute(delete(write_model).filter_by(wr_parent=origin_write.wr_id))
-
-    # 최근 게시물 삭제
-    db.execute(delete(BoardNew).where(
-        BoardNew.bo_table == bo_table,
-        BoardNew.wr_parent == origin_write.wr_id
-    ))
-
-    # 스크랩 삭제
-    db.execute(delete(Scrap).filter_by(
-        bo_table=bo_table,
-        wr_id=origin_write.wr_id
-    ))
-
-    # 공지사항 삭제
-    board.bo_notice = board_config.set_board_notice(origin_write.wr_id, False)
-
-    # 게시글 갯수 업데이트
-    board.bo_count_write -= delete_write_count
-    board.bo_count_comment -= delete_comment_count
-
-    db.commit()
+    # 원글 + 댓글 및 관련 데이터 일괄 삭제
+    delete_manager = BoardDeleteManager(request, db)
+    delete_manager.delete([(bo_table, origin_write.wr_id)])
     db.close()
 
+    # 첨부파일 삭제
+    if background_tasks:
+        background_tasks.add_task(delete_manager.unlink_files)
+    else:
+        delete_manager.unlink_files()
+
     # 최신글 캐시 삭제
     FileCache().delete_prefix(f'latest-{bo_table}')
+    purge_board_pages(bo_table)
 
     return True
 
@@ -1332,6 +2052,56 @@ def set_write_delay(request: Request):
         request.session["ss_write_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+def format_datetime(wr_datetime: datetime):
+    """
+    당일인 경우 시간표시
+    """
+    current_datetime = datetime.now()
+
+    if wr_datetime.date() == current_datetime.date():
+        return wr_datetime.strftime("%H:%M")
+    else:
+        return wr_datetime.strftime("%y-%m-%d")
+
+
+def get_board_new_values(db: Session, bo_table: str, write: WriteBaseModel) -> dict:
+    """최신글 테이블에 함께 저장할 게시글 정보를 반환하는 함수
+
+    Args:
+        db (Session): 데이터베이스 세션
+        bo_table (str): 게시판 코드
+        write (WriteBaseModel): 게시글 모델
+
+    Returns:
+        dict: 제목(댓글은 내용), 작성자 이름, 댓글/비밀글 여부, 섬네일 원본 경로
+    """
+    is_comment = bool(write.wr_is_comment)
+    subject = (write.wr_content or "")[:100] if is_comment else (write.wr_subject or "")
+
+    thumbnail_source = ""
+    if not is_comment:
+        image_extension = db.scalar(select(Config.cf_image_extension)) or ""
+        board_files = db.scalars(
+            select(BoardFile)
+            .where(BoardFile.bo_table == bo_table, BoardFile.wr_id == write.wr_id)
+            .order_by(BoardFile.bf_no)
+        ).all()
+        images = [f for f in board_files if f.bf_file and f.bf_source.split(".")[-1] in image_extension]
+        if images:
+            thumbnail_source = images[0].bf_file
+        else:
+            thumbnail_source = get_editor_thumbnail_source(write.wr_content, image_extension) or ""
+
+    return {
+        "bn_datetime": write.wr_datetime or datetime.now(),
+        "bn_subject": subject[:255],
+        "bn_name": (write.wr_name or "")[:255],
+        "bn_is_comment": int(is_comment),
+        "bn_is_secret": int("secret" in (write.wr_option or "")),
+        "bn_thumbnail": thumbnail_source[:255],
+    }
+
+
 def insert_board_new(bo_table: str, write: WriteBaseModel) -> None:
     """최신글 테이블 등록 함수
 
@@ -1347,11 +2117,111 @@ def insert_board_new(bo_table: str, write: WriteBaseModel) -> None:
             wr_id=write.wr_id,
             wr_parent=write.wr_parent,
             mb_id=write.mb_id,
+            **get_board_new_values(db, bo_table, write)
         )
     )
     db.commit()
     db.close()
 
+    # 글, 댓글 현황 집계
+    add_board_activity(bo_table, write)
+
+
+def update_board_new(bo_table: str, write: WriteBaseModel) -> None:
+    """게시글/댓글 수정 시 최신글 테이블의 게시글 정보를 갱신하는 함수
+
+    Args:
+        bo_table (str): 게시판 코드
+        write (WriteBaseModel): 게시글 모델
+    """
+    with DBConnect().sessionLocal() as db:
+        values = get_board_new_values(db, bo_table, write)
+        # 작성일시는 변경하지 않는다.
+        del values["bn_datetime"]
+        db.execute(
+            update(BoardNew)
+            .where(BoardNew.bo_table == bo_table, BoardNew.wr_id == write.wr_id)
+            .values(**values)
+        )
+        db.commit()
+
+
+def fill_board_new(db: Session) -> int:
+    """게시글 정보가 채워지지 않은 최신글 행을 게시판 테이블에서 채우는 함수
+    - 이전 버전에서 등록된 최신글 행에 사용한다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+
+    Returns:
+        int: 채운 행 수
+    """
+    board_news = db.scalars(
+        select(BoardNew).join(BoardNew.board).where(BoardNew.bn_subject.is_(None))
+    ).all()
+    writes = load_writes(db, [(new.bo_table, new.wr_id) for new in board_news])
+
+    for new in board_news:
+        write = writes.get((new.bo_table, new.wr_id))
+        if write:
+            for key, value in get_board_new_values(db, new.bo_table, write).items():
+                setattr(new, key, value)
+        else:
+            new.bn_subject = ""
+    db.commit()
+
+    return len(board_news)
+
+
+def render_latest_feed(request: Request, skin_name: str = 'feed', gr_id: str = '',
+                       rows: int = 10, subject_len: int = 40):
+    """전체 게시판(또는 그룹)의 최신글 목록 HTML 출력
+    - 최신글 테이블만 조회하므로 게시판 수와 관계없이 한 번의 쿼리로 처리한다.
+    - 스킨에서는 new.bn_thumbnail(섬네일 원본 경로)을 thumbnail()로 사용할 수 있다.
+
+    Args:
+        request (Request): FastAPI Request 객체
+        skin_name (str, optional): 스킨 경로. Defaults to 'feed'.
+        gr_id (str, optional): 게시판 그룹 아이디. Defaults to ''.
+        rows (int, optional): 노출 게시글 수. Defaults to 10.
+        subject_len (int, optional): 제목길이 제한. Defaults to 40.
+
+    Returns:
+        str: 최신글 HTML
+    """
+    templates = UserTemplates()
+
+    query = (
+        select(BoardNew, Board.bo_subject)
+        .join(BoardNew.board)
+        .where(BoardNew.bn_is_comment == 0, Board.bo_list_level <= get_member_level(request))
+        .order_by(BoardNew.bn_id.desc())
+        .limit(rows)
+    )
+    if gr_id:
+        query = query.where(Board.gr_id == gr_id)
+
+    with DBConnect().sessionLocal() as db:
+        results = db.execute(query).all()
+
+    board_news = []
+    for new, bo_subject in results:
+        new.bo_subject = bo_subject
+        subject = new.bn_subject or ""
+        new.subject = subject[:subject_len] + "..." if subject_len and len(subject) > subject_len else subject
+        new.name = cut_name(request, new.bn_name)
+        new.datetime = format_datetime(new.bn_datetime)
+        new.link = f"/board/{new.bo_table}/{new.wr_id}"
+        board_news.append(new)
+
+    context = {
+        "request": request,
+        "board_news": board_news,
+        "gr_id": gr_id,
+    }
+    temp = templates.TemplateResponse(f"latest/{skin_name}.html", context)
+    return temp.body.decode("utf-8")
+
 
 def render_latest_posts(request: Request, skin_name: str = 'basic', bo_table: str='',
                         rows: int = 10, subject_len: int = 40):
@@ -0,0 +1,144 @@
+"""테이블 의존성 기반 캐시 레지스트리
+
+- 캐시 함수는 의존하는 테이블을 선언하고, 관리자 등에서 테이블을 변경하면 해당 테이블을 무효화한다.
+- 무효화는 data/cache/version/{table} 파일의 버전값으로 공유되므로 모든 워커(프로세스)가 관찰할 수 있다.
+- 버전 파일은 VERSION_CHECK_INTERVAL 초에 한 번만 확인하므로 요청마다 파일을 읽지 않는다.
+- 버전값은 "{무효화 시각}-{uuid}" 형식이므로 get_version_time()으로 마지막 변경 시각을 알 수 있다.
+"""
+import functools
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Sequence
+
+from cachetools import LRUCache, TTLCache
+from cachetools.keys import hashkey
+
+CACHE_VERSION_DIR = os.path.join("data", "cache", "version")
+VERSION_CHECK_INTERVAL = 1.0  # 다른 워커의 무효화를 확인하는 주기(초)
+
+
+class CacheRegistry():
+    """테이블 의존성 기반 캐시 레지스트리 클래스"""
+
+    def __init__(self, version_dir: str = CACHE_VERSION_DIR):
+        self.version_dir = version_dir
+        self._versions: Dict[str, str] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._loaders: Dict[str, Sequence[str]] = {}
+
+    def cached(self,
+               tables: Sequence[str],
+               ttl: Optional[float] = None,
+               maxsize: int = 128) -> Callable:
+        """테이블에 의존하는 캐시 함수 데코레이터
+
+        Args:
+            tables (Sequence[str]): 의존하는 테이블 이름 목록
+            ttl (float, optional): 캐시 유지 시간(초). None이면 무효화 전까지 유지. Defaults to None.
+            maxsize (int, optional): 최대 캐시 수. Defaults to 128.
+
+        Returns:
+            Callable: 데코레이터
+        """
+        tables = tuple(tables)
+
+        def decorator(func):
+            cache = TTLCache(maxsize, ttl) if ttl else LRUCache(maxsize)
+            lock = threading.Lock()
+            seen_versions = [None]
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                versions = self.get_versions(tables)
+                key = hashkey(*args, **kwargs)
+                with lock:
+                    if seen_versions[0] != versions:
+                        cache.clear()
+                        seen_versions[0] = versions
+                    try:
+                        return cache[key]
+                    except KeyError:
+                        pass
+
+                value = func(*args, **kwargs)
+                with lock:
+                    if seen_versions[0] == versions:
+                        cache[key] = value
+                return value
+
+            def cache_clear():
+                with lock:
+                    cache.clear()
+
+            wrapper.cache_clear = cache_clear
+            wrapper.tables = tables
+            self._loaders[func.__qualname__] = tables
+            return wrapper
+
+        return decorator
+
+    def get_versions(self, tables: Sequence[str]) -> tuple:
+        """테이블별 현재 버전을 반환
+
+        Args:
+            tables (Sequence[str]): 테이블 이름 목록
+
+        Returns:
+            tuple: 테이블 버전 목록
+        """
+        now = time.monotonic()
+        with self._lock:
+            for table in tables:
+                if now - self._checked_at.get(table, 0) >= VERSION_CHECK_INTERVAL:
+                    self._versions[table] = self._read_version(table)
+                    self._checked_at[table] = now
+            return tuple(self._versions[table] for table in tables)
+
+    def invalidate(self, *tables: str) -> None:
+        """테이블에 의존하는 모든 캐시를 무효화
+        - 현재 워커는 즉시, 다른 워커는 VERSION_CHECK_INTERVAL 이내에 반영된다.
+
+        Args:
+            tables (str): 변경된 테이블 이름
+        """
+        os.makedirs(self.version_dir, exist_ok=True)
+        with self._lock:
+            for table in tables:
+                version = f"{int(time.time())}-{uuid.uuid4().hex}"
+                path = os.path.join(self.version_dir, table)
+                temp_path = f"{path}.{version}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(version)
+                os.replace(temp_path, path)
+
+                self._versions[table] = version
+                self._checked_at[table] = time.monotonic()
+
+    def get_version_time(self, version: str) -> Optional[float]:
+        """버전값의 무효화 시각(epoch)을 반환
+        - 무효화된 적이 없거나 이전 형식의 버전이면 None을 반환한다.
+        """
+        timestamp, _, _ = version.partition("-")
+        return float(timestamp) if timestamp.isdigit() else None
+
+    def get_loaders(self) -> Dict[str, Sequence[str]]:
+        """등록된 캐시 함수와 의존 테이블 목록을 반환"""
+        return dict(self._loaders)
+
+    def _read_version(self, table: str) -> str:
+        try:
+            with open(os.path.join(self.version_dir, table), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+
+cache_registry = CacheRegistry()
+
+
+def invalidate_tables(*tables: str) -> None:
+    """테이블에 의존하는 캐시를 모든 워커에서 무효화"""
+    cache_registry.invalidate(*tables)
@@ -1,4 +1,5 @@
 import base64
+import functools
 import hashlib
 import json
 import logging
@@ -6,25 +7,22 @@ import os
 import random
 import re
 import shutil
-import smtplib
+import threading
 import httpx
 from datetime import datetime, timedelta, date
-from email.header import Header
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.utils import formataddr
 from time import sleep
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlencode
 
-from cachetools import cached, LFUCache, TTLCache
+from cachetools import cached, TTLCache
 from dotenv import load_dotenv
 from fastapi import Request, UploadFile
 from markupsafe import Markup, escape
 from PIL import Image, ImageOps, UnidentifiedImageError
 from passlib.context import CryptContext
-from sqlalchemy import Index, asc, case, desc, func, select, delete, between, exists, cast, String, DateTime
+from sqlalchemy import Index, asc, case, desc, func, select, delete, exists, cast, String, DateTime
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, configure_mappers
 from starlette.datastructures import URL
 from user_agents import parse
 
@@ -36,6 +34,8 @@ from core.models import (
 from core.plugin import get_admin_menu_id_by_path
 from lib.captcha.recaptch_v2 import ReCaptchaV2
 from lib.captcha.recaptch_inv import ReCaptchaInvisible
+from lib.cache_registry import cache_registry
+from lib.mail_queue import enqueue_mail
 
 
 load_dotenv()
@@ -61,9 +61,102 @@ def verify_password(plain_password, hashed_passwd):
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     return pwd_context.verify(plain_password, hashed_passwd)  
 
-# 동적 모델 캐싱: 모델이 이미 생성되었는지 확인하고, 생성되지 않았을 경우에만 새로 생성하는 방법입니다. 
-# 이를 위해 간단한 전역 딕셔너리를 사용하여 이미 생성된 모델을 추적할 수 있습니다.
-_created_models = {}
+class WriteModelRegistry():
+    """게시판별 동적 모델 레지스트리 클래스
+    - 게시판(bo_table)별 동적 모델을 한 번만 생성하여 재사용한다.
+    - 동시에 처음 요청되어도 모델이 중복 생성되지 않도록 잠금을 사용한다.
+    - 서버 시작 시 전체 게시판의 모델을 미리 생성(warm)할 수 있다.
+    """
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.RLock()
+
+    def get(self, bo_table: str, create_table: bool = False) -> WriteBaseModel:
+        """게시판 동적 모델을 반환한다. 없으면 생성한다.
+
+        Args:
+            bo_table (str): 게시판 테이블명 (table_prefix + 'write_' 제외)
+            create_table (bool, optional): 데이터베이스 테이블 생성 여부. Defaults to False.
+
+        Returns:
+            WriteBaseModel: 게시판 동적 모델
+        """
+        bo_table = str(bo_table)
+        model = self._models.get(bo_table)
+        if model is None:
+            with self._lock:
+                model = self._models.get(bo_table)
+                if model is None:
+                    model = self._create_model(bo_table)
+                    self._models[bo_table] = model
+
+        # 게시판 추가시 한번만 테이블 생성
+        if create_table:
+            model.__table__.create(bind=DBConnect().engine, checkfirst=True)
+        return model
+
+    def warm(self, bo_tables: List[str]) -> int:
+        """게시판 동적 모델을 한 번에 미리 생성한다.
+
+        Args:
+            bo_tables (List[str]): 게시판 테이블명 목록
+
+        Returns:
+            int: 레지스트리에 등록된 모델 수
+        """
+        with self._lock:
+            for bo_table in bo_tables:
+                self.get(bo_table)
+            # 매퍼 설정을 미리 완료하여 첫 쿼리에서 설정하지 않도록 한다.
+            configure_mappers()
+            return len(self._models)
+
+    def remove(self, bo_table: str) -> None:
+        """게시판 동적 모델을 레지스트리와 메타데이터에서 제거한다.
+        - 같은 이름의 게시판을 다시 생성할 때 기존 테이블 정의를 재사용하지 않도록 한다.
+
+        Args:
+            bo_table (str): 게시판 테이블명
+        """
+        with self._lock:
+            model = self._models.pop(str(bo_table), None)
+            if model is not None:
+                WriteBaseModel.metadata.remove(model.__table__)
+
+    def _create_model(self, bo_table: str) -> WriteBaseModel:
+        class_name = "Write" + bo_table.capitalize()
+        db_connect = DBConnect()
+        return type(
+            class_name,
+            (WriteBaseModel,),
+            {
+                "__tablename__": db_connect.table_prefix + 'write_' + bo_table,
+                "__table_args__": (
+                    Index(f'idx_wr_num_reply_{bo_table}', 'wr_num', 'wr_reply'),
+                    Index(f'idex_wr_is_comment_{bo_table}', 'wr_is_comment'),
+                    {
+                        "extend_existing": True,
+                        **MySQLCharsetMixin().__table_args__
+                    },
+                ),
+            }
+        )
+
+
+write_model_registry = WriteModelRegistry()
+
+
+def write_model_for(bo_table: str) -> WriteBaseModel:
+    """게시판 동적 모델을 반환하는 함수
+
+    Args:
+        bo_table (str): 게시판 테이블명
+
+    Returns:
+        WriteBaseModel: 게시판 동적 모델
+    """
+    return write_model_registry.get(bo_table)
+
 
 # 동적 게시판 모델 생성
 def dynamic_create_write_table(
@@ -74,37 +167,58 @@ def dynamic_create_write_table(
     WriteBaseModel 로 부터 게시판 테이블 구조를 복사하여 동적 모델로 생성하는 함수
     인수의 table_name 에서는 table_prefix + 'write_' 를 제외한 테이블 이름만 입력받는다.
     Create Dynamic Write Table Model from WriteBaseModel
+    - 생성된 모델은 write_model_registry 에서 관리한다.
     '''
-    # 이미 생성된 모델 반환
-    if table_name in _created_models:
-        return _created_models[table_name]
-    
-    if isinstance(table_name, int):
-        table_name = str(table_name)
-    
-    class_name = "Write" + table_name.capitalize()
-    db_connect = DBConnect()
-    DynamicModel = type(
-        class_name, 
-        (WriteBaseModel,), 
-        {   
-            "__tablename__": db_connect.table_prefix + 'write_' + table_name,
-            "__table_args__": (
-                Index(f'idx_wr_num_reply_{table_name}', 'wr_num', 'wr_reply'),
-                Index(f'idex_wr_is_comment_{table_name}', 'wr_is_comment'),
-                {
-                    "extend_existing": True,
-                    **MySQLCharsetMixin().__table_args__
-                },
-            ),
-        }
-    )
-    # 게시판 추가시 한번만 테이블 생성
-    if (create_table):
-        DynamicModel.__table__.create(bind=db_connect.engine, checkfirst=True)
-    # 생성된 모델 캐싱
-    _created_models[table_name] = DynamicModel
-    return DynamicModel
+    return write_model_registry.get(table_name, create_table)
+
+
+# IN 절 1회에 포함할 최대 항목 수
+BATCH_LOAD_CHUNK_SIZE = 500
+
+
+def load_by_keys(db: Session, column, keys: Iterable) -> dict:
+    """컬럼 값 목록에 해당하는 행을 IN 쿼리로 한 번에 조회하는 함수
+    - 목록 화면에서 행마다 db.get()으로 조회하거나 관계를 지연 로딩하지 않도록 사용한다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        column (InstrumentedAttribute): 조회 기준 컬럼 (ex: Member.mb_id)
+        keys (Iterable): 조회할 값 목록
+
+    Returns:
+        dict: {컬럼 값: 모델 객체}
+    """
+    model = column.class_
+    keys = list(dict.fromkeys(key for key in keys if key is not None))
+    rows = {}
+    for index in range(0, len(keys), BATCH_LOAD_CHUNK_SIZE):
+        chunk = keys[index:index + BATCH_LOAD_CHUNK_SIZE]
+        for row in db.scalars(select(model).where(column.in_(chunk))):
+            rows[getattr(row, column.key)] = row
+    return rows
+
+
+def load_writes(db: Session, refs: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], WriteBaseModel]:
+    """여러 게시판의 게시글을 게시판별 IN 쿼리로 한 번에 조회하는 함수
+    - 존재하는 게시판의 게시글만 전달해야 한다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        refs (Iterable[Tuple[str, int]]): (게시판 테이블명, 게시글 아이디) 목록
+
+    Returns:
+        Dict[Tuple[str, int], WriteBaseModel]: {(게시판 테이블명, 게시글 아이디): 게시글}
+    """
+    grouped = {}
+    for bo_table, wr_id in refs:
+        grouped.setdefault(bo_table, []).append(wr_id)
+
+    writes = {}
+    for bo_table, wr_ids in grouped.items():
+        write_model = dynamic_create_write_table(bo_table)
+        for wr_id, write in load_by_keys(db, write_model.wr_id, wr_ids).items():
+            writes[(bo_table, wr_id)] = write
+    return writes
 
 
 def session_member_key(request: Request, member: Member):
@@ -326,6 +440,38 @@ def record_visit(request: Request):
     db.close()
 
 
+def get_request_cache(request: Request) -> dict:
+    """요청 범위 캐시를 반환하는 함수
+    - request.state 에 저장되므로 요청이 끝나면 함께 사라진다.
+    - 중첩 템플릿 렌더링에서도 같은 요청이면 같은 캐시를 사용한다.
+
+    Args:
+        request (Request): FastAPI Request 객체
+
+    Returns:
+        dict: 요청 범위 캐시
+    """
+    cache = getattr(request.state, "context_cache", None)
+    if cache is None:
+        cache = {}
+        request.state.context_cache = cache
+    return cache
+
+
+def request_cached(func):
+    """첫번째 인자(request) 범위에서 함수 결과를 한 번만 계산하는 데코레이터"""
+    @functools.wraps(func)
+    def wrapper(request: Request, *args, **kwargs):
+        cache = get_request_cache(request)
+        key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = func(request, *args, **kwargs)
+        return cache[key]
+
+    return wrapper
+
+
+@request_cached
 def render_visit_statistics(request: Request):
     """방문자 수 출력"""
     # Lazy import
@@ -516,7 +662,7 @@ def insert_popular(request: Request, fields: str, word: str):
         print(f"인기검색어 입력 오류: {e}")
 
 
-@cached(LFUCache(maxsize=1))
+@cache_registry.cached(tables=[Poll.__tablename__], maxsize=1)
 def get_recent_poll():
     """
     최근 설문조사 정보 1건을 가져오는 함수
@@ -530,36 +676,31 @@ def get_recent_poll():
     db.close()
     return poll
 
-@cached(LFUCache(maxsize=128))
+@cache_registry.cached(tables=[Menu.__tablename__], maxsize=1)
 def get_menus():
     """사용자페이지 메뉴 조회 함수
+    - 1, 2단계 메뉴를 한 번에 조회한 후 트리로 구성한다.
 
     Returns:
         list: 자식메뉴가 포함된 메뉴 list
     """
     db = DBConnect().sessionLocal()
-    menus = []
-    # 부모메뉴 조회
-    parent_menus = db.scalars(
+    rows = db.scalars(
         select(Menu)
-        .where(func.char_length(Menu.me_code) == 2)
+        .where(func.char_length(Menu.me_code).in_([2, 4]))
         .order_by(Menu.me_order)
     ).all()
+    db.close()
 
-    for menu in parent_menus:
-        parent_code = menu.me_code
-
-        # 자식 메뉴 조회
-        child_menus = db.scalars(
-            select(Menu).where(
-                func.char_length(Menu.me_code) == 4,
-                func.substr(Menu.me_code, 1, 2) == parent_code
-            ).order_by(Menu.me_order)
-        ).all()
+    menus = []
+    children = {}
+    for menu in rows:
+        if len(menu.me_code) == 2:
+            menu.sub = children.setdefault(menu.me_code, [])
+            menus.append(menu)
+        else:
+            children.setdefault(menu.me_code[:2], []).append(menu)
 
-        menu.sub = child_menus
-        menus.append(menu)
-    db.close()
     return menus
 
 
@@ -790,15 +931,10 @@ class FileCache():
                 os.remove(os.path.join(self.cache_dir, file))
 
 
-SMTP_SERVER = os.getenv("SMTP_SERVER", "localhost")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 25))
-SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-
-
 def mailer(from_email: str, to_email: str, subject: str, body: str,
            from_name: str = None, to_name: str = None) -> None:
     """메일 발송 함수
+    - 메일은 발송 대기열에 추가되며, 메일 발송 작업자(lib.mail_queue)가 실제로 발송합니다.
 
     Args:
         from_email (str): 보내는 사람 이메일
@@ -807,46 +943,11 @@ def mailer(from_email: str, to_email: str, subject: str, body: str,
         body (str): 내용
         from_name (str, optional): 보내는 사람 이름. Defaults to None.
         to_name (str, optional): 받는 사람 이름. Defaults to None.
-
-    Raises:
-        SMTPAuthenticationError: SMTP 인증정보가 잘못되었을 때
-        SMTPServerDisconnected: SMTP 서버에 연결하지 못했거나 연결이 끊어졌을 때
-        SMTPException: 메일을 보내는 중에 오류가 발생했을 때
-        Exception: 기타 오류
     """
     try:
-        # Daum, Naver 메일은 SMTP_SSL을 사용합니다.
-        if SMTP_PORT == 465:
-            server = smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT, timeout=10)
-        else: # port: 587
-            server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=10)
-            server.starttls()
-
-        if SMTP_USERNAME and SMTP_PASSWORD:
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-
-        msg = MIMEMultipart()
-        msg['From'] = formataddr((str(Header(from_name, 'utf-8')), from_email))
-        msg['To'] = formataddr((str(Header(to_name, 'utf-8')), to_email))
-        msg['Subject'] = subject
-        # Assuming body is HTML, if not change 'html' to 'plain'
-        msg.attach(MIMEText(body, 'html'))
-
-        server.sendmail(from_email, to_email, msg.as_string())
-
-    except smtplib.SMTPAuthenticationError as e:
-        print(f"SMTP 인증정보가 잘못되었습니다. {e}")
-    except smtplib.SMTPServerDisconnected as e:
-        print(f"SMTP 서버에 연결하지 못했거나 연결이 끊어졌습니다. {e}")
-    except smtplib.SMTPException as e:
-        print(f"메일을 보내는 중에 오류가 발생했습니다. {e}")
+        enqueue_mail(from_email, to_email, subject, body, from_name, to_name)
     except Exception as e:
-        print(e)
-    finally:
-        try:
-            server.quit()
-        except Exception as e:
-            pass
+        print(f"메일을 발송 대기열에 추가하지 못했습니다. {e}")
 
 
 def get_admin_email(request: Request):
@@ -885,18 +986,18 @@ def is_none_datetime(input_date: Union[date, str]) -> bool:
 
     return False
 
-@cached(LFUCache(maxsize=256))
-def get_newwins(device: str):
+@cache_registry.cached(tables=[NewWin.__tablename__], ttl=600, maxsize=8)
+def get_device_newwins(device: str) -> list:
     """
-    레이어 팝업 목록 조회
+    디바이스별 종료되지 않은 레이어 팝업 목록 조회
+    - 노출 시간은 get_newwins에서 호출 시점 기준으로 확인한다.
     """
     db = DBConnect().sessionLocal()
 
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     current_division = "comm" # comm, both, shop
     newwins = db.scalars(
         select(NewWin).where(
-            between(now, NewWin.nw_begin_time, NewWin.nw_end_time),
+            NewWin.nw_end_time >= datetime.now(),
             NewWin.nw_device.in_(["both", device]),
             NewWin.nw_division.in_(["both", current_division]),
         ).order_by(NewWin.nw_id)
@@ -907,6 +1008,18 @@ def get_newwins(device: str):
     return newwins
 
 
+def get_newwins(device: str) -> list:
+    """
+    현재 노출 중인 레이어 팝업 목록 조회
+    """
+    now = datetime.now()
+    return [
+        newwin for newwin in get_device_newwins(device)
+        if isinstance(newwin.nw_begin_time, datetime)
+        and newwin.nw_begin_time <= now <= newwin.nw_end_time
+    ]
+
+
 def get_newwins_except_cookie(request: Request):
     """쿠키에 저장된 팝업을 제외한 레이어 팝업 목록을 반환하는 함수"""
     newwins = get_newwins(request.state.device)
@@ -1147,15 +1260,18 @@ def delete_old_records():
             )
             print("쪽지 삭제 기준일 : ", base_date, f"{result.rowcount}건 삭제")
 
+        db.commit()
+
         # 탈퇴회원 자동 삭제
         if config.cf_leave_day > 0:
-            # TODO: 회원삭제 처리 추가
-            # query = update(Member).where(Member.mb_leave_date < datetime.now() - timedelta(days=config.cf_leave_day))
-            # data = {}
-            # result = db.execute(query, data)
-            # print("회원 삭제 기준일 : ", datetime.now() - timedelta(days=config.cf_leave_day), f"{result}건 삭제")
-            pass
-        db.commit()
+            from lib.member_lib import MemberPurgeManager
+
+            purge_manager = MemberPurgeManager(db, config)
+            leave_ids = purge_manager.get_leave_member_ids(config.cf_leave_day)
+            purged_ids = purge_manager.purge(leave_ids)
+            for _ in purge_manager.delete_files(purged_ids):
+                pass
+            print("탈퇴회원 삭제 기준일 : ", today - timedelta(days=config.cf_leave_day), f"{len(purged_ids)}건 삭제")
     except Exception as e:
         print(e)
     finally:
@@ -1343,11 +1459,29 @@ def set_url_query_params(url: Union[str, URL], query_params: Any) -> str:
     return url.replace_query_params(**query_params).__str__()
 
 
+@request_cached
 def get_current_login_count(request: Request) -> tuple:
-    """현재 접속자수를 반환하는 함수"""
+    """현재 접속자수를 반환하는 함수
+    - 요청 내에서는 한 번만 조회하고, 프로세스 내에서는 짧은 시간 동안 캐시한다.
+    """
     config = request.state.config
-
     login_minute = getattr(config, "cf_login_minutes", 10)
+
+    return count_current_login(config.cf_admin, login_minute)
+
+
+@cached(TTLCache(maxsize=16, ttl=10))
+def count_current_login(admin_id: str, login_minute: int) -> tuple:
+    """현재 접속자수(전체, 회원)를 조회하는 함수
+    - 즉시 반영이 필요할 경우 count_current_login.cache_clear()를 호출한다.
+
+    Args:
+        admin_id (str): 최고관리자 아이디 (집계 제외)
+        login_minute (int): 접속자 집계 시간(분)
+
+    Returns:
+        tuple: (전체 접속자수, 회원 접속자수)
+    """
     base_date = datetime.now() - timedelta(minutes=login_minute)
 
     with DBConnect().sessionLocal() as db:
@@ -1359,7 +1493,7 @@ def get_current_login_count(request: Request) -> tuple:
                     else_=0
                 )).label("member"),
             ).where(
-                Login.mb_id != config.cf_admin,
+                Login.mb_id != admin_id,
                 Login.lo_ip != "",
                 Login.lo_datetime > base_date
             )
@@ -0,0 +1,138 @@
+"""조건부 요청 (ETag/Last-Modified)
+
+- 게시판 목록, 게시글 보기 응답에 검증값(ETag, Last-Modified)을 추가하고,
+  If-None-Match/If-Modified-Since 가 일치하면 목록/댓글 조회와 템플릿 렌더링 없이 304로 응답한다.
+- 게시판 변경 시각은 페이지 캐시의 게시판 서로게이트 키 버전(purge_board_pages)을 사용하므로
+  글/댓글 작성, 삭제, 게시판 설정 변경 시 별도의 DB 쓰기 없이 모든 워커에서 갱신된다.
+- 레이아웃의 접속자수, 인기검색어 등은 검증값으로 알 수 없으므로
+  CONDITIONAL_GET_INTERVAL 초마다 검증값을 바꿔 페이지를 다시 받도록 한다.
+- CONDITIONAL_GET_INTERVAL 이 0이면 사용하지 않는다.
+"""
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Sequence
+from urllib.parse import parse_qsl
+
+from dotenv import load_dotenv
+from starlette.requests import Request
+from starlette.responses import Response
+
+from lib.cache_registry import cache_registry
+from lib.page_cache import PAGE_CACHE_TABLES, board_surrogate_key
+from lib.session_marks import MARK_SECRET, MARK_SECRET_COMMENT, has_any_mark
+
+load_dotenv()
+
+CONDITIONAL_GET_INTERVAL = int(os.getenv("CONDITIONAL_GET_INTERVAL") or 60)
+
+
+@dataclass(frozen=True)
+class Validators:
+    """응답 검증값"""
+    etag: str
+    last_modified: float
+
+    def headers(self) -> Dict[str, str]:
+        """검증값 응답 헤더 (브라우저가 매번 검증하도록 no-cache를 함께 보낸다.)"""
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+
+
+def _get_viewer(request: Request) -> tuple:
+    """요청자에 따라 달라지는 화면 정보 (접속기기, 로그인 회원 정보)"""
+    device = getattr(request.state, "device", "pc")
+    member = getattr(request.state, "login_member", None)
+    if not member:
+        return (device,)
+    return (device, member.mb_id, member.mb_level, member.mb_point, member.mb_memo_cnt, member.mb_scrap_cnt)
+
+
+def make_validators(request: Request,
+                    surrogate_keys: Sequence[str],
+                    *parts,
+                    modified_at: float = 0) -> Optional[Validators]:
+    """요청 페이지의 검증값을 생성합니다.
+
+    Args:
+        request (Request): 요청 객체
+        surrogate_keys (Sequence[str]): 페이지가 의존하는 서로게이트 키 목록
+        *parts: 페이지 내용을 결정하는 추가 값 (게시글 수정일시, 댓글수 등)
+        modified_at (float, optional): 페이지 내용의 마지막 변경 시각(epoch). Defaults to 0.
+
+    Returns:
+        Optional[Validators]: 검증값. 사용하지 않으면 None
+    """
+    if not CONDITIONAL_GET_INTERVAL:
+        return None
+
+    versions = cache_registry.get_versions(PAGE_CACHE_TABLES + tuple(surrogate_keys))
+    window = int(time.time()) // CONDITIONAL_GET_INTERVAL * CONDITIONAL_GET_INTERVAL
+    query = sorted(parse_qsl(request.url.query))
+    key = repr((versions, window, query, _get_viewer(request), parts))
+
+    last_modified = max(
+        [window, modified_at] + [cache_registry.get_version_time(version) or 0 for version in versions]
+    )
+    return Validators(f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"', last_modified)
+
+
+def make_board_validators(request: Request, bo_table: str, *parts, modified_at: float = 0) -> Optional[Validators]:
+    """게시판 페이지(목록, 게시글 보기)의 검증값을 생성합니다."""
+    return make_validators(request, (board_surrogate_key(bo_table),), *parts, modified_at=modified_at)
+
+
+def get_write_modified_at(write) -> float:
+    """게시글의 마지막 변경 시각(epoch) (작성일시, 최종수정일시 중 늦은 시각)"""
+    times = [write.wr_datetime.timestamp()] if isinstance(write.wr_datetime, datetime) else []
+    try:
+        times.append(datetime.strptime(write.wr_last, "%Y-%m-%d %H:%M:%S").timestamp())
+    except (TypeError, ValueError):
+        pass
+    return max(times, default=0)
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _is_anonymous_viewer(request: Request) -> bool:
+    """요청자에 따라 화면이 달라지지 않는 비회원 요청인지 확인합니다."""
+    if len(_get_viewer(request)) > 1:
+        return False
+    return not has_any_mark(request.scope.get("session") or {}, MARK_SECRET, MARK_SECRET_COMMENT)
+
+
+def is_not_modified(request: Request, validators: Optional[Validators]) -> bool:
+    """요청의 조건부 헤더가 검증값과 일치하는지 확인합니다.
+    - If-None-Match 가 있으면 If-Modified-Since 는 확인하지 않습니다. (RFC 9110)
+    - 마지막 변경 시각에는 요청자(로그인 회원, 비밀글/비밀댓글 열람)가 반영되지 않으므로
+      If-Modified-Since 는 비밀글을 열람하지 않은 비회원 요청만 확인합니다.
+    """
+    if not validators:
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etags = [_strip_weak(etag.strip()) for etag in if_none_match.split(",")]
+        return "*" in etags or _strip_weak(validators.etag) in etags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or not _is_anonymous_viewer(request):
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(validators.last_modified) <= since
+
+
+def not_modified_response(validators: Validators) -> Response:
+    """304 Not Modified 응답"""
+    return Response(status_code=304, headers=validators.headers())
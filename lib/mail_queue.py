@@ -0,0 +1,367 @@
+# 메일 발송 대기열 및 발송 작업자 모음
+import logging
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+from uuid import uuid4
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from core.database import DBConnect
+from core.models import MailQueue
+
+load_dotenv()
+
+SMTP_SERVER = os.getenv("SMTP_SERVER", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 25))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+
+# 프로세스당 발송 작업자(스레드) 수
+MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", 2))
+# 프로세스당 초당 최대 발송 건수
+MAIL_RATE_PER_SEC = float(os.getenv("MAIL_RATE_PER_SEC", 10))
+# 최대 발송 시도 횟수
+MAIL_MAX_TRY = int(os.getenv("MAIL_MAX_TRY", 5))
+# 재시도 대기시간(초) - 시도할 때마다 2배씩 증가
+MAIL_RETRY_DELAY = 60
+# 작업자가 한번에 가져오는 메일 수
+MAIL_BATCH_SIZE = 50
+# 발송중 상태의 점유 만료시간(초) - 작업자가 비정상 종료된 경우 다시 발송 대기 상태가 됨
+MAIL_LEASE_SECONDS = 300
+# SMTP 연결을 유지하는 최대 유휴시간(초)
+SMTP_IDLE_TIMEOUT = 30
+
+
+def enqueue_mail(from_email: str, to_email: str, subject: str, body: str,
+                 from_name: str = None, to_name: str = None) -> None:
+    """메일을 발송 대기열에 추가한다.
+
+    Args:
+        from_email (str): 보내는 사람 이메일
+        to_email (str): 받는 사람 이메일
+        subject (str): 제목
+        body (str): 내용 (HTML)
+        from_name (str, optional): 보내는 사람 이름. Defaults to None.
+        to_name (str, optional): 받는 사람 이름. Defaults to None.
+    """
+    with DBConnect().sessionLocal() as db:
+        enqueue_mails(db, [{
+            "from_email": from_email, "from_name": from_name,
+            "to_email": to_email, "to_name": to_name,
+            "subject": subject, "body": body,
+        }])
+
+
+def enqueue_mails(db: Session, mails: list, ma_id: int = 0) -> int:
+    """여러 메일을 발송 대기열에 일괄 추가한다.
+
+    Args:
+        db (Session): DB 세션
+        mails (list): from_email, from_name, to_email, to_name, subject, body 키를 가진 dict 목록
+        ma_id (int, optional): 회원메일발송 아이디. Defaults to 0.
+
+    Returns:
+        int: 추가된 메일 수
+    """
+    now = datetime.now()
+    values = [{
+        "ma_id": ma_id,
+        "mq_from_email": mail["from_email"] or "",
+        "mq_from_name": mail.get("from_name") or "",
+        "mq_to_email": mail["to_email"] or "",
+        "mq_to_name": mail.get("to_name") or "",
+        "mq_subject": mail["subject"] or "",
+        "mq_body": mail["body"] or "",
+        "mq_status": "ready",
+        "mq_datetime": now,
+        "mq_next_datetime": now,
+    } for mail in mails if mail.get("to_email")]
+    if not values:
+        return 0
+
+    db.execute(insert(MailQueue), values)
+    db.commit()
+    mail_worker_pool.notify()
+
+    return len(values)
+
+
+def get_mail_queue_status(db: Session, ma_id: int) -> dict:
+    """회원메일발송의 대기열 상태별 메일 수를 반환한다.
+
+    Args:
+        db (Session): DB 세션
+        ma_id (int): 회원메일발송 아이디
+
+    Returns:
+        dict: {상태: 메일 수}
+    """
+    rows = db.execute(
+        select(MailQueue.mq_status, func.count())
+        .where(MailQueue.ma_id == ma_id)
+        .group_by(MailQueue.mq_status)
+    ).all()
+    status = {"ready": 0, "sending": 0, "sent": 0, "failed": 0}
+    status.update({mq_status: count for mq_status, count in rows})
+    return status
+
+
+def create_message(from_email: str, to_email: str, subject: str, body: str,
+                   from_name: str = None, to_name: str = None) -> str:
+    """발송할 메일 메시지를 생성한다."""
+    msg = MIMEMultipart()
+    msg['From'] = formataddr((str(Header(from_name, 'utf-8')), from_email))
+    msg['To'] = formataddr((str(Header(to_name, 'utf-8')), to_email))
+    msg['Subject'] = subject
+    # Assuming body is HTML, if not change 'html' to 'plain'
+    msg.attach(MIMEText(body, 'html'))
+    return msg.as_string()
+
+
+class TokenBucket():
+    """초당 발송 건수를 제한하는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰을 1개 사용한다. 토큰이 없으면 채워질 때까지 대기한다."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SMTPConnection():
+    """인증된 SMTP 연결을 유지하면서 여러 메일을 발송하는 클래스"""
+
+    def __init__(self):
+        self.server = None
+        self.last_used = 0
+
+    def send(self, from_email: str, to_email: str, message: str) -> None:
+        """메일을 발송한다. 연결이 끊어진 경우 한번 다시 연결한다."""
+        for attempt in range(2):
+            try:
+                server = self._get_server()
+                server.sendmail(from_email, to_email, message)
+                self.last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                self.close()
+                if attempt:
+                    raise
+
+    def close_if_idle(self) -> None:
+        """유휴시간이 지난 연결을 종료한다."""
+        if self.server and time.monotonic() - self.last_used > SMTP_IDLE_TIMEOUT:
+            self.close()
+
+    def close(self) -> None:
+        """연결을 종료한다."""
+        if self.server:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+        self.server = None
+
+    def _get_server(self) -> smtplib.SMTP:
+        if self.server:
+            return self.server
+
+        # Daum, Naver 메일은 SMTP_SSL을 사용합니다.
+        if SMTP_PORT == 465:
+            server = smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT, timeout=10)
+        else:
+            server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=10)
+            server.ehlo()
+            if server.has_extn("starttls"):
+                server.starttls()
+                server.ehlo()
+            elif SMTP_USERNAME and SMTP_PASSWORD:
+                # 인증 정보가 평문으로 전송되지 않도록 암호화 연결을 지원하지 않으면 발송하지 않음
+                server.close()
+                raise smtplib.SMTPNotSupportedError("SMTP 서버가 STARTTLS를 지원하지 않습니다.")
+
+        if SMTP_USERNAME and SMTP_PASSWORD:
+            server.login(SMTP_USERNAME, SMTP_PASSWORD)
+
+        self.server = server
+        self.last_used = time.monotonic()
+        return server
+
+
+class MailWorkerPool():
+    """메일 발송 대기열을 처리하는 작업자(스레드) 모음
+    - 작업자마다 SMTP 연결을 재사용하며, 발송 속도는 토큰 버킷으로 제한한다.
+    - 대기열의 메일은 UPDATE로 점유한 뒤 발송하므로 여러 프로세스에서 실행되어도 중복 발송되지 않는다.
+    - 일시적인 오류는 재시도 대기시간을 늘려가며 MAIL_MAX_TRY 회까지 다시 발송한다.
+    """
+    poll_interval = 5
+
+    def __init__(self, workers: int = MAIL_WORKERS, rate: float = MAIL_RATE_PER_SEC):
+        self.workers = workers
+        self.rate_limiter = TokenBucket(rate)
+        self.threads = []
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+
+    def start(self) -> None:
+        """작업자를 시작한다."""
+        if self.threads:
+            return
+
+        self.stop_event.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"mail-worker-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self) -> None:
+        """작업자를 종료한다."""
+        self.stop_event.set()
+        self.wake_event.set()
+        for thread in self.threads:
+            thread.join(timeout=10)
+        self.threads = []
+
+    def notify(self) -> None:
+        """대기중인 작업자를 깨운다."""
+        self.wake_event.set()
+
+    def _run(self) -> None:
+        connection = SMTPConnection()
+        while not self.stop_event.is_set():
+            try:
+                with DBConnect().sessionLocal() as db:
+                    mails = self._claim(db)
+                    if mails:
+                        self._send(db, connection, mails)
+                        continue
+                connection.close_if_idle()
+                self.wake_event.wait(self.poll_interval)
+                self.wake_event.clear()
+            except Exception as e:
+                logging.error(f"메일 발송 작업자 오류: {e}")
+                connection.close()
+                self.stop_event.wait(self.poll_interval)
+        connection.close()
+
+    def _claim(self, db: Session) -> list:
+        """발송할 메일을 점유하고 반환한다."""
+        now = datetime.now()
+        claimable = and_(
+            MailQueue.mq_status.in_(("ready", "sending")),
+            MailQueue.mq_next_datetime <= now
+        )
+        mq_ids = db.scalars(
+            select(MailQueue.mq_id)
+            .where(claimable)
+            .order_by(MailQueue.mq_id)
+            .limit(MAIL_BATCH_SIZE)
+        ).all()
+        if not mq_ids:
+            return []
+
+        token = uuid4().hex
+        db.execute(
+            update(MailQueue)
+            .where(MailQueue.mq_id.in_(mq_ids), claimable)
+            .values(
+                mq_status="sending",
+                mq_token=token,
+                mq_next_datetime=now + timedelta(seconds=MAIL_LEASE_SECONDS)
+            )
+        )
+        db.commit()
+
+        mails = db.scalars(
+            select(MailQueue)
+            .where(MailQueue.mq_token == token, MailQueue.mq_status == "sending")
+            .order_by(MailQueue.mq_id)
+        ).all()
+        # 메일마다 결과를 커밋하므로 커밋할 때마다 다시 조회되지 않도록 세션에서 분리
+        db.expunge_all()
+        return mails
+
+    def _send(self, db: Session, connection: SMTPConnection, mails: list) -> None:
+        """점유한 메일을 발송하고 결과를 기록한다.
+        - 작업자가 비정상 종료되어도 발송한 메일이 다시 발송되지 않도록 메일마다 결과를 커밋한다.
+        """
+        for mail in mails:
+            if self.stop_event.is_set():
+                break
+
+            self.rate_limiter.acquire()
+            try:
+                message = create_message(mail.mq_from_email, mail.mq_to_email, mail.mq_subject,
+                                         mail.mq_body, mail.mq_from_name, mail.mq_to_name)
+                connection.send(mail.mq_from_email, mail.mq_to_email, message)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+                # 받는 사람 또는 보내는 사람이 거부된 경우 재시도하지 않음
+                self._fail(db, mail, e, permanent=True)
+            except (smtplib.SMTPException, OSError) as e:
+                # 메일 단위의 5xx 응답은 재시도하지 않고, 연결/인증 오류는 다시 연결하여 재시도
+                is_response = (isinstance(e, smtplib.SMTPResponseException)
+                               and not isinstance(e, smtplib.SMTPAuthenticationError))
+                if not is_response:
+                    connection.close()
+                self._fail(db, mail, e, permanent=is_response and 500 <= e.smtp_code < 600)
+            else:
+                db.execute(
+                    update(MailQueue)
+                    .where(MailQueue.mq_id == mail.mq_id)
+                    .values(mq_status="sent", mq_error="", mq_sent_datetime=datetime.now())
+                )
+                db.commit()
+
+        # 종료 요청으로 발송하지 못한 메일은 다시 대기 상태로
+        db.execute(
+            update(MailQueue)
+            .where(MailQueue.mq_token == mails[0].mq_token, MailQueue.mq_status == "sending")
+            .values(mq_status="ready", mq_next_datetime=datetime.now())
+        )
+        db.commit()
+
+    def _fail(self, db: Session, mail: MailQueue, error: Exception, permanent: bool = False) -> None:
+        """발송 실패를 기록한다. 재시도 가능한 경우 대기시간 후 다시 발송한다."""
+        mq_try = mail.mq_try + 1
+        if permanent or mq_try >= MAIL_MAX_TRY:
+            values = {"mq_status": "failed"}
+        else:
+            delay = MAIL_RETRY_DELAY * (2 ** (mq_try - 1))
+            values = {"mq_status": "ready", "mq_next_datetime": datetime.now() + timedelta(seconds=delay)}
+        logging.warning(f"메일 발송 실패: {mail.mq_to_email} ({error})")
+
+        db.execute(
+            update(MailQueue)
+            .where(MailQueue.mq_id == mail.mq_id)
+            .values(mq_try=mq_try, mq_error=str(error)[:255], **values)
+        )
+        db.commit()
+
+
+mail_worker_pool = MailWorkerPool()
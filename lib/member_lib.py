@@ -1,13 +1,17 @@
 import os
 import re
+from datetime import datetime, timedelta
 from typing import Union, Optional
 from PIL import Image, UnidentifiedImageError
 
 from fastapi import Request, UploadFile
-from sqlalchemy import select
+from sqlalchemy import delete, literal, select, update
 from sqlalchemy.orm import Session
 
-from core.models import Board, Config, Group, Member as MemberModel, Member
+from core.models import (
+    Auth, Board, Config, Group, GroupMember, Member as MemberModel, Member,
+    MemberSocialProfiles, Memo, Point, Scrap
+)
 from core.database import DBConnect
 from lib.common import is_none_datetime, get_img_path, delete_image
 
@@ -284,3 +288,104 @@ def check_exist_member_email(email_address: str, mb_id: str = None):
         return True
     else:
         return False
+
+
+class MemberPurgeManager():
+    """회원 정보를 집합 단위로 삭제(익명화)하는 클래스.
+    - 회원 레코드는 mb_id만 남기고 개인정보를 비우며, 관련 테이블은 `mb_id IN (...)`으로 일괄 정리한다.
+    - 회원 이미지/아이콘 파일은 delete_files()로 트랜잭션 이후에 따로 삭제한다.
+    """
+    # IN 절 1회에 포함할 최대 항목 수
+    chunk_size = 500
+
+    def __init__(self, db: Session, config: Config):
+        self.db = db
+        self.config = config
+
+    def purge(self, mb_ids: list) -> list:
+        """회원 정보를 일괄 삭제한다.
+
+        Args:
+            mb_ids (list): 삭제할 회원아이디 목록
+
+        Returns:
+            list: 삭제 처리된 회원아이디 목록
+        """
+        mb_ids = list(dict.fromkeys(mb_id for mb_id in mb_ids if mb_id))
+        purged_ids = []
+        for chunk in self._chunks(mb_ids):
+            purged_ids.extend(self.db.scalars(select(Member.mb_id).where(Member.mb_id.in_(chunk))).all())
+        if not purged_ids:
+            return []
+
+        delete_time = datetime.now().strftime("%Y%m%d")
+        try:
+            for chunk in self._chunks(purged_ids):
+                # member 의 경우 레코드를 삭제하는게 아니라 mb_id 를 남기고 모두 제거
+                self.db.execute(
+                    update(Member)
+                    .where(Member.mb_id.in_(chunk))
+                    .values(
+                        mb_password="", mb_level=1, mb_email="", mb_homepage="",
+                        mb_tel="", mb_hp="", mb_zip1="", mb_zip2="",
+                        mb_addr1="", mb_addr2="", mb_addr3="", mb_point=0,
+                        mb_profile="", mb_birth="", mb_sex="", mb_signature="",
+                        mb_memo=literal(f"{delete_time} 삭제함\n") + Member.mb_memo,
+                        mb_certify="", mb_adult=0, mb_dupinfo="",
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                # 포인트, 그룹접근가능, 쪽지, 스크랩, 관리권한, 소셜로그인 테이블에서 삭제
+                self.db.execute(delete(Point).where(Point.mb_id.in_(chunk)))
+                self.db.execute(delete(GroupMember).where(GroupMember.mb_id.in_(chunk)))
+                self.db.execute(delete(Memo).where(Memo.me_send_mb_id.in_(chunk)))
+                self.db.execute(delete(Scrap).where(Scrap.mb_id.in_(chunk)))
+                self.db.execute(delete(Auth).where(Auth.mb_id.in_(chunk)))
+                self.db.execute(delete(MemberSocialProfiles).where(MemberSocialProfiles.mb_id.in_(chunk)))
+                # 그룹관리자, 게시판관리자인 경우 관리자를 공백으로
+                self.db.execute(update(Group).where(Group.gr_admin.in_(chunk)).values(gr_admin=""))
+                self.db.execute(update(Board).where(Board.bo_admin.in_(chunk)).values(bo_admin=""))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return purged_ids
+
+    def delete_files(self, mb_ids: list):
+        """회원 이미지/아이콘 파일을 삭제한다.
+
+        Yields:
+            tuple: (처리 순번, 회원아이디)
+        """
+        img_ext_list = self.config.cf_image_extension.split("|")
+        for count, mb_id in enumerate(mb_ids, start=1):
+            for directory in (f"data/member_image/{mb_id[:2]}", f"data/member/{mb_id[:2]}"):
+                for ext in img_ext_list:
+                    delete_image(directory, f"{mb_id}.{ext}", True)
+            yield count, mb_id
+
+    def get_leave_member_ids(self, leave_day: int) -> list:
+        """탈퇴 후 leave_day일이 지난 회원 중 아직 삭제 처리되지 않은 회원아이디 목록을 반환한다.
+
+        Args:
+            leave_day (int): 탈퇴 후 삭제까지의 기간(일)
+
+        Returns:
+            list: 회원아이디 목록
+        """
+        base_date = (datetime.now() - timedelta(days=leave_day)).strftime("%Y%m%d")
+        rows = self.db.execute(
+            select(Member.mb_id, Member.mb_memo)
+            .where(
+                Member.mb_leave_date != "",
+                Member.mb_leave_date < base_date,
+                Member.mb_id != self.config.cf_admin
+            )
+        ).all()
+        # 이미 삭제 처리된 회원은 제외
+        return [row.mb_id for row in rows if not re.match(r"^[0-9]{8}.*삭제함", row.mb_memo or "")]
+
+    def _chunks(self, items: list):
+        for index in range(0, len(items), self.chunk_size):
+            yield items[index:index + self.chunk_size]
@@ -0,0 +1,305 @@
+"""비회원 페이지 캐시
+
+- 로그인하지 않은 요청의 메인, 게시판 목록, 게시글 보기 페이지(GET)를 워커 메모리에 캐시한다.
+- 캐시 키는 경로 + 정렬된 쿼리스트링 + 접속기기(pc/mobile) + 닫은 레이어 팝업(hd_pops_* 쿠키)이다.
+- 페이지별 서로게이트 키(Surrogate-Key)를 cache_registry 의 버전으로 관리하므로
+  글/댓글 작성, 삭제, 게시판 설정 변경 시 purge_board_pages()로 모든 워커의 캐시가 무효화된다.
+- 유지 시간(PAGE_CACHE_TTL)이 지난 페이지는 PAGE_CACHE_STALE 초 동안
+  한 요청이 다시 생성하는 동안 다른 요청에 이전 페이지를 응답한다. (stale-while-revalidate)
+- 캐시된 게시글 보기의 조회수는 모아서 반영한다. (PageHitBuffer)
+- PAGE_CACHE_TTL 이 0이면 사용하지 않는다.
+"""
+import asyncio
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from cachetools import LRUCache
+from dotenv import load_dotenv
+from sqlalchemy import update
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.database import DBConnect
+from core.models import Config, Menu, NewWin, Poll
+from lib.cache_registry import cache_registry
+from lib.common import dynamic_create_write_table, get_client_ip
+from lib.session_marks import MARK_SECRET, MARK_SECRET_COMMENT, MARK_VIEW, add_mark, has_any_mark, has_mark
+
+load_dotenv()
+
+PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL") or 0)
+PAGE_CACHE_STALE = int(os.getenv("PAGE_CACHE_STALE") or 60)
+PAGE_CACHE_MAXSIZE = int(os.getenv("PAGE_CACHE_MAXSIZE") or 1000)
+# 캐시된 게시글 보기의 조회수를 반영하는 주기(초)
+PAGE_HIT_FLUSH_INTERVAL = 10
+
+# 모든 페이지가 의존하는 테이블 (관리자에서 변경 시 invalidate_tables()로 무효화)
+PAGE_CACHE_TABLES = (Config.__tablename__, Menu.__tablename__, NewWin.__tablename__, Poll.__tablename__)
+# 캐시 대상 경로 (경로 정규식, 라우터 함수 이름)
+PAGE_CACHE_ROUTES = (
+    (re.compile(r"^/$"), "index"),
+    (re.compile(r"^/board/(?P<bo_table>\w+)$"), "list_post"),
+    (re.compile(r"^/board/(?P<bo_table>\w+)/(?P<wr_id>\d+)$"), "read_post"),
+)
+LATEST_SURROGATE_KEY = "page-latest"
+
+
+def board_surrogate_key(bo_table: str) -> str:
+    """게시판 페이지의 서로게이트 키"""
+    return f"page-board-{bo_table}"
+
+
+def purge_page_cache(*surrogate_keys: str) -> None:
+    """서로게이트 키에 해당하는 페이지 캐시를 모든 워커에서 무효화합니다."""
+    cache_registry.invalidate(*surrogate_keys)
+
+
+def purge_board_pages(*bo_tables: str) -> None:
+    """게시판의 목록/게시글 페이지와 메인 페이지 캐시를 무효화합니다.
+    - 글/댓글 작성, 수정, 삭제 및 게시판 설정 변경 시 호출합니다.
+    """
+    purge_page_cache(LATEST_SURROGATE_KEY, *(board_surrogate_key(bo_table) for bo_table in bo_tables))
+
+
+@dataclass
+class CachedPage:
+    """캐시된 응답"""
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    versions: tuple
+    created_at: float
+
+
+class PageHitBuffer():
+    """캐시된 게시글 보기의 조회수를 모아서 반영하는 클래스"""
+
+    def __init__(self):
+        self._hits: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def add(self, bo_table: str, wr_id: int) -> None:
+        with self._lock:
+            self._hits[(bo_table, wr_id)] += 1
+
+    def is_due(self) -> bool:
+        return bool(self._hits) and time.monotonic() - self._flushed_at >= PAGE_HIT_FLUSH_INTERVAL
+
+    def flush(self) -> None:
+        """모아둔 조회수를 게시판 테이블에 반영합니다."""
+        with self._lock:
+            hits, self._hits = self._hits, Counter()
+            self._flushed_at = time.monotonic()
+        if not hits:
+            return
+
+        with DBConnect().sessionLocal() as db:
+            for (bo_table, wr_id), count in hits.items():
+                write_model = dynamic_create_write_table(bo_table)
+                db.execute(
+                    update(write_model)
+                    .where(write_model.wr_id == wr_id)
+                    .values(wr_hit=write_model.wr_hit + count)
+                )
+            db.commit()
+
+
+page_hit_buffer = PageHitBuffer()
+
+
+class PageCacheMiddleware:
+    """비회원 페이지 캐시 미들웨어
+    - 접속기기(request.state.device)와 세션을 사용하므로 CoreMiddleware 안쪽에 등록해야 한다.
+    - 캐시된 응답은 MainMiddleware 이후의 처리(DB 조회, 접속자 기록 등)를 하지 않는다.
+    """
+    def __init__(self,
+                 app: ASGIApp,
+                 ttl: int = PAGE_CACHE_TTL,
+                 stale: int = PAGE_CACHE_STALE,
+                 maxsize: int = PAGE_CACHE_MAXSIZE):
+        self.app = app
+        self.ttl = ttl
+        self.stale = stale
+        self._pages: LRUCache = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self.ttl or scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+
+        route = self._match(scope["path"])
+        if not route:
+            return await self.app(scope, receive, send)
+
+        request = Request(scope)
+        if not self._is_cacheable_request(request):
+            return await self.app(scope, receive, send_with_headers(send, {"Cache-Control": "private, no-cache"}))
+
+        endpoint_name, path_params = route
+        surrogate_keys = self._get_surrogate_keys(endpoint_name, path_params)
+        key = self._get_cache_key(request)
+        versions = cache_registry.get_versions(PAGE_CACHE_TABLES + surrogate_keys)
+
+        with self._lock:
+            page = self._pages.get(key)
+            if page and page.versions != versions:
+                page = None
+            age = time.monotonic() - page.created_at if page else None
+            if page and age >= self.ttl:
+                # 유지 시간이 지난 페이지는 다른 요청이 다시 생성하는 중일 때만 응답한다.
+                if age >= self.ttl + self.stale or key not in self._refreshing:
+                    page = None
+            if not page:
+                self._refreshing.add(key)
+
+        if page:
+            if endpoint_name == "read_post":
+                self._count_hit(request, path_params)
+            cache_status = "HIT" if age < self.ttl else "STALE"
+            return await self._send_page(request, page, surrogate_keys, cache_status, send)
+
+        try:
+            await self._fetch(scope, receive, send, key, versions, endpoint_name, surrogate_keys)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _match(self, path: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        for pattern, endpoint_name in PAGE_CACHE_ROUTES:
+            match = pattern.match(path)
+            if match:
+                return endpoint_name, match.groupdict()
+        return None
+
+    def _is_cacheable_request(self, request: Request) -> bool:
+        """비회원 요청인지 확인합니다.
+        - 비밀글 비밀번호를 입력한 세션은 다른 비회원과 페이지가 다르므로 제외합니다.
+        - 오늘 처음 접속한 요청은 접속자 기록을 위해 제외합니다.
+        """
+        session = request.scope.get("session") or {}
+        if session.get("ss_mb_id") or request.cookies.get("ck_mb_id"):
+            return False
+        if has_any_mark(session, MARK_SECRET, MARK_SECRET_COMMENT):
+            return False
+        return request.cookies.get("ck_visit_ip") == get_client_ip(request)
+
+    def _get_surrogate_keys(self, endpoint_name: str, path_params: Dict[str, str]) -> tuple:
+        if endpoint_name == "index":
+            return (LATEST_SURROGATE_KEY,)
+        return (board_surrogate_key(path_params["bo_table"]),)
+
+    def _get_cache_key(self, request: Request) -> str:
+        query = urlencode(sorted((k, v) for k, v in parse_qsl(request.url.query) if v))
+        # 레이어 팝업은 비회원마다 닫은 팝업 쿠키(get_newwins_except_cookie)에 따라 다르다.
+        closed_popups = ",".join(sorted(
+            name for name, value in request.cookies.items() if name.startswith("hd_pops_") and value
+        ))
+        return f"{getattr(request.state, 'device', 'pc')}:{request.url.path}?{query}#{closed_popups}"
+
+    def _count_hit(self, request: Request, path_params: Dict[str, str]) -> None:
+        """캐시된 게시글 보기의 조회수를 세션당 1회 증가시킵니다. (read_post와 동일)"""
+        bo_table, wr_id = path_params["bo_table"], int(path_params["wr_id"])
+        if has_mark(request.session, bo_table, MARK_VIEW, wr_id):
+            return
+        add_mark(request.session, bo_table, MARK_VIEW, wr_id)
+        page_hit_buffer.add(bo_table, wr_id)
+        if page_hit_buffer.is_due():
+            asyncio.get_running_loop().run_in_executor(None, page_hit_buffer.flush)
+
+    def _cache_headers(self, surrogate_keys: tuple) -> Dict[str, str]:
+        """프록시 캐시용 헤더"""
+        return {
+            "Cache-Control": f"public, max-age=0, s-maxage={self.ttl}, stale-while-revalidate={self.stale}",
+            "Surrogate-Key": " ".join(surrogate_keys),
+        }
+
+    async def _send_page(self, request: Request, page: CachedPage, surrogate_keys: tuple, cache_status: str,
+                         send: Send):
+        headers = list(page.headers)
+        for name, value in {**self._cache_headers(surrogate_keys), "X-Cache": cache_status}.items():
+            headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+
+        # 캐시된 페이지의 검증값(ETag)과 일치하면 본문 없이 304 응답
+        etag = dict(page.headers).get(b"etag")
+        if etag and etag.decode("latin-1") in request.headers.get("if-none-match", ""):
+            headers = [(name, value) for name, value in headers
+                       if name not in (b"content-length", b"content-type")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": page.status, "headers": headers})
+        await send({"type": "http.response.body", "body": page.body})
+
+    async def _fetch(self, scope: Scope, receive: Receive, send: Send,
+                     key: str, versions: tuple, endpoint_name: str, surrogate_keys: tuple):
+        """페이지를 생성하여 응답하고, 캐시할 수 있는 응답이면 저장합니다."""
+        start_message: Optional[Message] = None
+        chunks: List[bytes] = []
+        cacheable = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, cacheable
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = {name.lower(): value for name, value in message.get("headers", [])}
+                endpoint = scope.get("endpoint")
+                cacheable = (
+                    message["status"] == 200
+                    and getattr(endpoint, "__name__", "") == endpoint_name
+                    and headers.get(b"content-type", b"").startswith(b"text/html")
+                    and b"set-cookie" not in headers
+                    # 검증값(ETag)과 함께 보내는 no-cache 외의 캐시 설정은 따른다.
+                    and headers.get(b"cache-control", b"no-cache") == b"no-cache"
+                )
+                if cacheable:
+                    message = {
+                        **message,
+                        "headers": [
+                            (name, value) for name, value in message.get("headers", [])
+                            if name.lower() != b"cache-control"
+                        ] + [
+                            (name.lower().encode("latin-1"), value.encode("latin-1"))
+                            for name, value in {**self._cache_headers(surrogate_keys), "X-Cache": "MISS"}.items()
+                        ],
+                    }
+            elif message["type"] == "http.response.body" and cacheable:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    with self._lock:
+                        self._pages[key] = CachedPage(
+                            status=start_message["status"],
+                            headers=[(name, value) for name, value in start_message.get("headers", [])
+                                     if name.lower() not in (b"content-length", b"cache-control")] + [
+                                (b"content-length", str(sum(len(chunk) for chunk in chunks)).encode("latin-1"))
+                            ],
+                            body=b"".join(chunks),
+                            versions=versions,
+                            created_at=time.monotonic(),
+                        )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def send_with_headers(send: Send, extra_headers: Dict[str, str]) -> Send:
+    """응답에 헤더가 없으면 추가하는 send 함수를 반환합니다."""
+    async def wrapper(message: Message):
+        if message["type"] == "http.response.start":
+            headers = list(message.get("headers", []))
+            names = {name.lower() for name, _ in headers}
+            for name, value in extra_headers.items():
+                encoded_name = name.lower().encode("latin-1")
+                if encoded_name not in names:
+                    headers.append((encoded_name, value.encode("latin-1")))
+            message = {**message, "headers": headers}
+        await send(message)
+    return wrapper
@@ -1,97 +1,117 @@
-import hashlib
-import os
+"""그누보드5 호환 PBKDF2 비밀번호 해시
+
+- 해시 형식: {알고리즘}:{반복횟수}:{salt}:{base64 해시} (그누보드5와 동일)
+- 해시 계산은 hashlib.pbkdf2_hmac(OpenSSL)으로 처리하며, 계산 중에는 GIL을 놓으므로
+  비동기 핸들러에서는 *_async 함수로 별도 스레드 풀에서 실행하여 이벤트 루프를 막지 않는다.
+- 새 해시는 PASSWORD_HASH_ALGORITHM, PASSWORD_HASH_ITERATIONS 설정으로 생성하며,
+  기존 해시는 로그인 시 needs_upgrade()로 확인하여 다시 생성한다.
+"""
+import asyncio
 import base64
+import binascii
+import functools
+import hashlib
 import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil
 
+from dotenv import load_dotenv
+
+load_dotenv()
+
 # Constants
 PBKDF2_COMPAT_HASH_ALGORITHM = 'SHA256'
 PBKDF2_COMPAT_ITERATIONS = 12000
 PBKDF2_COMPAT_SALT_BYTES = 24
 PBKDF2_COMPAT_HASH_BYTES = 24
 
+# 새로 생성하는 해시의 알고리즘과 반복횟수 (기본값은 그누보드5와 동일)
+PASSWORD_HASH_ALGORITHM = (os.getenv("PASSWORD_HASH_ALGORITHM") or PBKDF2_COMPAT_HASH_ALGORITHM).lower()
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS") or PBKDF2_COMPAT_ITERATIONS)
+# 해시 계산 스레드 수 (프로세스당)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or 4)
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
 
 def create_hash(password, force_compat=False):
     salt = base64.b64encode(os.urandom(PBKDF2_COMPAT_SALT_BYTES)).decode('utf-8')
-    algo = PBKDF2_COMPAT_HASH_ALGORITHM.lower()
-    iterations = PBKDF2_COMPAT_ITERATIONS
-    
+    if force_compat:
+        algo = PBKDF2_COMPAT_HASH_ALGORITHM.lower()
+        iterations = PBKDF2_COMPAT_ITERATIONS
+    else:
+        algo = PASSWORD_HASH_ALGORITHM
+        iterations = PASSWORD_HASH_ITERATIONS
+
     pbkdf2 = pbkdf2_default(algo, password, salt, iterations, PBKDF2_COMPAT_HASH_BYTES)
     return f"{algo}:{iterations}:{salt}:{base64.b64encode(pbkdf2).decode('utf-8')}"
 
 def validate_password(password, hash):
-    params = hash.split(':')
+    params = (hash or '').split(':')
     if len(params) < 4:
         return False
-    
-    pbkdf2 = base64.b64decode(params[3])
-    pbkdf2_check = pbkdf2_default(params[0], password, params[2], int(params[1]), len(pbkdf2))
+
+    try:
+        pbkdf2 = base64.b64decode(params[3])
+        pbkdf2_check = pbkdf2_default(params[0], password, params[2], int(params[1]), len(pbkdf2))
+    except (ValueError, binascii.Error):
+        return False
     return slow_equals(pbkdf2, pbkdf2_check)
 
 def slow_equals(a, b):
-    diff = len(a) ^ len(b)
-    for char_a, char_b in zip(a, b):
-        # If the inputs are strings, convert characters to ASCII values
-        val_a = ord(char_a) if isinstance(char_a, str) else char_a
-        val_b = ord(char_b) if isinstance(char_b, str) else char_b
-        
-        diff |= val_a ^ val_b
-    return diff == 0
+    if isinstance(a, str):
+        a = a.encode()
+    if isinstance(b, str):
+        b = b.encode()
+    return hmac.compare_digest(a, b)
 
 def needs_upgrade(hash):
-    params = hash.split(':')
+    """해시가 현재 설정(알고리즘, 반복횟수)보다 약하면 True를 반환한다."""
+    params = (hash or '').split(':')
     if len(params) < 4:
         return True
-    
-    # You can add more conditions to check if the hash needs an upgrade
-    return False
+
+    try:
+        iterations = int(params[1])
+    except ValueError:
+        return True
+    return params[0].lower() != PASSWORD_HASH_ALGORITHM or iterations < PASSWORD_HASH_ITERATIONS
 
 def pbkdf2_default(algo, password, salt, count, key_length):
     if count <= 0 or key_length <= 0:
         raise ValueError('PBKDF2 ERROR: Invalid parameters.')
-    
+
     if isinstance(salt, str):
         salt = salt.encode()
-    
+
     if not algo:
         return pbkdf2_fallback(password, salt, count, key_length)
-    
+
     algo = algo.lower()
     if algo not in hashlib.algorithms_available:
         if algo == 'sha1':
             return pbkdf2_fallback(password, salt, count, key_length)
         else:
             raise ValueError('PBKDF2 ERROR: Hash algorithm not supported.')
-    
-    hash_length = len(hashlib.new(algo).digest())
-    block_count = ceil(key_length / hash_length)
-    
-    output = b''
-    for i in range(1, block_count+1):
-        last = salt + i.to_bytes(4, byteorder='big')
-        last = xorsum = hmac.new(password.encode(), last, algo).digest()
-        for j in range(1, count):
-            last = hmac.new(password.encode(), last, algo).digest()
-            xorsum = bytes(x ^ y for x, y in zip(xorsum, last))
-        output += xorsum
-    
-    return output[:key_length]
+
+    return hashlib.pbkdf2_hmac(algo, password.encode(), salt, count, key_length)
 
 def pbkdf2_fallback(password, salt, count, key_length):
     hash_length = 20  # Length of SHA-1 hash
     block_count = ceil(key_length / hash_length)
-    
+
     if isinstance(salt, str):
         salt = salt.encode()
-    
+
     if len(password) > 64:
         password = hashlib.sha1(password.encode()).digest().ljust(64, b'\0')
     else:
         password = password.encode().ljust(64, b'\0')
-    
+
     opad = bytes(x ^ 0x5C for x in password)
     ipad = bytes(x ^ 0x36 for x in password)
-    
+
     output = b''
     for i in range(1, block_count+1):
         last = salt + i.to_bytes(4, byteorder='big')
@@ -100,5 +120,18 @@ def pbkdf2_fallback(password, salt, count, key_length):
             last = hashlib.sha1(opad + hashlib.sha1(ipad + last).digest()).digest()
             xorsum = bytes(x ^ y for x, y in zip(xorsum, last))
         output += xorsum
-    
-    return output[:key_length]
\ No newline at end of file
+
+    return output[:key_length]
+
+
+async def _run_in_executor(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+async def create_hash_async(password, force_compat=False):
+    """create_hash()를 해시 계산 스레드 풀에서 실행한다."""
+    return await _run_in_executor(create_hash, password, force_compat=force_compat)
+
+async def validate_password_async(password, hash):
+    """validate_password()를 해시 계산 스레드 풀에서 실행한다."""
+    return await _run_in_executor(validate_password, password, hash)
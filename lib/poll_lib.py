@@ -0,0 +1,144 @@
+"""설문조사 투표 처리
+
+- 참여 기록은 설문조사 참여 테이블(PollVote)에 1행씩 저장하며,
+  (po_id, mb_id, pv_ip) 유니크 키로 같은 회원/IP의 중복 투표를 막는다.
+- 항목별 투표수(Poll.po_cnt1~9)는 UPDATE 문으로 증가시키므로 동시에 투표해도 누락되지 않는다.
+- 이전 버전에서 Poll.po_ips, Poll.mb_ids 에 쉼표로 이어 저장하던 참여 기록은
+  migrate_poll_votes()로 옮긴다.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, exists, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.models import Poll, PollVote
+
+POLL_ITEM_COUNT = 9
+
+
+def is_valid_poll_item(poll: Poll, item: int) -> bool:
+    """투표 항목 번호가 유효한지 확인합니다."""
+    return 1 <= item <= POLL_ITEM_COUNT and bool(getattr(poll, f"po_poll{item}"))
+
+
+def has_voted(db: Session, po_id: int, ip: str, mb_id: Optional[str] = None) -> bool:
+    """설문조사 참여 여부를 확인합니다.
+    - 비회원으로 참여한 IP이거나, 회원으로 참여한 아이디이면 참여한 것으로 봅니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        po_id (int): 설문조사 ID
+        ip (str): 접속 IP
+        mb_id (str, optional): 회원 아이디. Defaults to None.
+
+    Returns:
+        bool: 참여 여부
+    """
+    voter = and_(PollVote.mb_id == "", PollVote.pv_ip == ip)
+    if mb_id:
+        voter = or_(voter, and_(PollVote.mb_id == mb_id, PollVote.pv_ip == ""))
+    return bool(db.scalar(select(exists().where(PollVote.po_id == po_id, voter))))
+
+
+def add_poll_vote(db: Session, poll: Poll, item: int, ip: str, mb_id: Optional[str] = None) -> bool:
+    """설문조사 참여 기록을 추가하고 항목 투표수를 1 증가시킵니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        poll (Poll): 설문조사 모델
+        item (int): 투표 항목 번호 (1~9)
+        ip (str): 접속 IP
+        mb_id (str, optional): 회원 아이디. Defaults to None.
+
+    Returns:
+        bool: 투표 처리 여부 (이미 참여한 경우 False)
+    """
+    try:
+        db.execute(
+            insert(PollVote).values(
+                po_id=poll.po_id,
+                mb_id=mb_id or "",
+                # 회원은 아이디로만 참여 여부를 확인한다.
+                pv_ip="" if mb_id else ip,
+                pv_item=item,
+            )
+        )
+        cnt_column = getattr(Poll, f"po_cnt{item}")
+        db.execute(
+            update(Poll)
+            .where(Poll.po_id == poll.po_id)
+            .values({cnt_column: cnt_column + 1})
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+
+    db.refresh(poll)
+    return True
+
+
+def get_poll_voters(db: Session, po_id: int) -> Tuple[List[str], List[str]]:
+    """설문조사에 참여한 IP, 회원 아이디 목록을 반환합니다.
+
+    Returns:
+        Tuple[List[str], List[str]]: (비회원 IP 목록, 회원 아이디 목록)
+    """
+    rows = db.execute(
+        select(PollVote.mb_id, PollVote.pv_ip)
+        .where(PollVote.po_id == po_id)
+        .order_by(PollVote.pv_id)
+    ).all()
+    ips = [pv_ip for mb_id, pv_ip in rows if not mb_id]
+    mb_ids = [mb_id for mb_id, _ in rows if mb_id]
+    return ips, mb_ids
+
+
+def delete_poll_votes(db: Session, po_ids: Iterable[int]) -> None:
+    """설문조사 삭제 시 참여 기록을 삭제합니다."""
+    db.execute(delete(PollVote).where(PollVote.po_id.in_(list(po_ids))))
+
+
+def _split_voters(value: str, max_length: int) -> List[str]:
+    """쉼표로 이어 저장된 참여 기록을 중복 없는 목록으로 변환합니다."""
+    voters = (voter.strip()[:max_length] for voter in (value or "").split(","))
+    return list(dict.fromkeys(voter for voter in voters if voter))
+
+
+def migrate_poll_votes(db: Session) -> int:
+    """Poll.po_ips, Poll.mb_ids 의 참여 기록을 설문조사 참여 테이블로 옮깁니다.
+    - 이전 기록은 투표한 항목을 알 수 없으므로 pv_item은 0으로 저장합니다.
+    - 옮긴 후 문자열 컬럼은 비웁니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+
+    Returns:
+        int: 추가한 참여 기록 수
+    """
+    polls = db.scalars(
+        select(Poll).where(or_(Poll.po_ips != "", Poll.mb_ids != ""))
+    ).all()
+
+    count = 0
+    for poll in polls:
+        existing = set(
+            db.execute(
+                select(PollVote.mb_id, PollVote.pv_ip).where(PollVote.po_id == poll.po_id)
+            ).all()
+        )
+        voters = [("", ip) for ip in _split_voters(poll.po_ips, PollVote.pv_ip.type.length)]
+        voters += [(mb_id, "") for mb_id in _split_voters(poll.mb_ids, PollVote.mb_id.type.length)]
+        values = [
+            {"po_id": poll.po_id, "mb_id": mb_id, "pv_ip": ip, "pv_item": 0}
+            for mb_id, ip in voters if (mb_id, ip) not in existing
+        ]
+        if values:
+            db.execute(insert(PollVote), values)
+        poll.po_ips = ""
+        poll.mb_ids = ""
+        db.commit()
+        count += len(values)
+
+    return count
@@ -0,0 +1,281 @@
+"""요청 제한 (Rate Limit)
+
+- 글쓰기, 댓글, 검색, 로그인 요청을 토큰 버킷 방식으로 제한한다.
+- 버킷 키는 규칙 이름과 요청자(로그인 회원 아이디 또는 IP)로 구성한다.
+- 규칙은 기본환경설정(Config.cf_rate_limit)에 "이름 = 횟수/초" 형식으로 한 줄에 하나씩 입력한다.
+- 저장소는 .env 의 RATE_LIMIT_BACKEND 로 선택한다.
+    - memory: 워커(프로세스)별 메모리. 단일 워커에서 사용
+    - database: 데이터베이스 테이블(RateLimitBucket). 여러 워커/서버가 버킷을 공유
+- 요청 제한은 RateLimitMiddleware 에서 처리하므로 제한된 요청은 DB 조회 등 이후 처리를 하지 않는다.
+"""
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+from dotenv import load_dotenv
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.database import DBConnect
+from core.models import Config, RateLimitBucket
+from lib.cache_registry import cache_registry
+from lib.common import get_client_ip
+
+load_dotenv()
+
+RATE_LIMIT_BACKEND = (os.getenv("RATE_LIMIT_BACKEND") or "memory").lower()
+# 메모리 저장소의 최대 버킷 수 (초과하면 오래 사용하지 않은 버킷부터 삭제)
+RATE_LIMIT_MEMORY_SIZE = 100000
+# 최근 제한된 요청자 기록 수 (관리자 화면 표시용)
+RATE_LIMIT_BLOCKED_SIZE = 100
+
+# 요청 제한 대상 (규칙 이름: (HTTP 메서드, 경로 정규식, 설명))
+RATE_LIMIT_ROUTES = {
+    "write": ("POST", re.compile(r"^/board/write_update/[^/]+$"), "글쓰기"),
+    "comment": ("POST", re.compile(r"^/board/write_comment_update/[^/]+$"), "댓글쓰기"),
+    "search": ("GET", re.compile(r"^/bbs/search$"), "전체검색"),
+    "login": ("POST", re.compile(r"^/bbs/login$"), "로그인"),
+}
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """요청 제한 규칙 (seconds 초 동안 limit 회)"""
+    name: str
+    limit: int
+    seconds: int
+
+    @property
+    def rate(self) -> float:
+        """초당 충전되는 토큰 수"""
+        return self.limit / self.seconds
+
+
+def parse_rate_limit_rules(value: Optional[str]) -> Dict[str, RateLimitRule]:
+    """요청 제한 설정 문자열을 규칙 목록으로 변환합니다.
+    - "이름 = 횟수/초" 형식이 아니거나 등록되지 않은 이름은 무시합니다.
+
+    Args:
+        value (str): 요청 제한 설정 (ex: "login = 10/60")
+
+    Returns:
+        Dict[str, RateLimitRule]: 규칙 이름별 규칙
+    """
+    rules = {}
+    for line in (value or "").splitlines():
+        match = re.match(r"^\s*(\w+)\s*=\s*(\d+)\s*/\s*(\d+)\s*$", line)
+        if not match:
+            continue
+        name, limit, seconds = match.group(1), int(match.group(2)), int(match.group(3))
+        if name in RATE_LIMIT_ROUTES and limit > 0 and seconds > 0:
+            rules[name] = RateLimitRule(name, limit, seconds)
+    return rules
+
+
+@cache_registry.cached(tables=[Config.__tablename__], maxsize=1)
+def get_rate_limit_settings() -> Tuple[Dict[str, RateLimitRule], str]:
+    """요청 제한 규칙과 최고관리자 아이디를 반환합니다.
+    - 기본환경설정 변경 시 캐시가 무효화됩니다.
+    """
+    with DBConnect().sessionLocal() as db:
+        row = db.execute(select(Config.cf_rate_limit, Config.cf_admin)).first()
+    if not row:
+        return {}, ""
+    return parse_rate_limit_rules(row.cf_rate_limit), row.cf_admin or ""
+
+
+class MemoryRateLimitBackend():
+    """워커 메모리 토큰 버킷 저장소"""
+    blocking = False
+
+    def __init__(self, maxsize: int = RATE_LIMIT_MEMORY_SIZE):
+        self._buckets: LRUCache = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rule: RateLimitRule, now: float) -> Tuple[bool, float]:
+        """토큰 1개를 사용합니다.
+
+        Returns:
+            Tuple[bool, float]: (허용 여부, 다시 요청할 수 있을 때까지 남은 초)
+        """
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (rule.limit, now))
+            tokens = min(rule.limit, tokens + (now - updated) * rule.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return False, (1 - tokens) / rule.rate
+            self._buckets[key] = (tokens - 1, now)
+            return True, 0
+
+    def count(self) -> int:
+        """저장된 버킷 수"""
+        return len(self._buckets)
+
+
+class DatabaseRateLimitBackend():
+    """데이터베이스 토큰 버킷 저장소
+    - 버킷 갱신은 UPDATE 문 하나로 처리하므로 여러 워커가 동시에 요청해도 토큰이 중복 사용되지 않는다.
+    """
+    blocking = True
+
+    def hit(self, key: str, rule: RateLimitRule, now: float) -> Tuple[bool, float]:
+        """토큰 1개를 사용합니다.
+
+        Returns:
+            Tuple[bool, float]: (허용 여부, 다시 요청할 수 있을 때까지 남은 초)
+        """
+        model = RateLimitBucket
+        refill = model.rl_tokens + (now - model.rl_updated) * rule.rate
+        tokens = case((refill > rule.limit, rule.limit), else_=refill)
+
+        with DBConnect().sessionLocal() as db:
+            for _ in range(2):
+                result = db.execute(
+                    update(model)
+                    .where(model.rl_key == key, tokens >= 1)
+                    .values(rl_tokens=tokens - 1, rl_updated=now)
+                )
+                if result.rowcount:
+                    db.commit()
+                    return True, 0
+
+                current = db.scalar(select(tokens).where(model.rl_key == key))
+                if current is not None:
+                    db.rollback()
+                    return False, (1 - current) / rule.rate
+
+                try:
+                    db.execute(insert(model).values(rl_key=key, rl_tokens=rule.limit - 1, rl_updated=now))
+                    db.commit()
+                    return True, 0
+                except IntegrityError:
+                    # 다른 요청에서 먼저 추가한 경우 UPDATE로 다시 처리
+                    db.rollback()
+
+        return False, 1 / rule.rate
+
+    def count(self) -> int:
+        """저장된 버킷 수"""
+        with DBConnect().sessionLocal() as db:
+            return db.scalar(select(func.count()).select_from(RateLimitBucket)) or 0
+
+
+def delete_expired_rate_limit_buckets(max_age: int = 60 * 60 * 24) -> None:
+    """오래 사용하지 않은 요청 제한 버킷을 삭제합니다. (스케줄러 작업)"""
+    if RATE_LIMIT_BACKEND != "database":
+        return
+    with DBConnect().sessionLocal() as db:
+        db.execute(delete(RateLimitBucket).where(RateLimitBucket.rl_updated < time.time() - max_age))
+        db.commit()
+
+
+class RateLimiter():
+    """요청 제한 처리 클래스
+    - 허용/제한 횟수와 최근 제한된 요청자는 워커별로 집계한다.
+    """
+
+    def __init__(self, backend_name: str = RATE_LIMIT_BACKEND):
+        self.backend_name = backend_name
+        if backend_name == "database":
+            self.backend = DatabaseRateLimitBackend()
+        else:
+            self.backend = MemoryRateLimitBackend()
+        self.allowed = Counter()
+        self.blocked = Counter()
+        self.started_at = time.time()
+        self._blocked_keys: LRUCache = LRUCache(RATE_LIMIT_BLOCKED_SIZE)
+        self._lock = threading.Lock()
+
+    def match(self, method: str, path: str) -> Optional[str]:
+        """요청에 해당하는 규칙 이름을 반환합니다."""
+        for name, (route_method, pattern, _) in RATE_LIMIT_ROUTES.items():
+            if method == route_method and pattern.match(path):
+                return name
+        return None
+
+    async def hit(self, rule: RateLimitRule, subject: str) -> Tuple[bool, float]:
+        """요청자의 요청을 기록하고 허용 여부를 반환합니다.
+
+        Args:
+            rule (RateLimitRule): 요청 제한 규칙
+            subject (str): 요청자 (mb:{회원아이디} 또는 ip:{IP})
+
+        Returns:
+            Tuple[bool, float]: (허용 여부, 다시 요청할 수 있을 때까지 남은 초)
+        """
+        key = f"{rule.name}:{subject}"
+        if self.backend.blocking:
+            allowed, retry_after = await run_in_threadpool(self.backend.hit, key, rule, time.time())
+        else:
+            allowed, retry_after = self.backend.hit(key, rule, time.time())
+
+        with self._lock:
+            if allowed:
+                self.allowed[rule.name] += 1
+            else:
+                self.blocked[rule.name] += 1
+                count = self._blocked_keys.get(key, (0, 0))[0]
+                self._blocked_keys[key] = (count + 1, time.time())
+        return allowed, retry_after
+
+    def get_blocked_keys(self) -> List[Tuple[str, int, float]]:
+        """최근 제한된 요청자 목록 (버킷 키, 제한 횟수, 마지막 제한 시각)"""
+        with self._lock:
+            items = [(key, count, blocked_at) for key, (count, blocked_at) in self._blocked_keys.items()]
+        return sorted(items, key=lambda item: item[2], reverse=True)
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitMiddleware:
+    """요청 제한 대상 경로의 요청 횟수를 확인하는 미들웨어
+    - 세션의 회원 아이디를 사용하므로 SessionMiddleware 안쪽에 등록해야 한다.
+    """
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        name = self.limiter.match(scope["method"], scope["path"])
+        if not name:
+            return await self.app(scope, receive, send)
+
+        try:
+            rules, cf_admin = get_rate_limit_settings()
+        except SQLAlchemyError:
+            # 설치 전에는 기본환경설정 테이블이 없다.
+            return await self.app(scope, receive, send)
+        rule = rules.get(name)
+        mb_id = scope.get("session", {}).get("ss_mb_id", "")
+        # 최고관리자는 제한하지 않는다.
+        if not rule or (mb_id and mb_id == cf_admin):
+            return await self.app(scope, receive, send)
+
+        request = Request(scope)
+        subject = f"mb:{mb_id}" if mb_id else f"ip:{get_client_ip(request)}"
+        allowed, retry_after = await self.limiter.hit(rule, subject)
+        if allowed:
+            return await self.app(scope, receive, send)
+
+        # 테마 조회 등 DB 작업을 하지 않도록 템플릿 없이 응답한다.
+        retry_after = max(1, int(retry_after + 0.999))
+        message = f"요청이 너무 많습니다. {retry_after}초 후에 다시 시도해 주세요."
+        response = HTMLResponse(
+            f"<meta charset=utf-8><script>alert(\"{message}\");history.back();</script>{message}",
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
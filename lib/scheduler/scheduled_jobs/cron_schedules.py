@@ -1,4 +1,7 @@
+from core.session import delete_expired_sessions
 from lib.common import delete_old_records
+from lib.rate_limit import delete_expired_rate_limit_buckets
+from lib.visit_stats import rollup_visit_stats
 
 
 cron_jobs = [
@@ -7,6 +10,21 @@ cron_jobs = [
         'job_func': delete_old_records,
         'expression': {'hour': 5, 'minute': 30, 'second': 0}
     },
+    {
+        'job_id': 'cron_1',
+        'job_func': rollup_visit_stats,
+        'expression': {'hour': 0, 'minute': 10, 'second': 0}
+    },
+    {
+        'job_id': 'cron_2',
+        'job_func': delete_expired_rate_limit_buckets,
+        'expression': {'hour': 5, 'minute': 40, 'second': 0}
+    },
+    {
+        'job_id': 'cron_3',
+        'job_func': delete_expired_sessions,
+        'expression': {'hour': 5, 'minute': 50, 'second': 0}
+    },
 ]
 
 
@@ -0,0 +1,113 @@
+"""세션의 게시글별 기록 (조회, 다운로드, 링크 이동, 비밀글 열람)
+
+- 게시글마다 세션 키(ss_view_{bo_table}_{wr_id} 등)를 추가하는 대신
+  세션의 "ss_marks"에 게시판/종류별 게시글 번호 집합을 압축하여 저장한다.
+    - ex) {"free": {"view": [기록 시작 시각, "AQID"]}}
+    - 게시글 번호는 정렬 후 이전 번호와의 차이를 가변 길이 정수(varint)로 저장하고 base64로 인코딩한다.
+- 기록은 게시판/종류별로 SESSION_MARK_TTL 초가 지나면 함께 만료된다. (기본값: 세션 유지 시간)
+- 게시판/종류별 기록이 SESSION_MARK_MAX 개를 넘으면 기록을 비우고 다시 시작한다.
+"""
+import os
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Iterable, List, MutableMapping, Set
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SESSION_MARK_TTL = int(os.getenv("SESSION_MARK_TTL") or 60 * 60 * 3)
+SESSION_MARK_MAX = 5000
+SESSION_MARK_KEY = "ss_marks"
+
+MARK_VIEW = "view"                      # 조회수/글읽기 포인트
+MARK_DOWNLOAD = "down"                  # 다운로드 포인트
+MARK_SECRET = "secret"                  # 비밀글 열람
+MARK_SECRET_COMMENT = "secret_comment"  # 비밀댓글 열람
+
+
+def download_file_mark(bf_no: int) -> str:
+    """첨부파일별 다운로드 횟수 기록 종류"""
+    return f"down_{bf_no}"
+
+
+def link_mark(no: int) -> str:
+    """링크별 이동 횟수 기록 종류"""
+    return f"link_{no}"
+
+
+def encode_ids(ids: Iterable[int]) -> str:
+    """게시글 번호 집합을 압축된 문자열로 변환합니다."""
+    buffer = bytearray()
+    previous = 0
+    for item_id in sorted(set(ids)):
+        delta = item_id - previous
+        previous = item_id
+        while delta >= 0x80:
+            buffer.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        buffer.append(delta)
+    return urlsafe_b64encode(bytes(buffer)).decode("ascii").rstrip("=")
+
+
+def decode_ids(value: str) -> List[int]:
+    """압축된 문자열을 게시글 번호 목록으로 변환합니다."""
+    data = urlsafe_b64decode(value + "=" * (-len(value) % 4))
+    ids = []
+    current = delta = shift = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        current += delta
+        ids.append(current)
+        delta = shift = 0
+    return ids
+
+
+def get_marks(session: MutableMapping, bo_table: str, kind: str) -> Set[int]:
+    """만료되지 않은 게시판/종류별 게시글 번호 집합을 반환합니다."""
+    entry = session.get(SESSION_MARK_KEY, {}).get(bo_table, {}).get(kind)
+    if not entry or time.time() - entry[0] >= SESSION_MARK_TTL:
+        return set()
+    return set(decode_ids(entry[1]))
+
+
+def has_mark(session: MutableMapping, bo_table: str, kind: str, item_id: int) -> bool:
+    """게시글의 기록이 있는지 확인합니다."""
+    return int(item_id) in get_marks(session, bo_table, kind)
+
+
+def has_any_mark(session: MutableMapping, *kinds: str) -> bool:
+    """모든 게시판에서 해당 종류의 기록이 하나라도 있는지 확인합니다."""
+    now = time.time()
+    return any(
+        entry[1] and now - entry[0] < SESSION_MARK_TTL
+        for board_marks in session.get(SESSION_MARK_KEY, {}).values()
+        for kind, entry in board_marks.items() if kind in kinds
+    )
+
+
+def add_mark(session: MutableMapping, bo_table: str, kind: str, item_id: int) -> None:
+    """게시글의 기록을 추가합니다. (만료되었거나 최대 개수를 넘은 기록은 비우고 다시 시작)"""
+    marks = session.get(SESSION_MARK_KEY, {})
+    # 만료된 기록 삭제
+    now = time.time()
+    for board_table, board_marks in list(marks.items()):
+        for board_kind, board_entry in list(board_marks.items()):
+            if now - board_entry[0] >= SESSION_MARK_TTL:
+                del board_marks[board_kind]
+        if not board_marks:
+            del marks[board_table]
+
+    board_marks = marks.setdefault(bo_table, {})
+    entry = board_marks.get(kind)
+    ids = get_marks(session, bo_table, kind)
+    if not ids or len(ids) >= SESSION_MARK_MAX:
+        ids, started_at = set(), int(time.time())
+    else:
+        started_at = entry[0]
+    ids.add(int(item_id))
+    board_marks[kind] = [started_at, encode_ids(ids)]
+    session[SESSION_MARK_KEY] = marks
@@ -0,0 +1,328 @@
+"""정적 파일 빌드 (핑거프린트, 사전 압축)
+
+- build_static_assets()는 공용/관리자(static), 테마, 플러그인의 static 파일을
+  내용 해시가 포함된 파일명으로 STATIC_BUILD_DIR/{빌드ID} 에 복사하고 manifest.json 을 생성한다.
+    - ex) /static/js/common.js -> /assets/{빌드ID}/static/js/common.{해시}.js
+    - css 의 상대경로(url(../img/..))를 위해 원래 파일명으로도 복사한다.
+- 압축 효과가 있는 파일(css, js, svg 등)은 .gz 파일을 미리 생성한다.
+  brotli 패키지가 설치되어 있으면 .br 파일도 생성한다.
+- /assets 경로는 AssetStaticFiles 가 Accept-Encoding 에 맞는 압축 파일로 응답하며,
+  해시가 포함된 파일은 Cache-Control: immutable 로 응답한다.
+- theme_asset(), asset_url()은 manifest 의 경로를 반환하며, 빌드되지 않은 파일은 원래 경로를 반환한다.
+- 빌드: python -m lib.static_assets (STATIC_ASSET_BUILD_ON_STARTUP 이 true 이면 서버 시작 시 빌드)
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic import TypeAdapter
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from core.plugin import PLUGIN_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+load_dotenv()
+
+STATIC_ASSET_BUILD_ON_STARTUP = TypeAdapter(bool).validate_python(
+    os.getenv("STATIC_ASSET_BUILD_ON_STARTUP") or True
+)
+STATIC_BUILD_DIR = os.path.join("data", "assets")
+STATIC_BUILD_URL = "/assets"
+# 보관할 이전 빌드 수 (이전 페이지가 참조하는 파일을 계속 응답하기 위해)
+STATIC_BUILD_KEEP = 3
+FINGERPRINT_LENGTH = 10
+MANIFEST_CHECK_INTERVAL = 5.0  # 다른 워커(프로세스)의 빌드를 확인하는 주기(초)
+
+# 미리 압축할 파일 확장자와 최소 크기(byte)
+COMPRESSIBLE_EXTENSIONS = (
+    ".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml", ".html", ".ttf", ".otf", ".eot", ".ico"
+)
+COMPRESS_MIN_SIZE = 512
+# 응답 시 우선 순위 순서 (Content-Encoding, 파일 확장자)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def get_asset_sources() -> List[Tuple[str, str]]:
+    """빌드할 static 디렉토리 목록 (URL 경로, 디렉토리)
+
+    - register_theme_statics(), register_statics()에서 등록하는 경로와 같다.
+    - 테마는 관리자에서 변경할 수 있으므로 모든 테마를 빌드한다.
+    """
+    # Lazy import (core.template 에서 이 모듈을 불러온다.)
+    from core.template import TEMPLATES
+
+    sources = [("/static", "static")]
+    for theme in sorted(os.listdir(TEMPLATES)):
+        for device in ("", "/mobile"):
+            directory = f"{TEMPLATES}/{theme}{device}/static"
+            if os.path.isdir(directory):
+                sources.append((f"/theme_static/{theme}{device}", directory))
+    if os.path.isdir(PLUGIN_DIR):
+        for module_name in sorted(os.listdir(PLUGIN_DIR)):
+            directory = f"{PLUGIN_DIR}/{module_name}/static"
+            if os.path.isdir(directory):
+                sources.append((f"/plugin/{module_name}/static", directory))
+    return sources
+
+
+def _file_digest(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            md5.update(chunk)
+    return md5.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def _fingerprint_path(path: str, digest: str) -> str:
+    """파일명에 해시를 추가합니다. (ex: js/common.js -> js/common.{해시}.js)"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def _compress(data: bytes) -> Dict[str, bytes]:
+    """압축 효과가 있는 경우 인코딩별 압축 결과를 반환합니다."""
+    results = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        results["br"] = brotli.compress(data)
+    return {encoding: value for encoding, value in results.items() if len(value) < len(data) * 0.9}
+
+
+def _write_file(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build_static_assets(build_dir: str = STATIC_BUILD_DIR, keep: int = STATIC_BUILD_KEEP) -> dict:
+    """static 파일을 핑거프린트/사전 압축하여 빌드하고 manifest 를 생성합니다.
+    - 빌드ID는 모든 파일의 해시로 만들므로 변경된 파일이 없으면 다시 복사하지 않습니다.
+    - 여러 워커가 동시에 실행해도 임시 디렉토리에 빌드한 후 교체하므로 안전합니다.
+
+    Args:
+        build_dir (str, optional): 빌드 디렉토리. Defaults to STATIC_BUILD_DIR.
+        keep (int, optional): 보관할 빌드 수. Defaults to STATIC_BUILD_KEEP.
+
+    Returns:
+        dict: manifest
+    """
+    os.makedirs(build_dir, exist_ok=True)
+    files = []
+    for url_prefix, directory in get_asset_sources():
+        for root, _, names in os.walk(directory):
+            for name in sorted(names):
+                source_path = os.path.join(root, name)
+                relative_path = os.path.relpath(source_path, directory).replace(os.sep, "/")
+                files.append((f"{url_prefix}/{relative_path}", source_path, _file_digest(source_path)))
+
+    build_id = hashlib.md5(
+        "\n".join(f"{url_path}:{digest}" for url_path, _, digest in files).encode()
+    ).hexdigest()[:FINGERPRINT_LENGTH]
+    build_path = os.path.join(build_dir, build_id)
+    temp_path = f"{build_path}.{os.getpid()}.tmp"
+
+    assets = {}
+    encodings = {}
+    is_built = os.path.isdir(build_path)
+    for url_path, source_path, digest in files:
+        original_path = f"{build_id}{url_path}"
+        fingerprint_path = _fingerprint_path(original_path, digest)
+        assets[url_path] = f"{STATIC_BUILD_URL}/{fingerprint_path}"
+
+        if is_built:
+            # 이미 빌드된 파일은 압축 파일 존재 여부만 확인
+            target_path = os.path.join(build_dir, fingerprint_path)
+            built_encodings = [encoding for encoding, suffix in ENCODINGS if os.path.exists(f"{target_path}{suffix}")]
+            if built_encodings:
+                encodings[original_path] = encodings[fingerprint_path] = sorted(built_encodings)
+            continue
+
+        compressed = {}
+        if url_path.lower().endswith(COMPRESSIBLE_EXTENSIONS) and os.path.getsize(source_path) >= COMPRESS_MIN_SIZE:
+            with open(source_path, "rb") as f:
+                compressed = _compress(f.read())
+            if compressed:
+                encodings[original_path] = encodings[fingerprint_path] = sorted(compressed)
+        for path in (original_path, fingerprint_path):
+            target_path = os.path.join(temp_path, os.path.relpath(path, build_id))
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.copyfile(source_path, target_path)
+            for encoding, suffix in ENCODINGS:
+                if encoding in compressed:
+                    _write_file(f"{target_path}{suffix}", compressed[encoding])
+
+    if not is_built:
+        try:
+            os.replace(temp_path, build_path)
+        except OSError:
+            # 다른 워커에서 먼저 빌드한 경우
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+    manifest = {"build": build_id, "created_at": time.time(), "assets": assets, "encodings": encodings}
+    manifest_path = os.path.join(build_dir, "manifest.json")
+    temp_manifest_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(temp_manifest_path, manifest_path)
+
+    _remove_old_builds(build_dir, build_id, keep)
+    return manifest
+
+
+def _remove_old_builds(build_dir: str, build_id: str, keep: int) -> None:
+    """최근 빌드를 제외한 이전 빌드를 삭제합니다."""
+    builds = [
+        entry for entry in os.scandir(build_dir)
+        if entry.is_dir() and not entry.name.endswith(".tmp") and entry.name != build_id
+    ]
+    builds.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in builds[max(keep - 1, 0):]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+class StaticAssetManifest():
+    """빌드된 static 파일 manifest 클래스
+    - manifest 파일은 MANIFEST_CHECK_INTERVAL 초에 한 번만 확인하므로 요청마다 파일을 읽지 않는다.
+    """
+
+    def __init__(self, build_dir: str = STATIC_BUILD_DIR):
+        self.path = os.path.join(build_dir, "manifest.json")
+        self._assets: Dict[str, str] = {}
+        self._encodings: Dict[str, List[str]] = {}
+        self._immutable_paths = frozenset()
+        self._mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < MANIFEST_CHECK_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime == self._mtime:
+                    return
+                with open(self.path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                self._assets, self._encodings, self._immutable_paths = {}, {}, frozenset()
+                self._mtime = None
+                return
+            self._assets = manifest.get("assets", {})
+            self._encodings = manifest.get("encodings", {})
+            prefix_length = len(STATIC_BUILD_URL) + 1
+            self._immutable_paths = frozenset(url[prefix_length:] for url in self._assets.values())
+            self._mtime = mtime
+
+    def url(self, path: str) -> str:
+        """static 파일의 빌드 경로를 반환합니다. (빌드되지 않은 파일은 원래 경로)
+        - 해시가 파일 버전을 대신하므로 ?ver= 쿼리스트링은 제거합니다.
+        """
+        self._reload()
+        asset_path = path.split("?", 1)[0]
+        return self._assets.get(asset_path, path)
+
+    def get_encodings(self, build_path: str) -> List[str]:
+        """빌드 파일의 사전 압축 인코딩 목록"""
+        self._reload()
+        return self._encodings.get(build_path, [])
+
+    def is_immutable(self, build_path: str) -> bool:
+        """해시가 포함된 빌드 파일인지 확인합니다."""
+        self._reload()
+        return build_path in self._immutable_paths
+
+    def reset(self) -> None:
+        """다음 조회 시 manifest 파일을 다시 읽도록 합니다."""
+        with self._lock:
+            self._checked_at = 0.0
+            self._mtime = None
+
+
+static_asset_manifest = StaticAssetManifest()
+
+
+def asset_url(path: str) -> str:
+    """static 파일의 URL을 반환하는 템플릿 함수 (ex: asset_url('/static/js/common.js'))"""
+    return static_asset_manifest.url(path)
+
+
+def _select_encoding(accept_encoding: str, encodings: List[str]) -> Optional[Tuple[str, str]]:
+    """Accept-Encoding 에서 허용하는 사전 압축 인코딩을 선택합니다."""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding, suffix in ENCODINGS:
+        if encoding in encodings and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding, suffix
+    return None
+
+
+class AssetStaticFiles(StaticFiles):
+    """빌드된 static 파일 응답 클래스
+    - Accept-Encoding 에 맞는 사전 압축 파일(.br, .gz)로 응답한다.
+    - 해시가 포함된 파일은 1년간 캐시하고, 그 외 파일은 매번 검증하도록 응답한다.
+    """
+    def __init__(self, directory: str = STATIC_BUILD_DIR, manifest: StaticAssetManifest = static_asset_manifest):
+        super().__init__(directory=directory, check_dir=False)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        build_path = path.replace(os.sep, "/")
+        encodings = self.manifest.get_encodings(build_path)
+        selected = _select_encoding(Headers(scope=scope).get("accept-encoding", ""), encodings)
+
+        response = None
+        if selected:
+            encoding, suffix = selected
+            try:
+                response = await super().get_response(f"{path}{suffix}", scope)
+            except HTTPException:
+                response = None
+            else:
+                if response.status_code == 200:
+                    media_type = mimetypes.guess_type(build_path)[0] or "application/octet-stream"
+                    if media_type.startswith("text/"):
+                        media_type += "; charset=utf-8"
+                    response.headers["content-type"] = media_type
+                    response.headers["content-encoding"] = encoding
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if encodings:
+            response.headers["vary"] = "Accept-Encoding"
+        if self.manifest.is_immutable(build_path):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["cache-control"] = "no-cache"
+        return response
+
+
+if __name__ == "__main__":
+    built = build_static_assets()
+    print(f"static assets built: {built['build']} "
+          f"({len(built['assets'])} files, {len(built['encodings']) // 2} precompressed)")
@@ -0,0 +1,303 @@
+"""접속자 통계 집계
+
+- 접속자집계 화면의 통계를 SQL GROUP BY 로 집계하여 접속 기록 전체를 불러오지 않는다.
+- 지난 날짜는 일별 집계 테이블(VisitRollup)을 사용하고, 집계되지 않은 날짜(오늘 등)만 접속 기록에서 집계한다.
+- 일별 집계는 스케줄러(rollup_visit_stats)가 매일 새벽에 생성한다.
+"""
+import re
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from core.database import DBConnect
+from core.models import Visit, VisitRollup
+
+# 집계 종류별 접속 기록 컬럼
+ROLLUP_COLUMNS = {
+    "browser": Visit.vi_browser,
+    "os": Visit.vi_os,
+    "device": Visit.vi_device,
+    "domain": Visit.vi_referer,
+}
+ROLLUP_KEY_LENGTH = 255
+DIRECT_REFERER = "직접"
+
+
+def get_browser(user_agent: str) -> str:
+    """브라우저이름을 반환합니다.
+    """
+    user_agent = user_agent.lower()
+
+    browsers = {
+        'Chrome': r"chrome",
+        'FireFox': r"firefox",
+        'Safari': r"safari",
+        'Opera': r"opera",
+        'MSIE': r"msie ([1-9][0-9]\.[0-9]+)",
+        'Mozilla': r"mozilla",
+        'Robot': r"bot|Yeti|Baidu|Daumoa|Yandex|slurp|facebook",
+        'IE': r"internet explorer"
+    }
+
+    for browser_name, pattern in browsers.items():
+        if re.search(pattern, user_agent):
+            return browser_name
+
+    return "other"  # todo 다국어
+
+
+def get_os(user_agent: str) -> str:
+    """운영체제 이름을 반환합니다.
+    """
+    user_agent = user_agent.lower()
+
+    os_patterns = {
+        "Android": r"android",
+        "IOS": r"IOS",
+        "iPad OS": r"iPad",
+        "Phone": r"phone",
+        "Windows10": r"windows nt 10\.0",
+        "Windows8.1": r"windows nt 6\.3",
+        "Windows8": r"windows nt 6\.2",
+        "Windows7": r"windows nt 6\.1",
+        "Vista": r"windows nt 6\.0",
+        "XP": r"windows nt 5\.1",
+        "2003": r"windows nt 5\.2",
+        "NT": r"windows nt 4\.[0-9]*",
+        "CE": r"windows ce",
+        "MAC": r"mac",
+        "Robot": r"bot|Yeti|Baidu|Daumoa|Yandex|slurp|facebook ",
+        "Linux": r"linux",
+        "Solrais": r"solrais",
+        "IE": r"internet explorer",
+        "Mozilla": r"mozilla",
+        "IRIX": r"irix"
+    }
+
+    # Iterate through the patterns and return the first matching OS
+    for os_name, pattern in os_patterns.items():
+        if re.search(pattern, user_agent):
+            return os_name
+
+    return "other"
+
+
+def get_referer_key(referer: str) -> str:
+    """접속경로(referer) 집계 키를 반환합니다.
+    - http(s)로 시작하지 않으면 직접 접속으로 처리합니다.
+    """
+    match = re.search(r'^http[s]*\S+', referer or "")
+    if not match:
+        return DIRECT_REFERER
+
+    referer = re.sub(r"^(www\.|search\.|dirsearch\.|dir\.search\.|dir\.|kr\.search\.|myhome\.)(.*)",
+                     "\\2", match.group())
+    return referer[:ROLLUP_KEY_LENGTH]
+
+
+def count_visits(db: Session, rollup_type: str, where: list) -> Counter:
+    """접속 기록을 집계 종류별로 GROUP BY 하여 반환합니다.
+    - 브라우저/OS 정보가 없는 기록은 User-Agent 별로 묶은 후 분류합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        rollup_type (str): 집계 종류 (total, browser, os, device, domain)
+        where (list): 접속 기록 조회 조건
+
+    Returns:
+        Counter: 집계 키별 접속자 수
+    """
+    counter = Counter()
+    if rollup_type == "total":
+        counter[""] = db.scalar(select(func.count(Visit.vi_id)).where(*where)) or 0
+        return counter
+
+    column = ROLLUP_COLUMNS[rollup_type]
+    rows = db.execute(
+        select(column, func.count(Visit.vi_id)).where(*where).group_by(column)
+    ).all()
+
+    if rollup_type == "domain":
+        for referer, count in rows:
+            counter[get_referer_key(referer)] += count
+        return counter
+
+    if rollup_type in ("browser", "os"):
+        classify = get_browser if rollup_type == "browser" else get_os
+        for value, count in rows:
+            if value:
+                counter[value[:ROLLUP_KEY_LENGTH]] += count
+        agent_rows = db.execute(
+            select(Visit.vi_agent, func.count(Visit.vi_id))
+            .where(*where, column == "")
+            .group_by(Visit.vi_agent)
+        ).all()
+        for agent, count in agent_rows:
+            counter[classify(agent or "")] += count
+        return counter
+
+    for value, count in rows:
+        counter[(value or "")[:ROLLUP_KEY_LENGTH]] += count
+    return counter
+
+
+def rollup_visit_date(db: Session, target_date: date) -> None:
+    """하루치 접속 기록을 집계하여 일별 집계 테이블에 저장합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        target_date (date): 집계할 날짜
+    """
+    where = [Visit.vi_date == target_date]
+    db.execute(delete(VisitRollup).where(VisitRollup.vr_date == target_date))
+
+    values = []
+    for rollup_type in ("total", *ROLLUP_COLUMNS.keys()):
+        for key, count in count_visits(db, rollup_type, where).items():
+            values.append({
+                "vr_date": target_date,
+                "vr_type": rollup_type,
+                "vr_key": key,
+                "vr_count": count,
+            })
+    db.execute(insert(VisitRollup), values)
+
+
+def rollup_visit_stats(max_days: int = 366) -> int:
+    """집계되지 않은 지난 날짜의 접속 기록을 일별로 집계합니다. (스케줄러 작업)
+
+    Args:
+        max_days (int, optional): 한 번에 집계할 최대 일수. Defaults to 366.
+
+    Returns:
+        int: 집계한 일수
+    """
+    today = date.today()
+    with DBConnect().sessionLocal() as db:
+        rolled_dates = select(VisitRollup.vr_date).where(VisitRollup.vr_type == "total")
+        target_dates = db.scalars(
+            select(Visit.vi_date)
+            .where(Visit.vi_date < today, Visit.vi_date.not_in(rolled_dates))
+            .group_by(Visit.vi_date)
+            .order_by(Visit.vi_date)
+            .limit(max_days)
+        ).all()
+
+        for target_date in target_dates:
+            rollup_visit_date(db, target_date)
+            db.commit()
+
+    return len(target_dates)
+
+
+def delete_visit_rollup(db: Session, where: list) -> None:
+    """접속 기록 삭제 시 해당 날짜의 일별 집계를 삭제합니다.
+    - 남은 접속 기록은 다음 집계 작업에서 다시 집계됩니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        where (list): VisitRollup 삭제 조건
+    """
+    db.execute(delete(VisitRollup).where(*where))
+
+
+def aggregate_visits(db: Session,
+                     rollup_type: str,
+                     from_date: str,
+                     to_date: str,
+                     group_by_date: bool = False) -> Tuple[Counter, int]:
+    """기간 내 접속자 수를 집계합니다.
+    - 일별 집계가 있는 날짜는 집계 테이블을, 나머지 날짜는 접속 기록을 GROUP BY 하여 합산합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        rollup_type (str): 집계 종류 (total, browser, os, device, domain)
+        from_date (str): 시작일 (YYYY-MM-DD)
+        to_date (str): 종료일 (YYYY-MM-DD)
+        group_by_date (bool, optional): 날짜별로 집계할지 여부 (total 전용). Defaults to False.
+
+    Returns:
+        Tuple[Counter, int]: (집계 키별 접속자 수, 전체 접속자 수)
+    """
+    start = datetime.strptime(from_date, "%Y-%m-%d").date()
+    end = datetime.strptime(to_date, "%Y-%m-%d").date()
+    counter = Counter()
+
+    # 일별 집계 테이블
+    rollup_key = VisitRollup.vr_date if group_by_date else VisitRollup.vr_key
+    rollup_rows = db.execute(
+        select(rollup_key, func.sum(VisitRollup.vr_count))
+        .where(
+            VisitRollup.vr_date.between(start, end),
+            VisitRollup.vr_type == rollup_type
+        )
+        .group_by(rollup_key)
+    ).all()
+    for key, count in rollup_rows:
+        counter[key] += int(count or 0)
+
+    # 집계되지 않은 날짜의 접속 기록
+    rolled_dates = (
+        select(VisitRollup.vr_date)
+        .where(VisitRollup.vr_date.between(start, end), VisitRollup.vr_type == "total")
+    )
+    where = [Visit.vi_date.between(start, end), Visit.vi_date.not_in(rolled_dates)]
+    if group_by_date:
+        rows = db.execute(
+            select(Visit.vi_date, func.count(Visit.vi_id)).where(*where).group_by(Visit.vi_date)
+        ).all()
+        for key, count in rows:
+            counter[key] += count
+    else:
+        counter.update(count_visits(db, rollup_type, where))
+
+    total = sum(counter.values())
+    return counter, total
+
+
+def to_percent_list(counter: Dict, field_name: str, total: int, sort_by_key: bool = False) -> List[dict]:
+    """집계 결과를 템플릿에서 사용하는 목록으로 변환합니다.
+
+    Args:
+        counter (Dict): 집계 키별 접속자 수
+        field_name (str): 집계 키 필드명
+        total (int): 전체 접속자 수
+        sort_by_key (bool, optional): 키 순서로 정렬할지 여부 (기본: 접속자 수 내림차순). Defaults to False.
+
+    Returns:
+        List[dict]: {field_name, count, percent} 목록
+    """
+    if sort_by_key:
+        items = sorted(counter.items())
+    else:
+        items = sorted(counter.items(), key=lambda item: item[1], reverse=True)
+
+    return [
+        {
+            field_name: key,
+            "count": count,
+            "percent": round(count / total * 100, 2) if total else 0,
+        }
+        for key, count in items if count
+    ]
+
+
+def group_dates(counter: Dict[date, int], date_format: str) -> Counter:
+    """날짜별 집계를 월/연도 등으로 묶습니다.
+
+    Args:
+        counter (Dict[date, int]): 날짜별 접속자 수
+        date_format (str): strftime 형식
+
+    Returns:
+        Counter: 형식별 접속자 수
+    """
+    grouped = Counter()
+    for visit_date, count in counter.items():
+        if isinstance(visit_date, str):
+            visit_date = datetime.strptime(visit_date[:10], "%Y-%m-%d").date()
+        grouped[visit_date.strftime(date_format)] += count
+    return grouped
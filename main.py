@@ -1,4 +1,6 @@
+import asyncio
 import datetime
+import time
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Path, Request, Response
@@ -7,30 +9,44 @@ from pydantic import TypeAdapter
 from sqlalchemy import select, insert, inspect
 from sqlalchemy.exc import ProgrammingError
 from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 import core.models as models
-from core.database import DBConnect, db_session
+from core.database import DBConnect, db_session, upgrade_table_schema
 from core.exception import (
     AlertException,
     regist_core_exception_handler,
     template_response
 )
-from core.middleware import should_run_middleware, regist_core_middleware
+from core.lazy_router import LazyRouter, LazyRouterMiddleware
+from core.middleware import (
+    ROUTE_CLASS_APP, get_route_class, record_stage, regist_core_middleware
+)
 from core.plugin import (
     cache_plugin_state, cache_plugin_menu, get_plugin_state_change_time,
-    import_plugin_by_states, read_plugin_state, register_plugin,
-    register_plugin_admin_menu, register_statics
+    import_plugin_by_states, plugin_state_watcher, read_plugin_state,
+    register_plugin, register_plugin_admin_menu, register_statics
+)
+from core.template import (
+    AdminTemplates, precompile_templates, register_theme_statics,
+    TemplateService, UserTemplates
 )
-from core.template import register_theme_statics, TemplateService, UserTemplates
+from lib.board_lib import fill_board_new
 from lib.common import *
+from lib.mail_queue import mail_worker_pool
 from lib.member_lib import is_super_admin, MemberService
 from lib.point import insert_point
+from lib.poll_lib import migrate_poll_votes
+from lib.page_cache import PageCacheMiddleware, page_hit_buffer
+from lib.rate_limit import RateLimitMiddleware
+from lib.static_assets import (
+    STATIC_ASSET_BUILD_ON_STARTUP, STATIC_BUILD_URL, AssetStaticFiles, build_static_assets
+)
 from lib.template_filters import default_if_none
 from lib.token import create_session_token
 from lib.scheduler import scheduler
 
 
-from admin.admin import router as admin_router
 from bbs.board import router as board_router
 from bbs.login import router as login_router
 from bbs.register import router as register_router
@@ -71,7 +87,40 @@ async def lifespan(app: FastAPI):
     - yield 이전의 코드: 서버가 시작될 때 실행
     - yield 이후의 코드: 서버가 종료될 때 실행
     """
+    # 설치 이후 버전에서 추가된 테이블 생성 (이미 존재하는 테이블은 건너뜀)
+    db_connect = DBConnect()
+    is_installed = inspect(db_connect.engine).has_table(db_connect.table_prefix + "config")
+    if is_installed:
+        models.Base.metadata.create_all(bind=db_connect.engine)
+        upgrade_table_schema(db_connect.engine, [
+            models.Config.__table__, models.BoardNew.__table__, models.Visit.__table__
+        ])
+        # 전체 게시판의 동적 모델을 미리 생성
+        with db_connect.sessionLocal() as db:
+            write_model_registry.warm(db.scalars(select(models.Board.bo_table)).all())
+            # 이전 버전에서 등록된 최신글의 게시글 정보 채우기
+            fill_board_new(db)
+            # 이전 버전의 설문조사 참여 기록(po_ips, mb_ids) 옮기기
+            migrate_poll_votes(db)
+    # static 파일 핑거프린트/사전 압축 빌드 (변경된 파일이 없으면 이전 빌드를 사용)
+    if STATIC_ASSET_BUILD_ON_STARTUP:
+        build_static_assets()
+    # 템플릿 미리 컴파일 (바이트코드 캐시에 저장되어 재시작 시 재사용)
+    user_templates = UserTemplates()
+    precompile_templates(user_templates.get_device_env(is_mobile=False))
+    if not TemplateService.get_responsive():
+        precompile_templates(user_templates.get_device_env(is_mobile=True))
+    # 관리자 라우터 미리 불러오기
+    admin_lazy_router.warmup(asyncio.get_running_loop())
+    # 메일 발송 작업자 시작 (설치 전에는 메일 대기열 테이블이 없음)
+    if is_installed:
+        mail_worker_pool.start()
+    # 플러그인 상태 변경 감시 시작
+    plugin_state_watcher.start(app)
     yield
+    plugin_state_watcher.stop()
+    mail_worker_pool.stop()
+    page_hit_buffer.flush()
     scheduler.remove_flag()
 
 # APP_IS_DEBUG 값이 True일 경우, 디버그 모드가 활성화됩니다.
@@ -88,8 +137,10 @@ if not os.path.exists("data"):
 register_theme_statics(app)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.mount("/data", StaticFiles(directory="data"), name="data")
+app.mount(STATIC_BUILD_URL, AssetStaticFiles(), name="assets")
 
 # 플러그인 라우터 우선 등록
+plugin_load_start = time.perf_counter()
 plugin_states = read_plugin_state()
 import_plugin_by_states(plugin_states)
 register_plugin(plugin_states)
@@ -98,8 +149,14 @@ register_statics(app, plugin_states)
 cache_plugin_state.__setitem__('info', plugin_states)
 cache_plugin_state.__setitem__('change_time', get_plugin_state_change_time())
 cache_plugin_menu.__setitem__('admin_menus', register_plugin_admin_menu(plugin_states))
+logging.getLogger("uvicorn.error").info(
+    f"plugin load: {len(plugin_states)} plugins, {time.perf_counter() - plugin_load_start:.3f}s")
 
-app.include_router(admin_router, prefix="/admin", tags=["admin"])
+# 관리자 라우터는 지연 로딩합니다. (서버 시작 후 워밍업 또는 첫 요청 시 등록)
+admin_lazy_router = LazyRouter(
+    app, "admin.admin", prefix="/admin", tags=["admin"],
+    on_import=lambda: precompile_templates(AdminTemplates().env)
+)
 app.include_router(install_router, prefix="/install", tags=["install"])
 app.include_router(board_router, prefix="/board", tags=["board"])
 app.include_router(login_router, prefix="/bbs", tags=["login"])
@@ -125,159 +182,213 @@ app.include_router(current_connect_router, prefix="/bbs", tags=["current_connect
 app.include_router(editor_router, prefix="/editor", tags=["editor"])
 
 
-@app.middleware("http")
-async def main_middleware(request: Request, call_next):
-    """요청마다 항상 실행되는 미들웨어"""
-
-    if not await should_run_middleware(request):
-        return await call_next(request)
-
-    # 데이터베이스 설치여부 체크
-    db_connect = DBConnect()
-    db = db_connect.sessionLocal()
-    url_path = request.url.path
-    config = None
-
-    try:
-        if not url_path.startswith("/install"):
+class MainMiddleware:
+    """요청마다 항상 실행되는 미들웨어
+    - 기본환경설정과 로그인 회원 정보를 request.state 에 설정합니다.
+    - 접속자 기록과 현재 접속자 갱신은 응답을 보낸 후 처리합니다.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or get_route_class(scope) != ROUTE_CLASS_APP:
+            return await self.app(scope, receive, send)
+
+        started_at = time.perf_counter()
+        request = Request(scope, receive)
+        url_path = request.url.path
+        if url_path.startswith("/install"):
+            return await self.app(scope, receive, send)
+
+        # 데이터베이스 설치여부 체크
+        db = DBConnect().sessionLocal()
+        try:
+            response = self.load_config(request, db)
+            if response is None:
+                response = self.load_member(request, db)
+            if response is not None:
+                return await response(scope, receive, send)
+
+            record_stage(scope, "main", started_at)
+            await self.app(scope, receive, self.send_with_cookies(request, send))
+
+            # 접속자 기록
+            if request.cookies.get("ck_visit_ip") != request.state.current_ip:
+                record_visit(request)
+            self.update_current_login(request, db)
+        finally:
+            db.close()
+
+    def load_config(self, request: Request, db: Session) -> Optional[Response]:
+        """기본환경설정을 조회합니다. 설치되지 않았으면 오류 응답을 반환합니다."""
+        try:
             if not os.path.exists(ENV_PATH):
                 raise AlertException(".env 파일이 없습니다. 설치를 진행해 주세요.", 400, "/install")
             # 기본환경설정 테이블 조회
             config = db.scalar(select(Config))
-        else:
-            return await call_next(request)
-
-    except AlertException as e:
-        context = {"request": request, "errors": e.detail, "url": e.url}
-        return template_response("alert.html", context, e.status_code)
-
-    except ProgrammingError as e:
-        context = {
-            "request": request,
-            "errors": "DB 테이블 또는 설정정보가 존재하지 않습니다. 설치를 다시 진행해 주세요.",
-            "url": "/install"
-        }
-        return template_response("alert.html", context, 400)
-
-    # 기본환경설정 조회 및 설정
-    request.state.config = config
-    request.state.title = config.cf_title
-
-    # 에디터 전역변수
-    request.state.editor = config.cf_editor
-    request.state.use_editor = True if config.cf_editor else False
-
-    # 쿠키도메인 전역변수
-    request.state.cookie_domain = os.getenv("COOKIE_DOMAIN", "")
-
-    member = None
-    is_autologin = False
-    ss_mb_key = None
-    session_mb_id = request.session.get("ss_mb_id", "")
-    cookie_mb_id = request.cookies.get("ck_mb_id", "")
-    current_ip = get_client_ip(request)
-
-    # 로그인 세션 유지 중이라면
-    if session_mb_id:
-        member = MemberService.create_by_id(db, session_mb_id)
-        if member.is_intercept_or_leave():
-            request.session.clear()
-            member = None
-    # 자동 로그인 쿠키가 있다면
-    elif cookie_mb_id:
-        mb_id = re.sub("[^a-zA-Z0-9_]", "", cookie_mb_id)[:20]
-        member = MemberService.create_by_id(db, mb_id)
-        # 최고관리자는 보안상 자동로그인 기능을 사용하지 않는다.
-        if (not is_super_admin(request, mb_id)
-                and member.is_email_certify(bool(config.cf_use_email_certify))
-                and not member.is_intercept_or_leave()):
-            # 쿠키에 저장된 키와 여러가지 정보를 조합하여 만든 키가 일치한다면 로그인으로 간주
-            ss_mb_key = session_member_key(request, member)
-            if request.cookies.get("ck_auto") == ss_mb_key:
-                request.session["ss_mb_id"] = cookie_mb_id
-                is_autologin = True
-
-    if member:
-        # 오늘 처음 로그인 이라면 포인트 지급 및 로그인 정보 업데이트
-        ymd_str = datetime.now().strftime("%Y-%m-%d")
-        if member.mb_today_login.strftime("%Y-%m-%d") != ymd_str:
-            insert_point(request, member.mb_id, config.cf_login_point, ymd_str + " 첫로그인", "@login", member.mb_id, ymd_str)
-
-            member.mb_today_login = datetime.now()
-            member.mb_login_ip = request.client.host
-            db.commit()
 
-    # 로그인한 회원 정보
-    request.state.login_member = member
-    # 최고관리자 여부
-    request.state.is_super_admin = is_super_admin(request, getattr(member, "mb_id", None))
-
-    # 접근가능/차단 IP 체크
-    # - IP 체크 기능을 사용할 때 is_super_admin 여부를 확인하기 때문에 로그인 코드 이후에 실행
-    if not is_possible_ip(request, current_ip):
-        return HTMLResponse("<meta charset=utf-8>접근이 허용되지 않은 IP 입니다.")
-    if is_intercept_ip(request, current_ip):
-        return HTMLResponse("<meta charset=utf-8>접근이 차단된 IP 입니다.")
-
-    # 응답 객체 설정
-    response: Response = await call_next(request)
-
-    age_1day = 60 * 60 * 24
-    cookie_domain = request.state.cookie_domain
-
-    # 자동로그인 쿠키 재설정
-    # is_autologin과 세션을 확인해서 로그아웃 처리 이후 쿠키가 재설정되는 것을 방지
-    if is_autologin and request.session.get("ss_mb_id"):
-        response.set_cookie(key="ck_mb_id", value=cookie_mb_id,
-                            max_age=age_1day * 30, domain=cookie_domain)
-        response.set_cookie(key="ck_auto", value=ss_mb_key,
-                            max_age=age_1day * 30, domain=cookie_domain)
-    # 접속자 기록
-    ck_visit_ip = request.cookies.get('ck_visit_ip', None)
-    if ck_visit_ip != current_ip:
-        response.set_cookie(key="ck_visit_ip", value=current_ip,
-                            max_age=age_1day, domain=cookie_domain)
-        record_visit(request)
-
-    try:
-        # 현재 접속자 데이터 갱신
-        if (not request.state.is_super_admin
-                and not url_path.startswith("/admin")):
-            current_login = db.scalar(
-                select(models.Login)
-                .where(models.Login.lo_ip == current_ip)
-            )
-            if current_login:
-                current_login.mb_id = getattr(member, "mb_id", "")
-                current_login.lo_datetime = datetime.now()
-                current_login.lo_location = url_path
-                current_login.lo_url = url_path
-            else:
-                db.execute(
-                    insert(models.Login).values(
-                        lo_ip=current_ip,
-                        mb_id=getattr(member, "mb_id", ""),
-                        lo_datetime=datetime.now(),
-                        lo_location=url_path,
-                        lo_url=url_path)
+        except AlertException as e:
+            context = {"request": request, "errors": e.detail, "url": e.url}
+            return template_response("alert.html", context, e.status_code)
+
+        except ProgrammingError as e:
+            context = {
+                "request": request,
+                "errors": "DB 테이블 또는 설정정보가 존재하지 않습니다. 설치를 다시 진행해 주세요.",
+                "url": "/install"
+            }
+            return template_response("alert.html", context, 400)
+
+        # 기본환경설정 조회 및 설정
+        request.state.config = config
+        request.state.title = config.cf_title
+
+        # 에디터 전역변수
+        request.state.editor = config.cf_editor
+        request.state.use_editor = True if config.cf_editor else False
+
+        # 쿠키도메인 전역변수
+        request.state.cookie_domain = os.getenv("COOKIE_DOMAIN", "")
+        return None
+
+    def load_member(self, request: Request, db: Session) -> Optional[Response]:
+        """로그인 회원 정보를 설정합니다. 접근할 수 없는 IP이면 오류 응답을 반환합니다."""
+        config = request.state.config
+        member = None
+        request.state.is_autologin = False
+        request.state.ss_mb_key = None
+        session_mb_id = request.session.get("ss_mb_id", "")
+        cookie_mb_id = request.cookies.get("ck_mb_id", "")
+        current_ip = request.state.current_ip = get_client_ip(request)
+
+        # 로그인 세션 유지 중이라면
+        if session_mb_id:
+            member = MemberService.create_by_id(db, session_mb_id)
+            if member.is_intercept_or_leave():
+                request.session.clear()
+                member = None
+        # 자동 로그인 쿠키가 있다면
+        elif cookie_mb_id:
+            mb_id = re.sub("[^a-zA-Z0-9_]", "", cookie_mb_id)[:20]
+            member = MemberService.create_by_id(db, mb_id)
+            # 최고관리자는 보안상 자동로그인 기능을 사용하지 않는다.
+            if (not is_super_admin(request, mb_id)
+                    and member.is_email_certify(bool(config.cf_use_email_certify))
+                    and not member.is_intercept_or_leave()):
+                # 쿠키에 저장된 키와 여러가지 정보를 조합하여 만든 키가 일치한다면 로그인으로 간주
+                ss_mb_key = session_member_key(request, member)
+                if request.cookies.get("ck_auto") == ss_mb_key:
+                    request.session["ss_mb_id"] = cookie_mb_id
+                    request.state.is_autologin = True
+                    request.state.ss_mb_key = ss_mb_key
+
+        if member:
+            # 오늘 처음 로그인 이라면 포인트 지급 및 로그인 정보 업데이트
+            ymd_str = datetime.now().strftime("%Y-%m-%d")
+            if member.mb_today_login.strftime("%Y-%m-%d") != ymd_str:
+                insert_point(request, member.mb_id, config.cf_login_point, ymd_str + " 첫로그인", "@login", member.mb_id, ymd_str)
+
+                member.mb_today_login = datetime.now()
+                member.mb_login_ip = request.client.host
+                db.commit()
+
+        # 로그인한 회원 정보
+        request.state.login_member = member
+        # 최고관리자 여부
+        request.state.is_super_admin = is_super_admin(request, getattr(member, "mb_id", None))
+
+        # 접근가능/차단 IP 체크
+        # - IP 체크 기능을 사용할 때 is_super_admin 여부를 확인하기 때문에 로그인 코드 이후에 실행
+        if not is_possible_ip(request, current_ip):
+            return HTMLResponse("<meta charset=utf-8>접근이 허용되지 않은 IP 입니다.")
+        if is_intercept_ip(request, current_ip):
+            return HTMLResponse("<meta charset=utf-8>접근이 차단된 IP 입니다.")
+        return None
+
+    def send_with_cookies(self, request: Request, send: Send) -> Send:
+        """응답 시작 시 자동로그인, 접속자 기록 쿠키를 추가하는 send 함수를 반환합니다."""
+        app_started_at = time.perf_counter()
+
+        async def wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                record_stage(request.scope, "app", app_started_at)
+
+                age_1day = 60 * 60 * 24
+                cookie_domain = request.state.cookie_domain
+                cookies = Response()
+                # 자동로그인 쿠키 재설정
+                # is_autologin과 세션을 확인해서 로그아웃 처리 이후 쿠키가 재설정되는 것을 방지
+                if request.state.is_autologin and request.session.get("ss_mb_id"):
+                    cookies.set_cookie(key="ck_mb_id", value=request.cookies.get("ck_mb_id", ""),
+                                       max_age=age_1day * 30, domain=cookie_domain)
+                    cookies.set_cookie(key="ck_auto", value=request.state.ss_mb_key,
+                                       max_age=age_1day * 30, domain=cookie_domain)
+                # 접속자 기록 쿠키
+                if request.cookies.get("ck_visit_ip") != request.state.current_ip:
+                    cookies.set_cookie(key="ck_visit_ip", value=request.state.current_ip,
+                                       max_age=age_1day, domain=cookie_domain)
+
+                set_cookie_headers = [header for header in cookies.raw_headers if header[0] == b"set-cookie"]
+                if set_cookie_headers:
+                    message = {**message, "headers": list(message.get("headers", [])) + set_cookie_headers}
+            await send(message)
+        return wrapper
+
+    def update_current_login(self, request: Request, db: Session) -> None:
+        """현재 접속자 데이터를 갱신하고 만료된 접속자를 삭제합니다."""
+        url_path = request.url.path
+        current_ip = request.state.current_ip
+        member = request.state.login_member
+        try:
+            # 현재 접속자 데이터 갱신
+            if (not request.state.is_super_admin
+                    and not url_path.startswith("/admin")):
+                current_login = db.scalar(
+                    select(models.Login)
+                    .where(models.Login.lo_ip == current_ip)
                 )
+                if current_login:
+                    current_login.mb_id = getattr(member, "mb_id", "")
+                    current_login.lo_datetime = datetime.now()
+                    current_login.lo_location = url_path
+                    current_login.lo_url = url_path
+                else:
+                    db.execute(
+                        insert(models.Login).values(
+                            lo_ip=current_ip,
+                            mb_id=getattr(member, "mb_id", ""),
+                            lo_datetime=datetime.now(),
+                            lo_location=url_path,
+                            lo_url=url_path)
+                    )
+                db.commit()
+
+            # 현재 로그인한 이력 삭제
+            config_time = timedelta(minutes=int(request.state.config.cf_login_minutes))
+            db.execute(delete(models.Login)
+                    .where(models.Login.lo_datetime < datetime.now() - config_time))
             db.commit()
 
-        # 현재 로그인한 이력 삭제
-        config_time = timedelta(minutes=int(config.cf_login_minutes))
-        db.execute(delete(models.Login)
-                .where(models.Login.lo_datetime < datetime.now() - config_time))
-        db.commit()
+        except Exception as e:
+            print(e)
+
+
+# 요청마다 항상 실행되는 미들웨어 (요청 제한, 페이지 캐시 미들웨어보다 안쪽에서 실행)
+app.add_middleware(MainMiddleware)
 
-    except Exception as e:
-        print(e)
+# 글쓰기, 댓글, 검색, 로그인 요청 제한 (MainMiddleware의 DB 조회 전에 실행)
+# 세션의 회원 아이디를 사용하므로 regist_core_middleware()의 SessionMiddleware보다 먼저 등록합니다.
+app.add_middleware(RateLimitMiddleware)
 
-    db.close()
+# 비회원 페이지 캐시 (캐시된 응답은 MainMiddleware를 실행하지 않음)
+# 접속기기와 세션을 사용하므로 regist_core_middleware()보다 먼저 등록합니다.
+app.add_middleware(PageCacheMiddleware)
 
-    return response
+# 지연 로딩 라우터 경로의 요청이 라우팅되기 전에 라우터를 불러오는 미들웨어
+app.add_middleware(LazyRouterMiddleware, lazy_routers=[admin_lazy_router])
 
 # 기본 실행할 미들웨어를 추가하는 함수
-# 함수는 반드시 main_middleware 함수의 아래에 위치해야 합니다.
+# 함수는 반드시 MainMiddleware 등록 아래에 위치해야 합니다.
 # 그렇지 않으면 아래와 같은 오류를 만날 수 있습니다.
 # AssertionError: SessionMiddleware must be installed to access request.session
 regist_core_middleware(app)